@@ -0,0 +1,62 @@
+"""
+Per-event cost of response curves: linear vs. compiled lookup tables.
+Tables are built once at profile load; the event path only indexes them.
+
+    python benchmarks/bench_curves.py
+"""
+import contextlib
+import io
+import time
+from nocturn_studio.daw.midi import MockMidiOutput
+from nocturn_studio.engine.mapper import MappingEngine
+from nocturn_studio.model import curves
+from nocturn_studio.model.curves import ResponseCurve
+from nocturn_studio.model.events import ControlEvent, ControlEventType
+from nocturn_studio.model.mapping import Mapping, MappingTarget, TargetType
+
+EVENTS = 50000
+CASES = (
+    ("linear", None, 127),
+    ("log", ResponseCurve("log", 9.0), 127),
+    ("s_curve", ResponseCurve("s_curve", 5.0), 127),
+    ("exp OSC 14-bit", ResponseCurve("exp", 4.0), 16383),
+    ("breakpoints", ResponseCurve("breakpoints", points=((0.25, 0.5), (0.75, 0.6))), 127),
+)
+
+class DiscardOsc:
+    """Keeps OSC cases comparable to the mock MIDI output: no socket I/O."""
+    def send(self, address, *args):
+        pass
+
+    def begin_bundle(self):
+        pass
+
+    def flush(self):
+        pass
+
+def main():
+    for name, curve, max_val in CASES:
+        midi = MockMidiOutput()
+        engine = MappingEngine(midi)
+        engine.osc_out = DiscardOsc()
+        # MIDI CC is 7-bit, so the high-resolution case targets OSC
+        target = (MappingTarget(TargetType.OSC, address="/bench") if max_val > 127
+                  else MappingTarget(TargetType.MIDI_CC, identifier=10))
+        mapping = Mapping(target, max_val=max_val, curve=curve)
+        start = time.perf_counter()
+        engine.load_mappings({"encoder_1": mapping})
+        load_ms = (time.perf_counter() - start) * 1000
+        compiled = curves.compiled_tables
+        event = ControlEvent("encoder_1", ControlEventType.ENCODER_TURN, 1)
+        back = ControlEvent("encoder_1", ControlEventType.ENCODER_TURN, -1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for i in range(EVENTS):
+                engine.handle_event(event if (i // 100) % 2 == 0 else back)
+                midi.sent_messages.clear()
+            elapsed = time.perf_counter() - start
+        assert curves.compiled_tables == compiled # Nothing is computed per event
+        print(f"{name:14} load {load_ms:6.2f} ms, {elapsed / EVENTS * 1e6:5.2f} us/event")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Load-tests the controller <-> DAW loop against the in-process DAW emulator.
+
+    python benchmarks/bench_daw_loop.py
+"""
+import time
+from nocturn_studio.daw.emulator import DawEmulator
+from nocturn_studio.engine.mapper import MappingEngine
+from nocturn_studio.hardware.device import MockNocturnDevice
+from nocturn_studio.main import default_global_mappings
+
+TURNS = 20000
+AUTOMATION_MSGS = 20000
+
+def main():
+    daw = DawEmulator(echo_latency_ms=2.0, jitter_ms=1.0, seed=0)
+    engine = MappingEngine(daw, feedback_callback=lambda cid, val: None)
+    daw.input.open(engine.handle_midi_input)
+    engine.load_mappings(default_global_mappings())
+    device = MockNocturnDevice()
+    device.add_event_listener(engine.handle_event)
+    device.connect()
+
+    # 1. Controller -> DAW with echoes coming back concurrently
+    start = time.perf_counter()
+    for i in range(TURNS):
+        device.simulate_turn(f"encoder_{i % 8 + 1}", 1 if (i // 8) % 2 == 0 else -1)
+    sent_s = time.perf_counter() - start
+    daw.wait_idle(30.0)
+    loop_s = time.perf_counter() - start
+    print(f"Turns:      {TURNS} in {sent_s * 1000:.0f} ms ({TURNS / sent_s:,.0f}/s), "
+          f"all echoes back after {loop_s * 1000:.0f} ms, scheduler lateness max {daw.max_lateness_ms:.2f} ms")
+
+    # 2. DAW -> controller automation burst on all 8 encoders
+    start = time.perf_counter()
+    per_cc = AUTOMATION_MSGS // 8
+    for cc in range(10, 18):
+        daw.play_ramp(cc, 0, 127, duration_ms=1000, rate_hz=per_cc)
+    daw.wait_idle(30.0)
+    auto_s = time.perf_counter() - start
+    print(f"Automation: {AUTOMATION_MSGS} msgs over a 1000 ms stream handled in {auto_s * 1000:.0f} ms, "
+          f"scheduler lateness max {daw.max_lateness_ms:.2f} ms")
+
+    # 3. Bulk dump of every parameter
+    start = time.perf_counter()
+    for _ in range(100):
+        daw.bulk_dump()
+    daw.wait_idle(30.0)
+    print(f"Bulk dump:  100 x {len(daw.parameters)} params in {(time.perf_counter() - start) * 1000:.0f} ms")
+    daw.close()
+
+if __name__ == "__main__":
+    main()
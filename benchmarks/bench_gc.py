@@ -0,0 +1,69 @@
+"""
+Input-path latency jitter with Python's default GC vs. --managed-gc.
+Each mode runs in a fresh interpreter with a large long-lived heap (presets,
+UI, caches) and bursts of encoder events separated by idle gaps. "young max"
+is the worst collection during input; "full max" bounds the delay of an event
+that arrives while an idle full collection runs.
+
+    python benchmarks/bench_gc.py
+"""
+import contextlib
+import os
+import subprocess
+import sys
+import time
+from collections import deque
+
+LONG_LIVED_OBJECTS = 100_000
+BURSTS = 200
+EVENTS_PER_BURST = 500
+
+def run(managed: bool):
+    from nocturn_studio.daw.midi import MockMidiOutput
+    from nocturn_studio.engine.mapper import MappingEngine
+    from nocturn_studio.main import default_global_mappings
+    from nocturn_studio.model.events import ControlEvent, ControlEventType
+    from nocturn_studio.utils.gc_control import GcController
+    from nocturn_studio.utils.metrics import REGISTRY
+
+    heap = [{"id": i, "children": [[i]]} for i in range(LONG_LIVED_OBJECTS)] # Stands in for app state
+    midi = MockMidiOutput()
+    engine = MappingEngine(midi, feedback_callback=lambda cid, val: None)
+    engine.load_mappings(default_global_mappings())
+    controller = GcController(managed, idle_after_s=0.0)
+    latencies = []
+    history = deque(maxlen=50_000) # Some per-event objects live on (history, traces, undo)
+    # The mock output and console feedback print; keep that out of the timings
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        controller.install()
+        for burst in range(BURSTS):
+            for i in range(EVENTS_PER_BURST):
+                start = time.perf_counter()
+                event = ControlEvent(f"encoder_{i % 8 + 1}", ControlEventType.ENCODER_TURN, 1 if burst % 2 else -1)
+                engine.handle_event(event)
+                node = {"event": event}
+                node["self"] = node # Cyclic garbage, like tracebacks and closures create
+                if i % 2 == 0:
+                    history.append([event, node])
+                controller.activity()
+                latencies.append((time.perf_counter() - start) * 1000)
+            midi.sent_messages.clear()
+            controller.on_idle() # Gap between gestures
+    latencies.sort()
+    young = REGISTRY.histogram("gc_young_pause_ms")
+    gen2 = REGISTRY.histogram("gc_gen2_pause_ms")
+    p = lambda q: latencies[int(q * (len(latencies) - 1))]
+    print(f"{'managed' if managed else 'default':8} event p50 {p(0.5):.3f} ms, p99.9 {p(0.999):.3f} ms, "
+          f"max {latencies[-1]:.2f} ms | young max {young.max:.2f} ms ({young.count}), "
+          f"full max {gen2.max:.2f} ms ({gen2.count}, {REGISTRY.counter('gc_idle_collections').value} while idle)")
+    return heap
+
+def main():
+    for mode in ("default", "managed"):
+        subprocess.run([sys.executable, __file__, mode], check=True)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1] == "managed")
+    else:
+        main()
@@ -0,0 +1,57 @@
+"""
+Measures idle CPU and wakeups per second of the device I/O threads, and how
+fast a backed-off read loop reacts to input. Runs on a fake USB transport.
+
+    python benchmarks/bench_idle.py
+"""
+import threading
+import time
+from nocturn_studio.daw.midi import MockMidiOutput
+from nocturn_studio.engine.mapper import MappingEngine
+from nocturn_studio.hardware.device import RealNocturnDevice
+from nocturn_studio.hardware.fake_usb import attach_fake_usb
+from nocturn_studio.main import default_global_mappings
+from nocturn_studio.utils.metrics import REGISTRY
+
+IDLE_SECONDS = 5.0
+WAKE_SAMPLES = 20
+
+def wakeups() -> int:
+    return sum(REGISTRY.counter(name).value for name in ("device_read_wakeups", "device_write_wakeups"))
+
+def main():
+    device = RealNocturnDevice()
+    engine = MappingEngine(MockMidiOutput(), feedback_callback=device.set_led)
+    engine.load_mappings(default_global_mappings())
+    device.add_event_listener(engine.handle_event)
+    device.add_idle_listener(engine.on_idle)
+    device.add_batch_listener(engine)
+    arrived = threading.Event()
+    device.add_event_listener(lambda event: arrived.set())
+    fake = attach_fake_usb(device)
+
+    # Let the startup activity settle and the loops back off
+    time.sleep(device.IDLE_GRACE_S + 1.0)
+    cpu_start, wall_start, wake_start = time.process_time(), time.perf_counter(), wakeups()
+    time.sleep(IDLE_SECONDS)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    print(f"Idle:    {cpu / wall * 100:.2f}% CPU, {(wakeups() - wake_start) / wall:.1f} wakeups/s "
+          f"(read timeout now {device._read_backoff.current * 1000:.0f} ms)")
+
+    # Reaction time from a backed-off state
+    latencies = []
+    for _ in range(WAKE_SAMPLES):
+        time.sleep(device.IDLE_GRACE_S + 0.6)
+        arrived.clear()
+        start = time.perf_counter()
+        fake.inject(64, 1) # encoder_1 +2
+        arrived.wait(1.0)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    latencies.sort()
+    print(f"Wake:    input handled after p50 {latencies[len(latencies) // 2]:.2f} ms, "
+          f"max {latencies[-1]:.2f} ms while backed off")
+    device.disconnect()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Transfers and latency of a full LED refresh (8 rings, speed dial, 16 buttons)
+with packed and single-pair out-transfers, on the fake USB transport.
+
+    python benchmarks/bench_led_writes.py
+"""
+import time
+from nocturn_studio.hardware.device import RealNocturnDevice
+from nocturn_studio.hardware.fake_usb import attach_fake_usb
+
+REFRESHES = 20
+CONTROLS = [f"encoder_{i}" for i in range(1, 9)] + ["speed_dial"] + [f"button_{i}" for i in range(1, 17)]
+
+def run(packed: bool):
+    device = RealNocturnDevice()
+    device._packed_writes = packed
+    fake = attach_fake_usb(device)
+    time.sleep(0.1)
+    transfers, latencies = [], []
+    for n in range(REFRESHES):
+        start_writes = len(fake.writes)
+        start = time.perf_counter()
+        for i, control_id in enumerate(CONTROLS):
+            device.set_led(control_id, (n * 7 + i) % 128)
+        while sum(len(data) // 2 for _, data in fake.writes[start_writes:]) < len(CONTROLS):
+            time.sleep(0.0005)
+        transfers.append(len(fake.writes) - start_writes)
+        latencies.append((fake.writes[-1][0] - start) * 1000.0)
+        time.sleep(0.06) # Past the writer's 20 Hz throttle
+    device.disconnect()
+    latencies.sort()
+    return sum(transfers) / len(transfers), latencies[len(latencies) // 2], latencies[-1]
+
+def main():
+    for packed in (False, True):
+        per_refresh, p50, worst = run(packed)
+        print(f"{'Packed' if packed else 'Single'}:  {per_refresh:.1f} transfers/refresh, "
+              f"refresh complete after p50 {p50:.1f} ms, max {worst:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Memory and load time of 500 cached (preloaded) profiles with shared,
+interned mappings vs. one unshared copy per profile and control.
+
+    python benchmarks/bench_mappings.py
+"""
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from pathlib import Path
+from nocturn_studio.utils.persistence import PersistenceManager
+
+PROFILES = 500
+CONTROLS = [f"encoder_{i}" for i in range(1, 9)] + [f"button_{i}" for i in range(1, 17)] + ["speed_dial", "crossfader"]
+
+def write_presets(directory: Path):
+    """Plugin presets mostly follow a handful of layouts, with a few custom CCs each."""
+    rng = random.Random(0)
+    layouts = [{cid: 10 + (i + shift) % 40 for i, cid in enumerate(CONTROLS)} for shift in range(4)]
+    for n in range(PROFILES):
+        layout = dict(rng.choice(layouts))
+        for cid in rng.sample(CONTROLS, 3):
+            layout[cid] = rng.randrange(128)
+        preset = {cid: {"target": {"type": "MIDI_CC", "channel": 0, "identifier": cc},
+                        "mode": "RELATIVE_TWOS_COMP" if cid.startswith("encoder") else "ABSOLUTE",
+                        "min_val": 0, "max_val": 127} for cid, cc in layout.items()}
+        (directory / f"Plugin{n:03}.json").write_text(json.dumps(preset))
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        write_presets(Path(tmp))
+        persistence = PersistenceManager()
+        persistence.presets_dir = Path(tmp)
+        _, shared_bytes, load_s = measure(persistence.preload_presets)
+    profiles = persistence._preloaded
+
+    def unshared_copies():
+        return {name: {cid: replace(m, target=replace(m.target)) for cid, m in mappings.items()}
+                for name, mappings in profiles.items()}
+    copies, copy_bytes, _ = measure(unshared_copies)
+
+    distinct = len({id(m) for mappings in profiles.values() for m in mappings.values()})
+    total = sum(len(mappings) for mappings in profiles.values())
+    print(f"{PROFILES} profiles, {total} mappings -> {distinct} shared objects")
+    print(f"shared:   {shared_bytes / 1024:8.1f} KiB (incl. JSON decode), load {load_s * 1000:.1f} ms")
+    print(f"unshared: {copy_bytes / 1024:8.1f} KiB more for one copy per profile and control")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+DAW automation into the engine: the old synchronous rtmidi callback path vs.
+the queued, parsed and CC-coalesced drain. Reports time spent inside the
+MIDI callback (what holds up the rtmidi thread), engine calls and feedback.
+
+    python benchmarks/bench_midi_input.py
+"""
+import threading
+import time
+from nocturn_studio.daw.midi import MidiInputDrain, MidiMessage, MockMidiOutput
+from nocturn_studio.engine.mapper import MappingEngine
+from nocturn_studio.main import default_global_mappings
+
+MESSAGES = 40000
+CCS = range(10, 18) # The eight encoder CCs
+DONE = [0x80, 0, 0] # Note off: not coalesced, marks the end of the stream
+
+def make_engine():
+    counts = {"feedback": 0, "calls": 0}
+    def on_feedback(control_id, value):
+        counts["feedback"] += 1
+    engine = MappingEngine(MockMidiOutput(), feedback_callback=on_feedback)
+    engine.load_mappings(default_global_mappings())
+    return engine, counts
+
+def produce(callback):
+    """Calls `callback` like rtmidi would; returns per-call times (ms)."""
+    times = []
+    for i in range(MESSAGES):
+        raw = [0xB0, CCS[i % len(CCS)], (i // len(CCS)) % 128]
+        start = time.perf_counter()
+        callback(raw)
+        times.append((time.perf_counter() - start) * 1000.0)
+    callback(DONE)
+    return sorted(times)
+
+def report(name, times, elapsed, counts):
+    p99 = times[int(0.99 * (len(times) - 1))]
+    print(f"{name:6} callback p99 {p99 * 1000:6.1f} us, max {times[-1]:.2f} ms | {counts['calls']:6} engine calls, "
+          f"{counts['feedback']:6} feedback | {MESSAGES / elapsed:,.0f} msg/s")
+
+def main():
+    # 1. Old path: parse 3 bytes and run the engine inside the callback
+    engine, counts = make_engine()
+    def direct(raw):
+        counts["calls"] += 1
+        engine.handle_midi_input(MidiMessage(*raw))
+    start = time.perf_counter()
+    times = produce(direct)
+    report("direct", times, time.perf_counter() - start, counts)
+
+    # 2. Drain: the callback only queues
+    engine, counts = make_engine()
+    done = threading.Event()
+    def deliver(msg):
+        counts["calls"] += 1
+        if msg.status == DONE[0]:
+            done.set()
+        engine.handle_midi_input(msg)
+    drain = MidiInputDrain(deliver)
+    drain.add_batch_listener(engine)
+    drain.start()
+    start = time.perf_counter()
+    times = produce(drain.push)
+    done.wait(10.0)
+    report("drain", times, time.perf_counter() - start, counts)
+    drain.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Input latency of the USB read thread under synthetic CPU load, with and
+without --realtime (SCHED_FIFO + optional pinning, Linux). Runs on the fake
+USB transport; one busy process per CPU (x2) provides the load.
+
+    python benchmarks/bench_realtime.py [CPUS]
+"""
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from nocturn_studio.hardware.device import RealNocturnDevice
+from nocturn_studio.hardware.fake_usb import attach_fake_usb
+from nocturn_studio.utils.realtime import RealtimeConfig, parse_cpu_list
+
+SAMPLES = 300
+LOAD_PER_CPU = 2
+
+def spin():
+    while True:
+        pass
+
+def measure(realtime):
+    device = RealNocturnDevice()
+    device.realtime = realtime
+    arrived = threading.Event()
+    stamps = []
+    device.add_event_listener(lambda event: (stamps.append(time.perf_counter()), arrived.set()))
+    fake = attach_fake_usb(device)
+    time.sleep(0.2)
+    latencies = []
+    for i in range(SAMPLES):
+        time.sleep(random.uniform(0.002, 0.02))
+        arrived.clear()
+        start = time.perf_counter()
+        fake.inject(64, 1 if i % 2 else 127)
+        if arrived.wait(1.0):
+            latencies.append((stamps[-1] - start) * 1000.0)
+    device.disconnect()
+    latencies.sort()
+    return latencies
+
+def main():
+    cpus = parse_cpu_list(sys.argv[1]) if len(sys.argv) > 1 else None
+    load = [multiprocessing.Process(target=spin, daemon=True) for _ in range((os.cpu_count() or 1) * LOAD_PER_CPU)]
+    for proc in load:
+        proc.start()
+    try:
+        for name, realtime in (("normal", None), ("realtime", RealtimeConfig(cpus))):
+            latencies = measure(realtime)
+            p = lambda q: latencies[int(q * (len(latencies) - 1))]
+            print(f"{name:9} input latency p50 {p(0.5):.3f} ms, p99 {p(0.99):.3f} ms, "
+                  f"max {latencies[-1]:.2f} ms ({len(latencies)} samples, {len(load)} load processes)")
+    finally:
+        for proc in load:
+            proc.terminate()
+
+if __name__ == "__main__":
+    main()
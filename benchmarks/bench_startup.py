@@ -0,0 +1,32 @@
+"""
+Compares startup time and peak RSS of the GUI and headless modes, with the
+per-phase breakdown (phases on worker threads overlap the window build).
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py
+"""
+import subprocess
+import sys
+import time
+
+RUNS = 5
+
+def measure(mode_args):
+    walls, lines = [], []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-m", "nocturn_studio.main", "--measure-startup", *mode_args],
+                             capture_output=True, text=True).stdout
+        walls.append((time.perf_counter() - start) * 1000.0)
+        lines += [l for l in out.splitlines() if l.startswith("[Startup]")]
+    reports = [l for l in lines if " mode=" in l]
+    phases = [l for l in lines if " total=" in l]
+    return min(walls), reports[-1] if reports else "[Startup] no report", phases[-1] if phases else ""
+
+def main():
+    for name, mode_args in [("gui", []), ("headless", ["--headless"])]:
+        wall_ms, report, phases = measure(mode_args)
+        print(f"{name:9} wall={wall_ms:7.1f} ms (best of {RUNS})  {report}")
+        print(f"{'':9} {phases}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Bank switch time and memory of the track bank as the track count grows.
+
+    python benchmarks/bench_tracks.py
+"""
+import contextlib
+import io
+import time
+from nocturn_studio.daw.midi import MockMidiOutput
+from nocturn_studio.engine.mapper import MappingEngine
+
+TRACK_COUNTS = (2, 100, 1000, 10000)
+SWITCHES = 2000
+
+def main():
+    for tracks in TRACK_COUNTS:
+        feedback = []
+        engine = MappingEngine(MockMidiOutput(), feedback_callback=lambda cid, val: feedback.append(cid))
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine._refresh_functional_mappings()
+            engine.tracks.ensure(tracks)
+            feedback.clear()
+            start = time.perf_counter()
+            for i in range(SWITCHES):
+                engine.select_track((i * 7919) % tracks)
+            elapsed = time.perf_counter() - start
+        print(f"{tracks:6} tracks: {engine.tracks.nbytes / 1024:8.1f} KiB, "
+              f"switch {elapsed / SWITCHES * 1e6:6.1f} us, {len(feedback) / SWITCHES:.1f} feedback/switch")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Measures GUI-thread time per 1,000 encoder updates, including repaint.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_ui.py
+"""
+import time
+from PySide6.QtWidgets import QApplication
+from nocturn_studio.ui.windows.main_window import MainWindow
+
+UPDATES = 1000
+ROUNDS = 5
+
+def main():
+    app = QApplication([])
+    window = MainWindow()
+    window.show()
+    app.processEvents()
+    
+    encoders = ["encoder_1", "encoder_2", "encoder_3", "encoder_4",
+                "encoder_6", "encoder_7", "encoder_8", "speed_dial"]
+    results = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for i in range(UPDATES):
+            window.update_control(encoders[i % len(encoders)], i % 128)
+            if i % len(encoders) == len(encoders) - 1:
+                app.processEvents() # One "frame" per sweep across all encoders
+        app.processEvents()
+        results.append((time.perf_counter() - start) * 1000.0)
+    
+    start = time.perf_counter()
+    for i in range(UPDATES):
+        # Shift held/released constantly, mode switched occasionally
+        window.update_console_status("EQ" if (i // 100) % 2 else "DYNAMICS", "1", bool(i % 2))
+    app.processEvents()
+    status_ms = (time.perf_counter() - start) * 1000.0
+    
+    print(f"Encoder updates: {min(results):.1f} ms per {UPDATES} (best of {ROUNDS})")
+    print(f"Status updates:  {status_ms:.1f} ms per {UPDATES}")
+
+if __name__ == "__main__":
+    main()
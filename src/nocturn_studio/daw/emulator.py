@@ -0,0 +1,171 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from .midi import MidiMessage, MidiOutputInterface
+from ..model.mapping import MappingMode, decode_relative
+
+# Mirrors cubase/Novation/NocturnStudio: encoders (CC 10-17), speed dial (CC 18)
+# and buttons (notes 40-55) have output bindings and echo back; the
+# crossfader (CC 19) is input-only.
+CUBASE_ECHO_CCS = set(range(10, 19))
+CUBASE_ECHO_NOTES = set(range(40, 56))
+
+class EmulatedMidiInput:
+    """Stands in for RTMidiInput: the emulator delivers DAW -> controller messages here."""
+    def __init__(self):
+        self.callback: Optional[Callable[[MidiMessage], None]] = None
+
+    def open(self, callback: Callable[[MidiMessage], None]):
+        self.callback = callback
+
+    def deliver(self, msg: MidiMessage):
+        if self.callback:
+            self.callback(msg)
+
+class DawEmulator(MidiOutputInterface):
+    """
+    In-process DAW for end-to-end testing without Cubase or virtual ports.
+    Receives the controller's MIDI output, keeps parameter state and answers
+    through `self.input` with configurable echo latency and jitter. It can also
+    play automation streams and bulk dumps towards the controller.
+    """
+    def __init__(self, echo_latency_ms: float = 2.0, jitter_ms: float = 0.5,
+                 echo_ccs: Iterable[int] = CUBASE_ECHO_CCS,
+                 echo_notes: Iterable[int] = CUBASE_ECHO_NOTES,
+                 relative_ccs: Optional[Dict[int, MappingMode]] = None,
+                 seed: Optional[int] = None):
+        self.echo_latency_ms = echo_latency_ms
+        self.jitter_ms = jitter_ms
+        self.echo_ccs: Set[int] = set(echo_ccs)
+        self.echo_notes: Set[int] = set(echo_notes)
+        # CCs the DAW binds as relative encoders, with their encoding
+        self.relative_ccs: Dict[int, MappingMode] = dict(relative_ccs or {})
+        self.input = EmulatedMidiInput()
+        self._rng = random.Random(seed)
+
+        # (channel, cc) -> value and (channel, note) -> velocity
+        self.parameters: Dict[Tuple[int, int], int] = {}
+        self.notes: Dict[Tuple[int, int], int] = {}
+
+        # Delivery scheduler: (due, seq, msg)
+        self._queue: List[Tuple[float, int, MidiMessage]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = True
+
+        # Stats
+        self.scheduled = 0
+        self.received = 0
+        self.echoed = 0
+        self.delivered = 0
+        self.max_lateness_ms = 0.0 # How late the scheduler delivered vs. due time
+
+        self._thread = threading.Thread(target=self._deliver_loop, name="DawEmulator", daemon=True)
+        self._thread.start()
+
+    # --- Controller -> DAW ---
+
+    def send(self, msg: MidiMessage):
+        self.received += 1
+        kind = msg.status & 0xF0
+        channel = msg.status & 0x0F
+        if kind == 0xB0:
+            mode = self.relative_ccs.get(msg.data1)
+            if mode is not None:
+                # The DAW owns the value: apply the delta and clamp here
+                current = self.parameters.get((channel, msg.data1), 0)
+                value = max(0, min(127, current + decode_relative(mode, msg.data2)))
+                self.parameters[(channel, msg.data1)] = value
+                msg = MidiMessage(msg.status, msg.data1, value)
+            else:
+                self.parameters[(channel, msg.data1)] = msg.data2
+            if msg.data1 in self.echo_ccs:
+                self._echo(msg)
+        elif kind in (0x90, 0x80):
+            self.notes[(channel, msg.data1)] = msg.data2 if kind == 0x90 else 0
+            if msg.data1 in self.echo_notes:
+                self._echo(msg)
+
+    def _echo(self, msg: MidiMessage):
+        self.echoed += 1
+        delay = self.echo_latency_ms
+        if self.jitter_ms:
+            delay += self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        self.schedule(MidiMessage(msg.status, msg.data1, msg.data2), max(0.0, delay))
+
+    # --- DAW -> Controller ---
+
+    def set_parameter(self, cc: int, value: int, channel: int = 0, delay_ms: float = 0.0):
+        """A change made on the DAW side (mouse, automation lane...)."""
+        self.parameters[(channel, cc)] = value
+        self.schedule(MidiMessage(0xB0 | channel, cc, value), delay_ms)
+
+    def play_automation(self, cc: int, points: Iterable[Tuple[float, int]], channel: int = 0):
+        """Schedules (offset_ms, value) points for one CC, relative to now."""
+        start = time.perf_counter()
+        with self._cond:
+            for offset_ms, value in points:
+                self._push(start + offset_ms / 1000.0, MidiMessage(0xB0 | channel, cc, value))
+            self._cond.notify()
+
+    def play_ramp(self, cc: int, start_val: int, end_val: int, duration_ms: float,
+                  rate_hz: float = 1000.0, channel: int = 0):
+        """Linear automation ramp at `rate_hz` messages per second."""
+        steps = max(1, int(duration_ms * rate_hz / 1000.0))
+        points = [(i * duration_ms / steps, round(start_val + (end_val - start_val) * i / steps))
+                  for i in range(steps + 1)]
+        self.play_automation(cc, points, channel)
+
+    def bulk_dump(self, delay_ms: float = 0.0):
+        """Sends every known parameter at once, like a DAW resyncing a surface."""
+        due = time.perf_counter() + delay_ms / 1000.0
+        with self._cond:
+            for (channel, cc), value in sorted(self.parameters.items()):
+                self._push(due, MidiMessage(0xB0 | channel, cc, value))
+            self._cond.notify()
+
+    def schedule(self, msg: MidiMessage, delay_ms: float = 0.0):
+        with self._cond:
+            self._push(time.perf_counter() + delay_ms / 1000.0, msg)
+            self._cond.notify()
+
+    def _push(self, due: float, msg: MidiMessage):
+        self.scheduled += 1
+        heapq.heappush(self._queue, (due, next(self._seq), msg))
+
+    def _deliver_loop(self):
+        while True:
+            with self._cond:
+                while self._running and (not self._queue or self._queue[0][0] > time.perf_counter()):
+                    timeout = self._queue[0][0] - time.perf_counter() if self._queue else None
+                    self._cond.wait(timeout)
+                if not self._running:
+                    return
+                due, _, msg = heapq.heappop(self._queue)
+            lateness = (time.perf_counter() - due) * 1000.0
+            if lateness > self.max_lateness_ms:
+                self.max_lateness_ms = lateness
+            self.input.deliver(msg)
+            with self._cond:
+                self.delivered += 1
+                self._cond.notify_all()
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """Blocks until every scheduled message has been delivered."""
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while self.delivered < self.scheduled:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
@@ -1,12 +1,15 @@
-import rtmidi
+import threading
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Callable
+from typing import Deque, Dict, List, Callable, Optional, Sequence, Tuple
+from ..utils.metrics import REGISTRY
 
 @dataclass
 class MidiMessage:
     status: int
-    data1: int
-    data2: int
+    data1: int = 0
+    data2: int = 0
+    sysex: bytes = b"" # SysEx payload (status 0xF0), without the F0/F7 framing
 
 class MidiOutputInterface:
     def send(self, msg: MidiMessage):
@@ -15,6 +18,7 @@ class MidiOutputInterface:
 class RTMidiOutput(MidiOutputInterface):
     """Real MIDI output using rtmidi and virtual ports."""
     def __init__(self, port_name: str = "Nocturn Studio Out"):
+        import rtmidi # Imported lazily; mock/headless setups may not have it
         self.midi_out = rtmidi.MidiOut()
         self.port_name = port_name
         self.is_open = False
@@ -39,22 +43,122 @@ class MockMidiOutput(MidiOutputInterface):
         self.sent_messages.append(msg)
         print(f"[MockMIDI] Sent: {msg}")
 
+def coalesce_cc(messages: List[MidiMessage]) -> List[MidiMessage]:
+    """Keeps only the latest value per (status, CC number) within each run of
+    CCs; the update stays at the position of that CC's first message in the run.
+    Other messages pass in order and end the run, so a CC is never moved across
+    a program change or note. System realtime (clock, start/stop) carries no
+    state and doesn't end a run."""
+    out: List[MidiMessage] = []
+    latest: Dict[Tuple[int, int], int] = {}
+    for msg in messages:
+        if 0xB0 <= msg.status <= 0xBF:
+            key = (msg.status, msg.data1)
+            index = latest.get(key)
+            if index is not None:
+                out[index] = msg
+                continue
+            latest[key] = len(out)
+        elif msg.status < 0xF8:
+            latest = {}
+        out.append(msg)
+    return out
+
+class MidiInputDrain(threading.Thread):
+    """
+    Input stage between the MIDI callback and the engine. push() only queues
+    the raw bytes; this thread drains everything queued so far, parses it,
+    coalesces CC updates and delivers the result as one batch (bracketed by
+    the batch listeners' begin_batch()/end_batch()).
+    """
+    def __init__(self, callback: Optional[Callable[[MidiMessage], None]] = None):
+        super().__init__(name="midi-in-drain", daemon=True)
+        from .midi_parser import MidiParser
+        self.callback = callback
+        self.parser = MidiParser()
+        self.batch_listeners: List[object] = []
+        self._queue: Deque[Sequence[int]] = deque()
+        self._wakeup = threading.Event()
+        self._running = True
+        self._m_received = REGISTRY.counter("midi_in_received", "Raw MIDI messages received from the DAW")
+        self._m_ignored = REGISTRY.counter("midi_in_ignored", "MIDI bytes ignored (no status, broken SysEx)")
+        self._m_coalesced = REGISTRY.counter("midi_in_coalesced", "CC updates superseded within a drained batch")
+        self._m_batch = REGISTRY.histogram("midi_in_batch", "Messages per drained batch",
+                                           buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512))
+
+    def add_batch_listener(self, listener):
+        self.batch_listeners.append(listener)
+
+    def push(self, data: Sequence[int]):
+        """Called from the MIDI callback thread; never blocks on the engine."""
+        self._queue.append(data)
+        self._m_received.inc()
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+
+    def run(self):
+        while True:
+            self._wakeup.wait()
+            if not self._running:
+                return
+            self._wakeup.clear()
+            self.drain()
+
+    def drain(self) -> int:
+        """Parses and delivers everything queued; returns the number of messages delivered."""
+        messages: List[MidiMessage] = []
+        errors = self.parser.errors
+        while self._queue:
+            messages.extend(self.parser.feed(self._queue.popleft()))
+        if self.parser.errors != errors:
+            self._m_ignored.inc(self.parser.errors - errors)
+        if not messages:
+            return 0
+        self._m_batch.observe(len(messages))
+        batch = coalesce_cc(messages)
+        self._m_coalesced.inc(len(messages) - len(batch))
+        if self.callback is None:
+            return 0
+        for listener in self.batch_listeners:
+            listener.begin_batch()
+        try:
+            for msg in batch:
+                self.callback(msg)
+        finally:
+            for listener in self.batch_listeners:
+                listener.end_batch()
+        return len(batch)
+
 class RTMidiInput:
-    """Real MIDI input for learning and feedback."""
+    """Real MIDI input for learning and feedback. The rtmidi callback only
+    queues; messages reach the engine in batches from the drain thread."""
     def __init__(self, port_name: str = "Nocturn Studio In"):
+        import rtmidi
         self.midi_in = rtmidi.MidiIn()
+        # Let SysEx through; clock and active sensing stay filtered
+        self.midi_in.ignore_types(sysex=False, timing=True, active_sense=True)
         self.port_name = port_name
-        self.callback = None
+        self.drain = MidiInputDrain()
+
+    def add_batch_listener(self, listener):
+        self.drain.add_batch_listener(listener)
 
     def open(self, callback: Callable[[MidiMessage], None]):
-        self.callback = callback
+        self.drain.callback = callback
+        self.drain.start()
         self.midi_in.open_virtual_port(self.port_name)
         self.midi_in.set_callback(self._on_message)
         print(f"[MIDI] Virtual input port '{self.port_name}' opened.")
 
+    def close(self):
+        self.midi_in.cancel_callback()
+        self.midi_in.close_port()
+        self.drain.stop()
+
     def _on_message(self, event, data=None):
         message, delta_time = event
-        if len(message) >= 3:
-            msg = MidiMessage(message[0], message[1], message[2])
-            if self.callback:
-                self.callback(msg)
+        self.drain.push(message)
@@ -0,0 +1,86 @@
+from typing import Iterable, List, Optional
+from .midi import MidiMessage
+
+# Data bytes after each channel status (by high nibble)
+CHANNEL_DATA_LENGTH = {0x80: 2, 0x90: 2, 0xA0: 2, 0xB0: 2, 0xC0: 1, 0xD0: 1, 0xE0: 2}
+# System common messages; F4/F5 are undefined and F7 only ends a SysEx
+SYSTEM_DATA_LENGTH = {0xF1: 1, 0xF2: 2, 0xF3: 1, 0xF6: 0}
+SYSEX_START = 0xF0
+SYSEX_END = 0xF7
+MAX_SYSEX_BYTES = 65536
+
+class MidiParser:
+    """
+    Byte-stream MIDI parser. Handles running status, 1- and 2-byte channel
+    messages, system common messages, SysEx (returned as one message with
+    `sysex` set) and real-time bytes interleaved anywhere, including inside
+    a SysEx. State carries over between feed() calls, so a message split
+    across packets still parses. Bytes that can't belong to any message are
+    counted in `errors` and skipped.
+    """
+    def __init__(self, max_sysex: int = MAX_SYSEX_BYTES):
+        self.max_sysex = max_sysex
+        self.errors = 0
+        self._status = 0 # Status of the message being assembled (running status for channel messages)
+        self._expected = 0
+        self._data: List[int] = []
+        self._sysex: Optional[bytearray] = None
+        self._sysex_overflow = False
+
+    def feed(self, data: Iterable[int]) -> List[MidiMessage]:
+        messages = []
+        for byte in data:
+            if byte >= 0xF8:
+                # Real-time (clock, start/stop, active sensing): never affects the stream state
+                messages.append(MidiMessage(byte))
+                continue
+
+            if self._sysex is not None:
+                if byte < 0x80:
+                    if len(self._sysex) < self.max_sysex:
+                        self._sysex.append(byte)
+                    else:
+                        self._sysex_overflow = True
+                    continue
+                if byte == SYSEX_END:
+                    if self._sysex_overflow:
+                        self.errors += 1
+                    else:
+                        messages.append(MidiMessage(SYSEX_START, sysex=bytes(self._sysex)))
+                    self._sysex = None
+                    continue
+                # Unterminated SysEx: drop it, the new status byte wins
+                self.errors += 1
+                self._sysex = None
+
+            if byte < 0x80:
+                if not self._status:
+                    self.errors += 1 # Data byte without a status
+                    continue
+                self._data.append(byte)
+                if len(self._data) == self._expected:
+                    messages.append(MidiMessage(self._status, *self._data))
+                    self._data = []
+                    if self._status >= 0xF0:
+                        self._status = 0 # System common has no running status
+                continue
+
+            self._data = []
+            if byte == SYSEX_START:
+                self._status = 0
+                self._sysex = bytearray()
+                self._sysex_overflow = False
+            elif byte < 0xF0:
+                self._status = byte
+                self._expected = CHANNEL_DATA_LENGTH[byte & 0xF0]
+            else:
+                self._status = 0
+                expected = SYSTEM_DATA_LENGTH.get(byte)
+                if expected is None:
+                    self.errors += 1
+                elif expected == 0:
+                    messages.append(MidiMessage(byte))
+                else:
+                    self._status = byte
+                    self._expected = expected
+        return messages
@@ -0,0 +1,159 @@
+import socket
+import struct
+import threading
+from typing import Callable, List, Optional, Tuple, Union
+
+OscArg = Union[float, int, str]
+
+# OSC timetag 1 means "immediately"
+IMMEDIATE = 1
+# Stay below a typical 1500-byte MTU so a bundle is never fragmented
+MAX_BUNDLE_BYTES = 1400
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (4 - len(data) % 4)
+
+def _osc_string(text: str) -> bytes:
+    return _pad(text.encode("utf-8"))
+
+def encode_message(address: str, *args: OscArg) -> bytes:
+    tags = ","
+    payload = b""
+    for arg in args:
+        if isinstance(arg, float):
+            tags += "f"
+            payload += struct.pack(">f", arg)
+        elif isinstance(arg, int):
+            tags += "i"
+            payload += struct.pack(">i", arg)
+        else:
+            tags += "s"
+            payload += _osc_string(str(arg))
+    return _osc_string(address) + _osc_string(tags) + payload
+
+def encode_bundle(messages: List[bytes], timetag: int = IMMEDIATE) -> bytes:
+    parts = [_osc_string("#bundle"), struct.pack(">Q", timetag)]
+    for msg in messages:
+        parts.append(struct.pack(">i", len(msg)))
+        parts.append(msg)
+    return b"".join(parts)
+
+def _read_string(data: bytes, pos: int) -> Tuple[str, int]:
+    end = data.index(b"\0", pos)
+    return data[pos:end].decode("utf-8"), (end // 4 + 1) * 4
+
+def decode_packet(data: bytes) -> List[Tuple[str, Tuple[OscArg, ...]]]:
+    """Flattens a message or (nested) bundle into (address, args) pairs."""
+    if data.startswith(b"#bundle\0"):
+        messages = []
+        pos = 16
+        while pos < len(data):
+            size = struct.unpack_from(">i", data, pos)[0]
+            messages.extend(decode_packet(data[pos + 4:pos + 4 + size]))
+            pos += 4 + size
+        return messages
+    address, pos = _read_string(data, 0)
+    tags, pos = _read_string(data, pos)
+    args = []
+    for tag in tags[1:]:
+        if tag == "f":
+            args.append(struct.unpack_from(">f", data, pos)[0])
+            pos += 4
+        elif tag == "i":
+            args.append(struct.unpack_from(">i", data, pos)[0])
+            pos += 4
+        elif tag == "s":
+            text, pos = _read_string(data, pos)
+            args.append(text)
+        else:
+            raise ValueError(f"Unsupported OSC type tag {tag!r}")
+    return [(address, tuple(args))]
+
+class OscOutput:
+    """
+    OSC over UDP. Outside a bundle every send() is its own datagram; between
+    begin_bundle() and flush() messages collect into one bundle (latest value
+    per address wins), so an engine batch goes out as a single packet.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 9000):
+        self.address = (host, port)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._bundling = False
+        self._pending = {} # address -> encoded message
+        self.packets_sent = 0
+        print(f"[OSC] Sending to {host}:{port}")
+
+    def send(self, address: str, *args: OscArg):
+        msg = encode_message(address, *args)
+        if self._bundling:
+            self._pending[address] = msg
+        else:
+            self._send_packet(msg)
+
+    def begin_bundle(self):
+        self._bundling = True
+
+    def flush(self):
+        """Sends everything collected since begin_bundle() and leaves bundling mode."""
+        self._bundling = False
+        pending, self._pending = list(self._pending.values()), {}
+        chunk: List[bytes] = []
+        size = 16
+        for msg in pending:
+            if chunk and size + 4 + len(msg) > MAX_BUNDLE_BYTES:
+                self._send_packet(encode_bundle(chunk))
+                chunk, size = [], 16
+            chunk.append(msg)
+            size += 4 + len(msg)
+        if len(chunk) == 1:
+            self._send_packet(chunk[0])
+        elif chunk:
+            self._send_packet(encode_bundle(chunk))
+
+    def _send_packet(self, data: bytes):
+        try:
+            self._sock.sendto(data, self.address)
+            self.packets_sent += 1
+        except OSError as e:
+            print(f"[OSC] Send error: {e}")
+
+    def close(self):
+        self._sock.close()
+
+class OscReceiver(threading.Thread):
+    """Local UDP receiver for tests and benchmarks; records every packet."""
+    def __init__(self, port: int = 0, callback: Optional[Callable[[str, Tuple[OscArg, ...]], None]] = None):
+        super().__init__(name="OscReceiver", daemon=True)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind(("127.0.0.1", port))
+        self._sock.settimeout(0.1)
+        self.port = self._sock.getsockname()[1]
+        self.callback = callback
+        self.packets: List[List[Tuple[str, Tuple[OscArg, ...]]]] = []
+        self._running = True
+        self._received = threading.Condition()
+
+    def run(self):
+        while self._running:
+            try:
+                data, _ = self._sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            messages = decode_packet(data)
+            with self._received:
+                self.packets.append(messages)
+                self._received.notify_all()
+            if self.callback:
+                for address, args in messages:
+                    self.callback(address, args)
+
+    def wait_for(self, packets: int, timeout: float = 2.0) -> bool:
+        with self._received:
+            return self._received.wait_for(lambda: len(self.packets) >= packets, timeout)
+
+    def stop(self):
+        self._running = False
+        self.join(timeout=1.0)
+        self._sock.close()
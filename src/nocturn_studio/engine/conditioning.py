@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class ConditioningConfig:
+    """Input conditioning for absolute controls (e.g. the crossfader)."""
+    deadband: int = 1             # Changes of this size or less are ignored at rest
+    hysteresis: int = 1           # Extra steps needed to reverse direction
+    settle_ms: float = 150.0      # After this long without output the control counts as "at rest"
+    min_interval_ms: float = 0.0  # Rate limit (0 = off); held values go out on flush()
+    smoothing: float = 0.0        # EMA weight of the previous value, 0..1 (0 = off)
+    min_val: int = 0
+    max_val: int = 127
+
+class AbsoluteInputFilter:
+    """
+    Deadband + hysteresis (+ optional rate-limited smoothing) for one control.
+    A fader jittering by +-1 at rest produces no output at all, while a
+    deliberate move passes every step and always reaches the end stops.
+    """
+    def __init__(self, config: ConditioningConfig):
+        self.config = config
+        self.last_sent: Optional[int] = None
+        self.last_direction = 0
+        self.last_time = 0.0
+        self.pending: Optional[int] = None
+        self._ema: Optional[float] = None
+        self.suppressed = 0
+
+    def process(self, raw: int, now: float) -> Optional[int]:
+        """Returns the value to forward, or None if the report is suppressed."""
+        cfg = self.config
+        value = raw
+        if cfg.smoothing > 0.0 and raw not in (cfg.min_val, cfg.max_val):
+            self._ema = raw if self._ema is None else cfg.smoothing * self._ema + (1.0 - cfg.smoothing) * raw
+            value = int(round(self._ema))
+        else:
+            self._ema = raw
+
+        if self.last_sent is None:
+            return self._accept(value, 0, now)
+
+        delta = value - self.last_sent
+        if delta == 0:
+            self.pending = None
+            return self._suppress()
+
+        direction = 1 if delta > 0 else -1
+        at_end_stop = value in (cfg.min_val, cfg.max_val)
+        moving = direction == self.last_direction and (now - self.last_time) * 1000.0 < cfg.settle_ms
+        threshold = 0 if moving else cfg.deadband
+        if self.last_direction and direction != self.last_direction:
+            threshold += cfg.hysteresis
+        if abs(delta) <= threshold and not at_end_stop:
+            return self._suppress()
+
+        if cfg.min_interval_ms and (now - self.last_time) * 1000.0 < cfg.min_interval_ms and not at_end_stop:
+            # Too soon: hold the newest value for flush()
+            self.pending = value
+            return self._suppress()
+        return self._accept(value, direction, now)
+
+    def flush(self, now: float) -> Optional[int]:
+        """Releases a rate-limited value once its interval has elapsed."""
+        if self.pending is None:
+            return None
+        if (now - self.last_time) * 1000.0 < self.config.min_interval_ms:
+            return None
+        value = self.pending
+        direction = 1 if value > self.last_sent else -1
+        return self._accept(value, direction, now)
+
+    def _accept(self, value: int, direction: int, now: float) -> int:
+        self.last_sent = value
+        self.last_direction = direction
+        self.last_time = now
+        self.pending = None
+        return value
+
+    def _suppress(self) -> None:
+        self.suppressed += 1
+        return None
@@ -1,29 +1,82 @@
+import threading
 import time
-from typing import Dict, Optional, Callable, Any
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Callable, Any, MutableMapping
 from ..utils.persistence import PersistenceManager
+from ..utils.metrics import REGISTRY
+from ..utils.tracing import TRACER
 from ..model.events import ControlEvent, ControlEventType
-from ..model.mapping import Mapping, MappingMode, MappingTarget, TargetType
+from ..model.mapping import (Mapping, MappingMode, MappingTarget, TargetType,
+                             RELATIVE_MODES, MAX_RELATIVE_STEP, encode_relative, intern_mapping)
 from ..model.functional import ChannelFunction
+from ..model.curves import CurveTable, compile_curve
 from ..daw.midi import MidiOutputInterface, MidiMessage
+from .conditioning import AbsoluteInputFilter, ConditioningConfig
+from .state import ProfileStateStore
+from .tracks import TrackBank
+
+if TYPE_CHECKING:
+    from ..daw.osc import OscOutput # socket is only imported when OSC is enabled
+from .transforms import TransformPipeline, compile_transforms
+
+# Placeholder for functional controls the plugin doesn't map; keeps the function label visible
+UNMAPPED = intern_mapping(Mapping(MappingTarget(TargetType.MIDI_CC, identifier=0)))
+
+# Labels of a generated Smart Default profile
+DEFAULT_PROFILE_LABELS = {
+    **{f"encoder_{i}": f"Knob {i}" for i in range(1, 9)},
+    **{f"button_{i}": f"Button {i}" for i in range(1, 17)},
+    "speed_dial": "Speed Dial",
+    "crossfader": "Crossfader",
+}
+
+@dataclass
+class PreparedProfile:
+    """Result of the side-effect free half of a profile switch."""
+    name: str
+    mappings: Optional[Dict[str, Mapping]] = None # None -> revert to Global
+    labels: Optional[Dict[str, str]] = None # control_id -> label (default: the control id)
+    plugin_parameters: Optional[Dict[ChannelFunction, Mapping]] = None
+    transforms: Optional[TransformPipeline] = None
+    save: bool = False # Generated smart default: written to disk once committed
 
 class MappingEngine:
     def __init__(self, midi_out: MidiOutputInterface, 
                  feedback_callback: Optional[Callable[[str, int], None]] = None,
-                 status_callback: Optional[Callable[[str, str, bool], None]] = None):
+                 status_callback: Optional[Callable[[str, str, bool], None]] = None,
+                 label_callback: Optional[Callable[[str, str], None]] = None,
+                 osc_out: Optional["OscOutput"] = None):
         self.midi_out = midi_out
+        # OSC targets; one bundle per engine batch
+        self.osc_out = osc_out
         self.feedback_callback = feedback_callback
         self.status_callback = status_callback
+        self.label_callback = label_callback
+        # Extra value observers (e.g. control socket subscribers)
+        self.feedback_listeners: List[Callable[[str, int], None]] = []
         self.persistence = PersistenceManager()
         self.mappings: Dict[str, Mapping] = {}
+        # Labels given with the mappings (mappings are shared, so they can't carry one)
+        self.mapping_labels: Dict[str, str] = {}
+        self.global_labels: Dict[str, str] = {}
         # Store current values for controls (virtual state)
         # keyed by source_id -> int (0-127 usually)
         self.values: Dict[str, int] = {} 
-        # New: Tracking values per function to allow seamless Shift/Page swaps
-        self.functional_values: Dict[ChannelFunction, int] = {}
-        # Pre-fill with defaults (center)
-        for func in ChannelFunction:
-            self.functional_values[func] = 64
+        # Resolved display label per control. Only recomputed when mappings,
+        # mode, page, shift or profile change, never on value updates.
+        self.labels: Dict[str, str] = {}
+        # New: Tracking values per function to allow seamless Shift/Page swaps.
+        # One row per mixer track; functional_values is a view of the selected
+        # track's row (pre-filled with center defaults).
+        self.tracks = TrackBank(1)
+        self.current_track = 0
+        self.functional_values: MutableMapping[ChannelFunction, int] = self.tracks.view(0)
         self.current_profile = "Global"
+        # Values of recently used profiles, restored when switching back
+        self.profile_states = ProfileStateStore()
+        # Last committed profile (None while on the startup Global set)
+        self._active_profile: Optional[PreparedProfile] = None
         
         # New: State-Aware Functional Engine
         self.shift_active = False
@@ -71,66 +124,416 @@ class MappingEngine:
         self.last_touched_id: Optional[str] = None
         self.global_mappings = {}
         
+        # Input conditioning for absolute controls: source_id -> config
+        # (the Nocturn crossfader jitters by +-1 at rest)
+        self.input_conditioning: Dict[str, ConditioningConfig] = {
+            "crossfader": ConditioningConfig()
+        }
+        self._input_filters: Dict[str, AbsoluteInputFilter] = {}
+        
+        # User transform stages of the active profile and their per-call budget
+        self.transforms: Optional[TransformPipeline] = None
+        self.transform_budget_us = 200.0
+        
+        # Response curves of the current mappings, compiled on load: source_id -> table
+        self._curve_tables: Dict[str, CurveTable] = {}
+        
+        # Honor relative mapping modes on output. Off by default: generated and
+        # saved presets carry RELATIVE_TWOS_COMP, but the bundled Cubase script
+        # binds its CCs as absolute.
+        self.relative_output = False
+        
+        # Batching: while a batch is open, relative encoder deltas accumulate
+        # and feedback is coalesced per control; both go out when it closes.
+        self._batch_depth = 0
+        self._pending_relative: Dict[str, int] = {}
+        self._pending_feedback: Dict[str, int] = {}
+        
+        # Guards mappings/values against concurrent USB, MIDI and profile threads
+        self._lock = threading.RLock()
+        
+        # Metrics
+        self._m_events = REGISTRY.counter("engine_events_handled", "Control events dispatched")
+        self._m_handle_ms = REGISTRY.histogram("engine_handle_ms", "handle_event duration (ms)")
+        self._m_midi_sent = REGISTRY.counter("engine_midi_sent", "MIDI messages sent to the DAW")
+        self._m_midi_in = REGISTRY.counter("engine_midi_in_handled", "MIDI messages handled from the DAW")
+        self._m_switches = REGISTRY.counter("engine_profile_switches", "Profile switches committed")
+        self._m_feedback = REGISTRY.counter("engine_feedback_emitted", "Value feedback sent to hardware/UI")
+        self._m_suppressed = REGISTRY.counter("engine_input_suppressed", "Absolute control reports dropped by input conditioning")
+        
         # Initial LED state
         # (Will be called properly when device connects, but good for local state)
 
-    def load_mappings(self, mappings: Dict[str, Mapping], profile_name: str = "Global"):
+    def load_mappings(self, mappings: Dict[str, Mapping], profile_name: str = "Global",
+                      labels: Optional[Dict[str, str]] = None):
+        """Installs a mapping set. `labels` replaces the display labels; None
+        keeps the current ones when refreshing the same profile (Shift/page/mode)
+        and clears them for another profile."""
+        if labels is None and profile_name != self.current_profile:
+            labels = {}
         self.mappings = mappings
         self.current_profile = profile_name
+        if labels is not None:
+            self.mapping_labels = labels
         
         if profile_name == "Global":
             self.global_mappings = mappings
+            if labels is not None:
+                self.global_labels = labels
+        
+        self._curve_tables = {}
+        for k, m in mappings.items():
+            # MIDI CC is 7-bit; high-resolution tables only make sense for OSC targets
+            max_val = m.max_val if m.target.type == TargetType.OSC else min(m.max_val, 127)
+            table = compile_curve(m.curve, m.min_val, max_val) if m.curve else None
+            if table is not None:
+                self._curve_tables[k] = table
         
         # Initialize values to 0 if unknown
         for k in mappings:
             if k not in self.values:
                 self.values[k] = 0
+        
+        self._recompute_labels()
+
+    def _recompute_labels(self):
+        """Refreshes the label table and notifies only the labels that changed."""
+        for control_id in self.mappings:
+            label = self._resolve_label(control_id)
+            if label is None or self.labels.get(control_id) == label:
+                continue
+            self.labels[control_id] = label
+            if self.label_callback:
+                self.label_callback(control_id, label)
 
     def switch_profile(self, profile_name: str):
-        if profile_name == self.current_profile:
-            return
+        """Synchronous switch: prepare, commit and push feedback on the calling thread."""
+        prepared = self.prepare_profile(profile_name)
+        if prepared is not None:
+            self.commit_profile(prepared)
+
+    def prepare_profile(self, profile_name: str) -> Optional[PreparedProfile]:
+        """Loads (or generates) the mapping set for a profile without touching engine state.
+        
+        Returns None if the profile is already active and nothing needs to change.
+        """
+        with self._lock:
+            current = self.current_profile
+        if profile_name == current:
+            return None
             
         # Try to load from persistence
         new_mappings = self.persistence.load_preset(profile_name)
         if new_mappings:
-            print(f"[Engine] Switched to profile: {profile_name}")
-            # In Channel Strip mode, we interpret presets as ChannelFunction -> MIDI
-            if self._is_functional_profile(new_mappings):
-                self.plugin_parameters = self._convert_to_functional(new_mappings)
+            return self._prepare_from_preset(profile_name, new_mappings)
+            
+        # Generate a "Smart Default" if it's a real focus (not global/none)
+        if profile_name and profile_name not in ["Global", "None", ""]:
+            print(f"[Engine] Generating Smart Default profile for: {profile_name}")
+            default_mappings = self._generate_default_mappings()
+            # Auto-saved on commit so it persists as the base for this plugin
+            return PreparedProfile(profile_name, mappings=default_mappings, labels=DEFAULT_PROFILE_LABELS,
+                                   transforms=self._prepare_transforms(profile_name), save=True)
+            
+        # Fallback to Global
+        if current == "Global":
+            return None
+        return PreparedProfile("Global", transforms=self._prepare_transforms("Global"))
+
+    def _prepare_from_preset(self, profile_name: str, new_mappings: Dict[str, Mapping]) -> PreparedProfile:
+        # In Channel Strip mode, we interpret presets as ChannelFunction -> MIDI
+        if self._is_functional_profile(new_mappings):
+            return PreparedProfile(profile_name, plugin_parameters=self._convert_to_functional(new_mappings),
+                                   transforms=self._prepare_transforms(profile_name))
+        return PreparedProfile(profile_name, mappings=new_mappings,
+                               transforms=self._prepare_transforms(profile_name))
+
+    def _prepare_transforms(self, profile_name: str) -> Optional[TransformPipeline]:
+        """Compiles the profile's user transforms (if any) once, off the event path."""
+        source = self.persistence.load_transforms(profile_name)
+        if not source:
+            return None
+        pipeline = compile_transforms(source, profile_name, self.transform_budget_us)
+        if pipeline:
+            print(f"[Engine] Loaded {len(pipeline.stages)} transform stage(s) for {profile_name}")
+        return pipeline
+
+    def commit_profile(self, prepared: PreparedProfile, is_current: Optional[Callable[[], bool]] = None):
+        """Atomically installs a prepared mapping set, then refreshes hardware/UI.
+        
+        `is_current` lets an asynchronous caller abort the feedback push as soon
+        as a newer switch supersedes this one.
+        """
+        self._m_switches.inc()
+        with TRACER.span("engine.commit_profile", "engine"), self._lock:
+            # Park the outgoing profile's values and bring back the incoming one's
+            self.profile_states.capture(self.current_profile, self.values)
+            self._restore_profile_state(prepared.name)
+            self.transforms = prepared.transforms
+            self._active_profile = prepared if prepared.name != "Global" else None
+            
+            if prepared.plugin_parameters is not None:
+                print(f"[Engine] Switched to profile: {prepared.name}")
+                self.plugin_parameters = prepared.plugin_parameters
                 # We still want the UI to see the mappings
                 gui_mappings = self._generate_gui_mappings_from_functional()
-                self.load_mappings(gui_mappings, profile_name)
+                self.load_mappings(gui_mappings, prepared.name, labels={})
+                for hw_id in gui_mappings:
+                    func = self._get_function_for_hw_id(hw_id)
+                    if func in self.functional_values:
+                        self.values[hw_id] = self.functional_values[func]
+            elif prepared.mappings is not None:
+                print(f"[Engine] Switched to profile: {prepared.name}")
+                self.load_mappings(prepared.mappings, prepared.name, prepared.labels)
             else:
-                self.load_mappings(new_mappings, profile_name)
+                print("[Engine] Reverting to Global.")
+                self.load_mappings(self.global_mappings, "Global", self.global_labels)
+            self._sync_navigation_leds()
+            pending_feedback = list(self.values.items())
+        
+        if prepared.save and (is_current is None or is_current()):
+            self.persistence.save_preset(prepared.name, prepared.mappings)
+        
+        # Refresh UI/Hardware with current values.
+        # LED writes are cached and throttled by the device writer, so no pacing is needed here.
+        if not self.feedback_callback:
+            return
+        for source_id, val in pending_feedback:
+            if is_current is not None and not is_current():
+                return
+            self._emit_feedback(source_id, val)
+
+    def _restore_profile_state(self, profile_name: str):
+        snapshot = self.profile_states.restore(profile_name)
+        # Never seen (or evicted): start from defaults rather than the previous profile's values.
+        # Channel strip values stay in the track bank; a profile switch never touches its rows.
+        self.values = dict(snapshot.values) if snapshot is not None else {}
+
+    def session_state(self) -> Dict[str, Any]:
+        """Everything needed to warm-start the next launch, as JSON-ready data."""
+        with self._lock:
+            recent = []
+            for name in self.profile_states.recent():
+                if name == self.current_profile:
+                    continue
+                snapshot = self.profile_states.restore(name)
+                recent.append({"name": name, "values": dict(snapshot.values)})
+            # The active profile goes last, as the most recently used
+            recent.append({"name": self.current_profile, "values": dict(self.values)})
+            
+            preset = None
+            active = self._active_profile
+            if active is not None and active.name == self.current_profile:
+                if active.plugin_parameters is not None:
+                    preset = self.persistence.encode_mappings({f.name: m for f, m in active.plugin_parameters.items()})
+                else:
+                    preset = self.persistence.encode_mappings(self.mappings)
+            return {
+                "profile": self.current_profile,
+                "mode": self.current_mode,
+                "page": self.current_page,
+                "recent": recent,
+                "preset": preset,
+                "track": self.current_track,
+                "tracks": {"width": self.tracks.width, "data": self.tracks.to_hex()},
+            }
+
+    def restore_session(self, session: Dict[str, Any]):
+        """Brings back a saved session: mode/page, per-profile values and the
+        active profile (from the mapping set stored in the session, no preset parse)."""
+        with self._lock:
+            mode = session.get("mode", self.current_mode)
+            if mode in self.functional_layouts:
+                self.current_mode = mode
+                if session.get("page", 0) in self.functional_layouts[mode]:
+                    self.current_page = session.get("page", 0)
+            
+            saved_tracks = session.get("tracks")
+            if saved_tracks:
+                self.tracks = TrackBank.from_hex(saved_tracks["data"], saved_tracks["width"])
+            # Only tracks present in the saved bank (a corrupt file must not size the bank)
+            self.current_track = max(0, min(int(session.get("track", 0)), self.tracks.tracks - 1))
+            self.tracks.ensure(self.current_track + 1)
+            self.functional_values = self.tracks.view(self.current_track)
+            
+            for entry in session.get("recent", []):
+                self.profile_states.capture(entry["name"], entry.get("values", {}))
+            
+            profile = session.get("profile", "Global")
+            prepared = None
+            if profile != "Global" and session.get("preset"):
+                try:
+                    prepared = self._prepare_from_preset(profile, self.persistence.decode_mappings(session["preset"]))
+                except (KeyError, TypeError, ValueError) as e:
+                    print(f"[Engine] Session mappings for {profile} unusable ({e}); loading preset.")
+                    prepared = self.prepare_profile(profile)
+            
+            # Start from the saved Global state; a profile commit parks it again
+            if self.current_profile == "Global" and "Global" in self.profile_states:
+                self._restore_profile_state("Global")
+            self._sync_navigation_leds()
+        
+        print(f"[Engine] Session restored: {profile}, {self.current_mode} page {self.current_page + 1}")
+        if prepared is not None:
+            self.commit_profile(prepared)
         else:
-            # Generate a "Smart Default" if it's a real focus (not global/none)
-            if profile_name and profile_name not in ["Global", "None", ""]:
-                print(f"[Engine] Generating Smart Default profile for: {profile_name}")
-                default_mappings = self._generate_default_mappings()
-                self.load_mappings(default_mappings, profile_name)
-                # Auto-save so it persists as the base for this plugin
-                self.save_current_profile()
-            else:
-                # Fallback to Global
-                if self.current_profile != "Global":
-                    print(f"[Engine] Reverting to Global.")
-                    self.load_mappings(self.global_mappings, "Global")
-        
-        # Refresh UI/Hardware with current values
-        self._sync_navigation_leds()
-        for source_id, val in self.values.items():
-            if self.feedback_callback:
-                self.feedback_callback(source_id, val)
-            time.sleep(0.001) # Small delay to prevent USB flood
+            for source_id, val in list(self.values.items()):
+                self._emit_feedback(source_id, val)
+        if self.status_callback:
+            self.status_callback(self.current_mode, str(self.current_page + 1), self.shift_active)
+
+    def set_values(self, values: Dict[str, int], output: bool = True):
+        """Sets many controls as one batch (one feedback flush). With `output`
+        the new values also go to the DAW, as if the controls had been moved."""
+        with self._lock, self.batch():
+            for source_id, value in values.items():
+                mapping = self.mappings.get(source_id)
+                if mapping is not None:
+                    value = max(mapping.min_val, min(mapping.max_val, int(value)))
+                self.values[source_id] = value
+                func = self._get_function_for_hw_id(source_id)
+                if func:
+                    self.functional_values[func] = value
+                if output and mapping is not None:
+                    self._output(source_id, mapping, value)
+                self._emit_feedback(source_id, value)
+
+    def set_mode(self, mode: str, page: int = 0):
+        """Switches console mode/page, like the mode and page buttons."""
+        if mode not in self.functional_layouts:
+            raise ValueError(f"Unknown mode {mode!r}")
+        if page not in self.functional_layouts[mode]:
+            raise ValueError(f"Mode {mode} has no page {page + 1}")
+        with self._lock, self.batch():
+            self.current_mode = mode
+            self.current_page = page
+            print(f"[Console] Mode Switched: >>> {self.current_mode} MODULE <<<")
+            self._sync_navigation_leds()
+            self._refresh_functional_mappings()
+
+    def push_profile(self, name: str, preset: Dict[str, Any], save: bool = False):
+        """Installs a whole mapping set (preset file format) as profile `name`."""
+        mappings = self.persistence.decode_mappings(preset)
+        if save:
+            self.persistence.save_preset(name, mappings)
+        prepared = self._prepare_from_preset(name, mappings)
+        with self.batch():
+            self.commit_profile(prepared)
+
+    def select_track(self, track: int):
+        """Banks the channel strip to another track: O(1) row switch plus one
+        batched refresh of the controls bound to functions."""
+        track = max(0, track)
+        with self._lock:
+            if track == self.current_track:
+                return
+            self.tracks.ensure(track + 1)
+            self.current_track = track
+            self.functional_values.track = track
+            print(f"[Console] Track {track + 1}")
+            with self.batch():
+                for hw_id in self.mappings:
+                    func = self._get_function_for_hw_id(hw_id)
+                    if func:
+                        val = self.functional_values[func]
+                        self.values[hw_id] = val
+                        self._emit_feedback(hw_id, val)
 
     def handle_event(self, event: ControlEvent):
+        start = time.perf_counter()
+        with TRACER.span("engine.handle_event", "engine"), self._lock:
+            self._dispatch_event(event)
+            if self._batch_depth == 0 and self._pending_relative:
+                self._flush_relative()
+        self._m_events.inc()
+        self._m_handle_ms.observe((time.perf_counter() - start) * 1000.0)
+
+    def _emit_feedback(self, source_id: str, value: int):
+        if self._batch_depth:
+            self._pending_feedback[source_id] = value
+            return
+        mapping = self.mappings.get(source_id)
+        if mapping is not None and mapping.max_val > 127:
+            # High-resolution (OSC) control: LEDs and UI stay 0..127
+            value = (value - mapping.min_val) * 127 // (mapping.max_val - mapping.min_val)
+        if self.feedback_callback:
+            self._m_feedback.inc()
+            self.feedback_callback(source_id, value)
+        for listener in self.feedback_listeners:
+            listener(source_id, value)
+
+    def add_feedback_listener(self, listener: Callable[[str, int], None]):
+        self.feedback_listeners.append(listener)
+
+    def remove_feedback_listener(self, listener: Callable[[str, int], None]):
+        if listener in self.feedback_listeners:
+            self.feedback_listeners.remove(listener)
+
+    def begin_batch(self):
+        with self._lock:
+            self._batch_depth += 1
+            if self._batch_depth == 1 and self.osc_out is not None:
+                self.osc_out.begin_bundle()
+
+    def end_batch(self):
+        """Closes a batch; the outermost close flushes relative deltas and feedback once."""
+        with self._lock:
+            self._batch_depth -= 1
+            if self._batch_depth:
+                return
+            self._flush_relative()
+            if self.osc_out is not None:
+                self.osc_out.flush()
+            pending, self._pending_feedback = self._pending_feedback, {}
+            for source_id, value in pending.items():
+                self._emit_feedback(source_id, value)
+
+    @contextmanager
+    def batch(self):
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.end_batch()
+
+    @contextmanager
+    def locked(self):
+        """Holds the engine lock, so a group of calls runs without USB/MIDI events in between."""
+        with self._lock:
+            yield self
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Profile, mode, track, values and labels, read consistently."""
+        with self._lock:
+            return {
+                "profile": self.current_profile,
+                "mode": self.current_mode,
+                "page": self.current_page,
+                "track": self.current_track,
+                "values": dict(self.values),
+                "labels": dict(self.labels),
+            }
+
+    def _flush_relative(self):
+        """Sends one relative message per encoder for everything accumulated since the last flush."""
+        pending, self._pending_relative = self._pending_relative, {}
+        for source_id, delta in pending.items():
+            mapping = self.mappings.get(source_id)
+            if mapping is None or mapping.mode not in RELATIVE_MODES:
+                continue
+            # Only bursts beyond +-63 need more than one message
+            while delta:
+                step = max(-MAX_RELATIVE_STEP, min(MAX_RELATIVE_STEP, delta))
+                self._output(source_id, mapping, encode_relative(mapping.mode, step), apply_curve=False)
+                delta -= step
+
+    def _dispatch_event(self, event: ControlEvent):
         # 1. Intercept Navigation / Modifiers
         is_press = (event.type == ControlEventType.BUTTON_PRESS)
         
         if event.source_id == "button_16": # Shift
             self.shift_active = is_press
-            if self.feedback_callback:
-                self.feedback_callback("button_16", 127 if is_press else 0)
+            self._emit_feedback("button_16", 127 if is_press else 0)
             self._refresh_functional_mappings()
             return
 
@@ -145,8 +548,7 @@ class MappingEngine:
                     self.current_page = eq_pages[-1] if eq_pages else 0
                 self._sync_navigation_leds()
                 self._refresh_functional_mappings()
-            if self.feedback_callback:
-                self.feedback_callback("button_11", 127 if is_press else 0)
+            self._emit_feedback("button_11", 127 if is_press else 0)
             return
             
         if event.source_id == "button_12": # Page Up
@@ -159,8 +561,7 @@ class MappingEngine:
                     self.current_page = 0
                 self._sync_navigation_leds()
                 self._refresh_functional_mappings()
-            if self.feedback_callback:
-                self.feedback_callback("button_12", 127 if is_press else 0)
+            self._emit_feedback("button_12", 127 if is_press else 0)
             return
 
         if event.source_id in ["button_13", "button_14"]:
@@ -188,8 +589,11 @@ class MappingEngine:
             self._handle_fader(event, mapping)
 
     def _handle_encoder(self, event: ControlEvent, mapping: Mapping):
-        # We assume MappingMode.ABSOLUTE target for now (Virtual CC 0-127)
-        # But input is RELATIVE (delta).
+        # Input is RELATIVE (delta). Relative targets forward the delta itself,
+        # absolute targets send a clamped value from the local shadow state.
+        if self.relative_output and mapping.mode in RELATIVE_MODES:
+            self._handle_relative_encoder(event, mapping)
+            return
         
         current_val = self.values.get(event.source_id, 0)
         
@@ -210,39 +614,91 @@ class MappingEngine:
             
             label = self.get_label_for_control(event.source_id) or event.source_id
             print(f"[Console] {label:20} | Value: {new_val:3} [{'#' * (new_val // 10):13}]")
-            self._send_midi(mapping, new_val)
-            if self.feedback_callback:
-                self.feedback_callback(event.source_id, new_val)
+            self._output(event.source_id, mapping, new_val)
+            self._emit_feedback(event.source_id, new_val)
+
+    def _handle_relative_encoder(self, event: ControlEvent, mapping: Mapping):
+        # The DAW owns the value and does the clamping, so every tick counts;
+        # deltas accumulate until the next flush (end of batch/event).
+        self._pending_relative[event.source_id] = self._pending_relative.get(event.source_id, 0) + event.value
+        
+        # Shadow value only drives the LED ring/UI until the DAW echoes back
+        current_val = self.values.get(event.source_id, 0)
+        new_val = max(mapping.min_val, min(mapping.max_val, current_val + event.value))
+        if new_val != current_val:
+            self.values[event.source_id] = new_val
+            func = self._get_function_for_hw_id(event.source_id)
+            if func:
+                self.functional_values[func] = new_val
+            self._emit_feedback(event.source_id, new_val)
 
     def _handle_button(self, event: ControlEvent, mapping: Mapping):
         # We pass the raw value (0 or 127) to MIDI and UI
         val = 127 if event.type == ControlEventType.BUTTON_PRESS else 0
-        self._send_midi(mapping, val)
-        if self.feedback_callback:
-            self.feedback_callback(event.source_id, val)
+        self._output(event.source_id, mapping, val)
+        self._emit_feedback(event.source_id, val)
 
     def _handle_fader(self, event: ControlEvent, mapping: Mapping):
         # event.value is 0-127
-        self._send_midi(mapping, event.value)
-        if self.feedback_callback:
-            self.feedback_callback(event.source_id, event.value)
+        value = event.value
+        input_filter = self._get_input_filter(event.source_id)
+        if input_filter:
+            value = input_filter.process(value, time.perf_counter())
+            if value is None:
+                self._m_suppressed.inc()
+                return
+        self._output(event.source_id, mapping, value)
+        self._emit_feedback(event.source_id, value)
+
+    def _get_input_filter(self, source_id: str) -> Optional[AbsoluteInputFilter]:
+        input_filter = self._input_filters.get(source_id)
+        if input_filter is None and source_id in self.input_conditioning:
+            input_filter = AbsoluteInputFilter(self.input_conditioning[source_id])
+            self._input_filters[source_id] = input_filter
+        return input_filter
+
+    def on_idle(self):
+        """Called by the device between reports; releases rate-limited input values."""
+        if not self._input_filters:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            for source_id, input_filter in self._input_filters.items():
+                if input_filter.pending is None or source_id not in self.mappings:
+                    continue
+                value = input_filter.flush(now)
+                if value is not None:
+                    self._output(source_id, self.mappings[source_id], value)
+                    self._emit_feedback(source_id, value)
 
     def handle_midi_input(self, msg: MidiMessage):
         """Handle incoming MIDI from DAW for feedback or Learning."""
+        with TRACER.span("engine.handle_midi_input", "midi"), self._lock:
+            self._dispatch_midi_input(msg)
+        self._m_midi_in.inc()
+
+    def _dispatch_midi_input(self, msg: MidiMessage):
         # 1. Feedback Loop: If a CC matches a mapping, update local value and hardware
         matched_any = False
+        is_cc = (msg.status & 0xF0) == 0xB0
         for source_id, mapping in self.mappings.items():
-            if mapping.target.type == TargetType.MIDI_CC and mapping.target.identifier == msg.data1:
-                self.values[source_id] = msg.data2
-                if self.feedback_callback:
-                    self.feedback_callback(source_id, msg.data2)
+            if is_cc and mapping.target.type == TargetType.MIDI_CC and mapping.target.identifier == msg.data1:
+                value = msg.data2
+                table = self._curve_tables.get(source_id)
+                if table is not None:
+                    # The DAW echoes the curved value; the knob shows its position
+                    i = max(0, min(len(table.inverse) - 1, value - table.min_val))
+                    value = table.min_val + table.inverse[i]
+                self.values[source_id] = value
+                self._emit_feedback(source_id, value)
                 matched_any = True
         
         # 2. MIDI Learn: If in learn mode, assign last touched hardware to this MIDI CC
         if self.learn_mode and self.last_touched_id and not matched_any:
             if (msg.status & 0xF0) == 0xB0: # Control Change
                 new_target = MappingTarget(TargetType.MIDI_CC, identifier=msg.data1, channel=(msg.status & 0x0F))
-                self.mappings[self.last_touched_id] = Mapping(self.last_touched_id, new_target)
+                self.mappings[self.last_touched_id] = intern_mapping(Mapping(new_target))
+                self._recompute_labels()
                 print(f"[Engine] Learned: {self.last_touched_id} -> CC {msg.data1}")
                 # Save immediately? For now just keep in memory
                 # self.save_current_profile()
@@ -250,42 +706,59 @@ class MappingEngine:
     def save_current_profile(self):
         self.persistence.save_preset(self.current_profile, self.mappings)
 
+    def _output(self, source_id: str, mapping: Mapping, value: int, apply_curve: bool = True):
+        """Applies the response curve and the profile's transform stages (if any), then sends the result."""
+        if apply_curve:
+            table = self._curve_tables.get(source_id)
+            if table is not None:
+                i = value - table.min_val
+                if 0 <= i < len(table.forward):
+                    value = table.forward[i]
+        if self.transforms is not None:
+            result = self.transforms.run(source_id, mapping, value)
+            if result is None:
+                return
+            mapping, value = result
+            value = max(0, min(max(127, mapping.max_val), value))
+        self._send_midi(mapping, value)
+
     def _send_midi(self, mapping: Mapping, value: int):
         if mapping.target.type == TargetType.MIDI_CC:
             # Construct CC message: 0xB0 | channel, CC number, value
             status = 0xB0 | (mapping.target.channel & 0x0F)
-            msg = MidiMessage(status, mapping.target.identifier, value)
-            self.midi_out.send(msg)
+            msg = MidiMessage(status, mapping.target.identifier, max(0, min(127, value)))
+            with TRACER.span("engine.send_midi", "midi"):
+                self.midi_out.send(msg)
+            self._m_midi_sent.inc()
+        elif mapping.target.type == TargetType.OSC and self.osc_out is not None:
+            span = mapping.max_val - mapping.min_val
+            self.osc_out.send(mapping.target.address, (value - mapping.min_val) / span if span else 0.0)
 
     def _generate_default_mappings(self) -> Dict[str, Mapping]:
         """Creates a standard layout for new/unknown plugins."""
         m = {}
         # Encoders 1-8 -> CC 10-17
         for i in range(1, 9):
-            m[f"encoder_{i}"] = Mapping(
-                source_id=f"Knob {i}",
+            m[f"encoder_{i}"] = intern_mapping(Mapping(
                 target=MappingTarget(type=TargetType.MIDI_CC, channel=0, identifier=9+i),
                 mode=MappingMode.RELATIVE_TWOS_COMP
-            )
+            ))
         # Buttons 1-16 -> Notes 40-55
         for i in range(1, 17):
-            m[f"button_{i}"] = Mapping(
-                source_id=f"Button {i}",
+            m[f"button_{i}"] = intern_mapping(Mapping(
                 target=MappingTarget(type=TargetType.MIDI_NOTE, channel=0, identifier=39+i),
                 mode=MappingMode.SWITCH_TOGGLE
-            )
+            ))
         # Speed Dial -> CC 18
-        m["speed_dial"] = Mapping(
-            source_id="Speed Dial",
+        m["speed_dial"] = intern_mapping(Mapping(
             target=MappingTarget(type=TargetType.MIDI_CC, channel=0, identifier=18),
             mode=MappingMode.RELATIVE_TWOS_COMP
-        )
+        ))
         # Crossfader -> CC 19
-        m["crossfader"] = Mapping(
-            source_id="Crossfader",
+        m["crossfader"] = intern_mapping(Mapping(
             target=MappingTarget(type=TargetType.MIDI_CC, channel=0, identifier=19),
             mode=MappingMode.ABSOLUTE
-        )
+        ))
         return m
 
     def _is_functional_profile(self, new_mappings: Dict[str, Any]) -> bool:
@@ -315,9 +788,8 @@ class MappingEngine:
         self.values.update(btn_states)
         
         # 3. Push to hardware/UI (Using 127 for latched buttons as they seem to work well)
-        if self.feedback_callback:
-            for sid, val in btn_states.items():
-                self.feedback_callback(sid, val)
+        for sid, val in btn_states.items():
+            self._emit_feedback(sid, val)
 
     def _refresh_functional_mappings(self):
         """Updates active mappings and UI labels based on Shift/Page/Mode."""
@@ -330,8 +802,7 @@ class MappingEngine:
             if func and func in self.functional_values:
                 val = self.functional_values[func]
                 self.values[hw_id] = val
-                if self.feedback_callback:
-                    self.feedback_callback(hw_id, val)
+                self._emit_feedback(hw_id, val)
 
         # 2. Notify UI about current state (Page/Mode)
         status_msg = f"{self.current_mode} - Page {self.current_page + 1}"
@@ -364,29 +835,15 @@ class MappingEngine:
             # Resolve function based on state
             func = func_data.get("shift") if self.shift_active and "shift" in func_data else func_data.get("base")
             
-            # Use the functional name as the label ALWAYS
-            label = func.value if isinstance(func, ChannelFunction) else hw_id
-            
+            # The functional name is the label (see _resolve_label); mappings are shared as-is
             if func in self.plugin_parameters:
-                base_map = self.plugin_parameters[func]
-                gui_map[hw_id] = Mapping(
-                    source_id=label,
-                    target=base_map.target,
-                    mode=base_map.mode,
-                    min_val=base_map.min_val,
-                    max_val=base_map.max_val
-                )
-            else:
-                # Still set the label so the UI knows the "Job"
-                # Use a dummy mapping or just update the source_id of the global mapping
-                if hw_id in gui_map:
-                    gui_map[hw_id].source_id = label
-                else:
-                    gui_map[hw_id] = Mapping(source_id=label, target=MappingTarget(TargetType.MIDI_CC, identifier=0))
+                gui_map[hw_id] = self.plugin_parameters[func]
+            elif hw_id not in gui_map:
+                # Placeholder so the UI still knows the "Job"
+                gui_map[hw_id] = UNMAPPED
                     
             # Ensure UI shows the label immediately
-            if self.feedback_callback:
-                self.feedback_callback(hw_id, self.values.get(hw_id, 0))
+            self._emit_feedback(hw_id, self.values.get(hw_id, 0))
                     
         return gui_map
 
@@ -408,11 +865,18 @@ class MappingEngine:
         return func_data.get("shift") if self.shift_active and "shift" in func_data else func_data.get("base")
 
     def get_label_for_control(self, control_id: str) -> Optional[str]:
-        """Returns the functional name (e.g. 'EQ High Freq') or the source_id."""
+        """Returns the functional name (e.g. 'EQ High Freq'), the mapping's label or the control id."""
+        return self.labels.get(control_id)
+
+    def _resolve_label(self, control_id: str) -> Optional[str]:
         func = self._get_function_for_hw_id(control_id)
         if func:
             return func.value
             
-        if control_id in self.mappings:
-            return self.mappings[control_id].source_id
-        return None
+        mapping = self.mappings.get(control_id)
+        if mapping is None:
+            return None
+        label = self.mapping_labels.get(control_id)
+        if label is None and self.global_mappings.get(control_id) is mapping:
+            label = self.global_labels.get(control_id) # Global control carried into a functional page
+        return label or control_id
@@ -0,0 +1,44 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+
+@dataclass(frozen=True)
+class ProfileSnapshot:
+    """Read-only control values of a profile. Channel strip (functional)
+    values are not part of it: the engine's TrackBank owns those per track."""
+    values: Mapping[str, int]
+
+class ProfileStateStore:
+    """
+    Per-profile value snapshots with least-recently-used eviction.
+    Snapshots are immutable, so restoring hands out a shared object and the
+    engine only copies when it takes ownership of the values again.
+    """
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self._snapshots: "OrderedDict[str, ProfileSnapshot]" = OrderedDict()
+        self.evictions = 0
+
+    def capture(self, profile: str, values: Dict[str, int]):
+        self._snapshots[profile] = ProfileSnapshot(MappingProxyType(dict(values)))
+        self._snapshots.move_to_end(profile)
+        while len(self._snapshots) > self.capacity:
+            self._snapshots.popitem(last=False)
+            self.evictions += 1
+
+    def restore(self, profile: str) -> Optional[ProfileSnapshot]:
+        snapshot = self._snapshots.get(profile)
+        if snapshot is not None:
+            self._snapshots.move_to_end(profile)
+        return snapshot
+
+    def recent(self) -> List[str]:
+        """Profiles from least to most recently used."""
+        return list(self._snapshots.keys())
+
+    def __contains__(self, profile: str) -> bool:
+        return profile in self._snapshots
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
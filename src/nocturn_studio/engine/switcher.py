@@ -0,0 +1,76 @@
+import threading
+import time
+from typing import Callable, Optional
+from .mapper import MappingEngine
+from ..utils.tracing import TRACER
+
+class ProfileSwitcher(threading.Thread):
+    """
+    Latest-wins asynchronous profile switching.
+    Focus changes only record the requested profile; a worker thread prepares
+    and commits it. A newer request supersedes any switch still in flight, so
+    clicking through several plugin windows lands on the last one.
+    """
+    def __init__(self, engine: MappingEngine,
+                 on_switched: Optional[Callable[[str, float], None]] = None):
+        super().__init__(name="ProfileSwitcher", daemon=True)
+        self.engine = engine
+        self.on_switched = on_switched # (requested profile, latency ms)
+        self._cond = threading.Condition()
+        self._pending: Optional[str] = None
+        self._requested_at = 0.0
+        self._generation = 0
+        self._running = True # Cleared by stop(), even one issued before the thread runs
+        
+        # Stats
+        self.switches = 0
+        self.superseded = 0
+        self.last_latency_ms = 0.0
+
+    def request(self, profile_name: str):
+        with self._cond:
+            self._generation += 1
+            self._pending = profile_name
+            self._requested_at = time.perf_counter()
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self._running and self._pending is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                profile_name = self._pending
+                generation = self._generation
+                requested_at = self._requested_at
+                self._pending = None
+            try:
+                self._switch(profile_name, generation, requested_at)
+            except Exception as e:
+                print(f"[ProfileSwitcher] Error switching to {profile_name}: {e}")
+
+    def _is_current(self, generation: int) -> bool:
+        return generation == self._generation
+
+    def _switch(self, profile_name: str, generation: int, requested_at: float):
+        with TRACER.span("profile.prepare", "profile"):
+            prepared = self.engine.prepare_profile(profile_name)
+        if not self._is_current(generation):
+            self.superseded += 1
+            return
+        if prepared is not None:
+            self.engine.commit_profile(prepared, is_current=lambda: self._is_current(generation))
+            if not self._is_current(generation):
+                self.superseded += 1
+                return
+        self.switches += 1
+        self.last_latency_ms = (time.perf_counter() - requested_at) * 1000.0
+        print(f"[ProfileSwitcher] {profile_name} ready in {self.last_latency_ms:.1f} ms")
+        if self.on_switched:
+            self.on_switched(profile_name, self.last_latency_ms)
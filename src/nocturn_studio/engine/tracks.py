@@ -0,0 +1,83 @@
+from array import array
+from typing import Dict, Iterator, MutableMapping
+from ..model.functional import ChannelFunction
+
+FUNCTIONS = list(ChannelFunction)
+FUNCTION_INDEX: Dict[ChannelFunction, int] = {func: i for i, func in enumerate(FUNCTIONS)}
+DEFAULT_VALUE = 64 # Center
+MAX_VALUE = 0xFFFF # Values are stored as unsigned 16 bit
+
+class TrackBank:
+    """
+    Channel strip values for many tracks in one flat array (tracks x
+    functions, 16 bits per value so high-resolution targets fit). Growing
+    the bank appends rows; nothing is allocated per value, so memory stays flat.
+    """
+    def __init__(self, tracks: int = 1):
+        self.width = len(FUNCTIONS)
+        self.tracks = 0
+        self._data = array("H")
+        self.ensure(tracks)
+
+    def ensure(self, tracks: int):
+        """Grows the bank to at least `tracks` rows of default values."""
+        if tracks > self.tracks:
+            self._data.extend([DEFAULT_VALUE] * ((tracks - self.tracks) * self.width))
+            self.tracks = tracks
+
+    def get(self, track: int, func: ChannelFunction) -> int:
+        return self._data[track * self.width + FUNCTION_INDEX[func]]
+
+    def set(self, track: int, func: ChannelFunction, value: int):
+        self._data[track * self.width + FUNCTION_INDEX[func]] = value
+
+    def view(self, track: int) -> "TrackValues":
+        return TrackValues(self, track)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data) * self._data.itemsize
+
+    def to_hex(self) -> str:
+        return self._data.tobytes().hex()
+
+    @classmethod
+    def from_hex(cls, text: str, width: int) -> "TrackBank":
+        """Rebuilds a saved bank; rows saved with a different function list restart at defaults."""
+        data = bytes.fromhex(text)
+        bank = cls(0)
+        row_bytes = width * bank._data.itemsize
+        if width == bank.width and len(data) % row_bytes == 0:
+            bank._data.frombytes(data)
+            bank.tracks = len(data) // row_bytes
+        return bank
+
+class TrackValues(MutableMapping):
+    """Dict-like view of one track's row (ChannelFunction -> value).
+    Moving the view to another track is a single attribute write."""
+    __slots__ = ("bank", "track")
+
+    def __init__(self, bank: TrackBank, track: int):
+        self.bank = bank
+        self.track = track
+
+    def __getitem__(self, func: ChannelFunction) -> int:
+        if func not in FUNCTION_INDEX:
+            raise KeyError(func)
+        return self.bank.get(self.track, func)
+
+    def __setitem__(self, func: ChannelFunction, value: int):
+        self.bank.set(self.track, func, value)
+
+    def __delitem__(self, func: ChannelFunction):
+        # Rows are fixed-width; "deleting" resets to the default
+        self.bank.set(self.track, func, DEFAULT_VALUE)
+
+    def __contains__(self, func) -> bool:
+        return func in FUNCTION_INDEX
+
+    def __iter__(self) -> Iterator[ChannelFunction]:
+        return iter(FUNCTIONS)
+
+    def __len__(self) -> int:
+        return len(FUNCTIONS)
@@ -0,0 +1,116 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+from ..model.mapping import Mapping
+from ..utils.metrics import REGISTRY
+
+DEFAULT_BUDGET_US = 200.0
+DEFAULT_MAX_OVERRUNS = 5
+
+@dataclass
+class TransformContext:
+    """What a stage sees. Stages may reassign `mapping` to reroute the output."""
+    source_id: str
+    mapping: Mapping
+    profile: str
+
+class TransformStage:
+    def __init__(self, name: str, fn: Callable[[int, TransformContext], Optional[int]]):
+        self.name = name
+        self.fn = fn
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.overruns = 0
+        self.flagged = False
+        self.disabled = False
+
+    @property
+    def mean_us(self) -> float:
+        return self.total_ns / self.calls / 1000.0 if self.calls else 0.0
+
+class TransformPipeline:
+    """
+    Per-profile user transforms run between the engine and MIDI output.
+    Each stage is `fn(value, ctx) -> new value | None` (None drops the message).
+    A stage that raises or returns something that isn't a number is disabled
+    and skipped. Every call is timed; a stage over its budget is flagged, and disabled
+    once it has overrun `max_overruns` times, so a slow customization can't
+    silently eat the latency budget.
+    """
+    def __init__(self, stages: List[TransformStage], budget_us: float = DEFAULT_BUDGET_US,
+                 max_overruns: int = DEFAULT_MAX_OVERRUNS, profile: str = ""):
+        self.stages = stages
+        self.budget_ns = int(budget_us * 1000)
+        self.max_overruns = max_overruns
+        self.profile = profile
+        self._m_overruns = REGISTRY.counter("engine_transform_overruns", "Transform stage calls over budget")
+        self._m_disabled = REGISTRY.counter("engine_transform_disabled", "Transform stages disabled for overruns/errors")
+
+    def run(self, source_id: str, mapping: Mapping, value: int) -> Optional[Tuple[Mapping, int]]:
+        ctx = TransformContext(source_id, mapping, self.profile)
+        for stage in self.stages:
+            if stage.disabled:
+                continue
+            mapping = ctx.mapping
+            start = time.perf_counter_ns()
+            try:
+                result = stage.fn(value, ctx)
+                # Bad return values and reroutes count as failures of the stage, not the engine
+                if result is not None:
+                    result = int(result)
+                if not isinstance(ctx.mapping, Mapping):
+                    raise TypeError(f"ctx.mapping set to {type(ctx.mapping).__name__}")
+            except Exception as e:
+                print(f"[Transforms] {self.profile}:{stage.name} failed ({e!r}); stage disabled.")
+                stage.disabled = True
+                self._m_disabled.inc()
+                ctx.mapping = mapping
+                continue
+            elapsed = time.perf_counter_ns() - start
+
+            stage.calls += 1
+            stage.total_ns += elapsed
+            if elapsed > stage.max_ns:
+                stage.max_ns = elapsed
+            if elapsed > self.budget_ns:
+                self._overrun(stage, elapsed)
+
+            if result is None:
+                return None
+            value = result
+        return ctx.mapping, value
+
+    def _overrun(self, stage: TransformStage, elapsed_ns: int):
+        stage.overruns += 1
+        self._m_overruns.inc()
+        if not stage.flagged:
+            stage.flagged = True
+            print(f"[Transforms] {self.profile}:{stage.name} took {elapsed_ns / 1000:.0f} us "
+                  f"(budget {self.budget_ns / 1000:.0f} us)")
+        if stage.overruns >= self.max_overruns:
+            stage.disabled = True
+            self._m_disabled.inc()
+            print(f"[Transforms] {self.profile}:{stage.name} disabled after {stage.overruns} overruns.")
+
+def compile_transforms(source: str, profile: str, budget_us: float = DEFAULT_BUDGET_US,
+                       max_overruns: int = DEFAULT_MAX_OVERRUNS) -> Optional[TransformPipeline]:
+    """Compiles a profile's transform script once, at profile load.
+
+    The script either lists its stages in `STAGES = [...]` or defines
+    functions named `transform_*`, which run in definition order.
+    """
+    namespace = {"__name__": f"nocturn_transforms_{profile}"}
+    try:
+        exec(compile(source, f"<transforms:{profile}>", "exec"), namespace)
+    except Exception as e:
+        print(f"[Transforms] Could not compile transforms for {profile}: {e}")
+        return None
+
+    fns = namespace.get("STAGES")
+    if fns is None:
+        fns = [fn for name, fn in namespace.items() if name.startswith("transform_") and callable(fn)]
+    stages = [TransformStage(getattr(fn, "__name__", f"stage_{i}"), fn) for i, fn in enumerate(fns)]
+    if not stages:
+        return None
+    return TransformPipeline(stages, budget_us, max_overruns, profile)
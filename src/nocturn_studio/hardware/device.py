@@ -1,15 +1,19 @@
 import threading
 import time
-import usb.core
-import usb.util
 import sys
 from typing import Callable, List, Optional
 from ..model.events import ControlEvent, ControlEventType
+from ..utils.backoff import IdleBackoff
+from ..utils.metrics import REGISTRY
+from ..utils.realtime import RealtimeConfig, apply_to_current_thread
+from ..utils.tracing import TRACER
 
 class DeviceInterface:
     def __init__(self):
         self.connected = False
         self.callbacks: List[Callable[[ControlEvent], None]] = []
+        self.idle_callbacks: List[Callable[[], None]] = []
+        self.batch_listeners: List[object] = []
 
     def connect(self) -> bool:
         raise NotImplementedError
@@ -20,16 +24,43 @@ class DeviceInterface:
     def add_event_listener(self, callback: Callable[[ControlEvent], None]):
         self.callbacks.append(callback)
 
+    def add_idle_listener(self, callback: Callable[[], None]):
+        """Called whenever the input side has no pending reports."""
+        self.idle_callbacks.append(callback)
+
+    def add_batch_listener(self, listener):
+        """`listener` has begin_batch()/end_batch(); reports read in one burst are bracketed by them."""
+        self.batch_listeners.append(listener)
+
+    def _begin_batch(self):
+        for listener in self.batch_listeners:
+            listener.begin_batch()
+
+    def _end_batch(self):
+        for listener in self.batch_listeners:
+            listener.end_batch()
+
     def _emit(self, event: ControlEvent):
         for cb in self.callbacks:
             cb(event)
 
+    def _emit_idle(self):
+        for cb in self.idle_callbacks:
+            cb()
+
     def set_led(self, control_id: str, value: int):
         pass
 
 class RealNocturnDevice(DeviceInterface):
     VID = 0x1235
     PID = 0x000A
+    BURST_MAX_REPORTS = 32 # Reports drained into one batch before yielding
+    # Read timeout: 10 ms while active, backing off to 250 ms after 1 s of silence.
+    # A blocked read returns as soon as a report arrives, so backing off adds no latency.
+    READ_TIMEOUT_MIN_S = 0.01
+    READ_TIMEOUT_MAX_S = 0.25
+    IDLE_GRACE_S = 1.0
+    LED_TRANSFER_GAP_S = 0.002 # Pause between out-transfers within one refresh
 
     def __init__(self):
         super().__init__()
@@ -39,10 +70,30 @@ class RealNocturnDevice(DeviceInterface):
         self._ep_in = None
         self._ep_out = None
         self._led_states = {}
+        self._led_dirty = set()
+        self._led_lock = threading.Lock()
+        self._led_event = threading.Event()
         self._write_thread = None
+        # (address, value) pairs per out-transfer; dropped to 1 if the device rejects packed writes
+        self._packed_writes = True
+        self._read_backoff = IdleBackoff(self.READ_TIMEOUT_MIN_S, self.READ_TIMEOUT_MAX_S, self.IDLE_GRACE_S)
+        # Set before connect() to pin/prioritize the I/O threads (Linux, opt-in)
+        self.realtime: Optional[RealtimeConfig] = None
+        
+        # Metrics
+        self._m_reports = REGISTRY.counter("device_reports_read", "USB input reports read")
+        self._m_usb_errors = REGISTRY.counter("device_usb_errors", "USB read/write errors (timeouts excluded)")
+        self._m_led_writes = REGISTRY.counter("device_led_writes", "LED values written to the device")
+        self._m_led_transfers = REGISTRY.counter("device_led_transfers", "USB out-transfers carrying LED values")
+        self._m_queue_depth = REGISTRY.gauge("device_write_queue_depth", "LED changes waiting for the writer")
+        self._m_read_wakeups = REGISTRY.counter("device_read_wakeups", "USB read loop iterations")
+        self._m_write_wakeups = REGISTRY.counter("device_write_wakeups", "LED writer wakeups")
 
     def connect(self) -> bool:
         try:
+            # pyusb is only needed for real hardware
+            import usb.core
+            import usb.util
             print(f"[RealDevice] Searching for VID:0x{self.VID:04X} PID:0x{self.PID:04X}...")
             self.dev = usb.core.find(idVendor=self.VID, idProduct=self.PID)
             
@@ -80,64 +131,150 @@ class RealNocturnDevice(DeviceInterface):
                 print("[RealDevice] Could not find endpoints.")
                 return False
 
-            # Init command (from protocol)
-            self._write_raw(0, 0, 176)
-            self._init_leds()
-            
-            self._running = True
-            self._thread = threading.Thread(target=self._read_loop, daemon=True)
-            self._thread.start()
-            
-            self._write_thread = threading.Thread(target=self._write_loop, daemon=True)
-            self._write_thread.start()
-            
+            self._start_io()
             print("[RealDevice] Connected to Novation Nocturn via PyUSB.")
             return True
         except Exception as e:
             print(f"[RealDevice] Connection failed: {e}")
             return False
 
+    def _start_io(self):
+        """Initializes the surface and starts the I/O threads on the opened `dev`."""
+        # Init command (from protocol)
+        self._write_raw(0, 0, 176)
+        self._init_leds()
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._read_loop, name="nocturn-usb-read", daemon=True)
+        self._thread.start()
+        
+        self._write_thread = threading.Thread(target=self._write_loop, name="nocturn-led-write", daemon=True)
+        self._write_thread.start()
+
     def disconnect(self):
         self._running = False
         self.connected = False
+        self._led_event.set() # Let the writer see _running
 
     def _read_loop(self):
+        import usb.core
+        if self.realtime:
+            apply_to_current_thread(self.realtime)
+        timeout_error = getattr(usb.core, "USBTimeoutError", ())
+        backoff = self._read_backoff
         while self._running:
+            self._m_read_wakeups.inc()
             try:
                 # Read 8 bytes
-                data = self.dev.read(self._ep_in.bEndpointAddress, 8, timeout=10)
+                read_start = time.perf_counter_ns()
+                data = self.dev.read(self._ep_in.bEndpointAddress, 8, timeout=int(backoff.next_wait() * 1000))
                 if data and len(data) >= 3:
-                    self._parse_report(data)
+                    backoff.activity()
+                    if TRACER.enabled:
+                        TRACER.record("usb.read", "device", read_start, time.perf_counter_ns())
+                    self._read_burst(data)
             except usb.core.USBError as e:
-                if e.errno == 60 or "timeout" in str(e).lower():
-                    pass # Timeout is fine
+                if isinstance(e, timeout_error) or e.errno == 60 or "timeout" in str(e).lower():
+                    self._emit_idle() # Timeout is fine
                 else:
+                    self._m_usb_errors.inc()
                     print(f"[RealDevice] Read error: {e}")
                     break
             except Exception as e:
                 print(f"[RealDevice] Unexpected error: {e}")
                 break
-            time.sleep(0.001)
+
+    def _read_burst(self, data):
+        """Handles a report plus whatever is already queued behind it as one batch,
+        so a fast spin produces one relative message per encoder instead of one per tick."""
+        import usb.core
+        self._begin_batch()
+        try:
+            for _ in range(self.BURST_MAX_REPORTS):
+                self._m_reports.inc()
+                with TRACER.span("device.parse_report", "device"):
+                    self._parse_report(data)
+                try:
+                    data = self.dev.read(self._ep_in.bEndpointAddress, 8, timeout=1)
+                except usb.core.USBError:
+                    break # Nothing more queued (timeout); real errors resurface on the next read
+                if not data or len(data) < 3:
+                    break
+        finally:
+            self._end_batch()
 
     def _write_loop(self):
         """Throttled LED update loop to prevent USB buffer overflow (Error 60)"""
         last_sent = {}
-        while self._running:
-            # Copy to avoid mutation during iteration
-            current_states = dict(self._led_states)
-            for sid, val in current_states.items():
+        if self.realtime:
+            apply_to_current_thread(self.realtime)
+        while True:
+            # Sleeps until set_led() marks something dirty
+            self._led_event.wait()
+            if not self._running:
+                break
+            self._m_write_wakeups.inc()
+            with self._led_lock:
+                self._led_event.clear()
+                dirty, self._led_dirty = self._led_dirty, set()
+                pending = [(sid, self._led_states[sid]) for sid in dirty]
+            self._m_queue_depth.set(len(pending))
+            pairs = []
+            sids = {}
+            for sid, val in pending:
                 if last_sent.get(sid) != val:
                     addr = self._get_led_address(sid)
-                    if addr is not None:
-                        print(f"[Hardware] LED Write: {sid} (addr {addr}) = {val}")
-                        self._write_raw(addr, val)
+                    if addr is None:
                         last_sent[sid] = val
-                    # Tiny gap between individual CCs within the batch
-                    time.sleep(0.002) 
+                        continue
+                    pairs.append((addr, val))
+                    sids[addr] = sid
+            if pairs:
+                pairs.sort()
+                failed = set(self._write_led_pairs(pairs))
+                for addr, val in pairs:
+                    if (addr, val) not in failed:
+                        last_sent[sids[addr]] = val
+                if failed:
+                    # Retry on the next pass; a newer value set meanwhile wins
+                    with self._led_lock:
+                        self._led_dirty.update(sids[addr] for addr, _ in failed)
+                        self._led_event.set()
             
             # Master throttled rate (~20Hz is plenty for visual feedback)
             time.sleep(0.05)
 
+    def _led_pairs_per_transfer(self) -> int:
+        if not self._packed_writes:
+            return 1
+        return max(1, getattr(self._ep_out, "wMaxPacketSize", 8) // 2)
+
+    def _write_led_pairs(self, pairs):
+        """Packs (address, value) pairs into as few out-transfers as the endpoint allows.
+        Returns the pairs that could not be written."""
+        failed = []
+        i = 0
+        while i < len(pairs):
+            chunk = pairs[i:i + self._led_pairs_per_transfer()]
+            data = [b for pair in chunk for b in pair]
+            print(f"[Hardware] LED Write: {chunk}")
+            with TRACER.span("led.write", "device"):
+                ok = self._write_raw(*data)
+            if not ok and len(chunk) > 1:
+                # Rejected as a packed transfer: resend this chunk pair by pair from now on
+                print("[RealDevice] Packed LED writes rejected; falling back to one value per transfer.")
+                self._packed_writes = False
+                continue
+            if ok:
+                self._m_led_transfers.inc()
+                self._m_led_writes.inc(len(chunk))
+            else:
+                failed.extend(chunk)
+            i += len(chunk)
+            if i < len(pairs):
+                time.sleep(self.LED_TRANSFER_GAP_S)
+        return failed
+
     def _parse_report(self, data):
         # cc = data[1], val = data[2]
         cc = data[1]
@@ -179,12 +316,15 @@ class RealNocturnDevice(DeviceInterface):
         else:
             return val - 128
 
-    def _write_raw(self, *data):
+    def _write_raw(self, *data) -> bool:
         if self.dev and self._ep_out:
             try:
-                self.dev.write(self._ep_out.bEndpointAddress, data, timeout=10)
+                written = self.dev.write(self._ep_out.bEndpointAddress, data, timeout=10)
+                return written is None or written == len(data)
             except Exception as e:
+                self._m_usb_errors.inc()
                 print(f"[RealDevice] Write error: {e}")
+        return False
 
     def _init_leds(self):
         # Style 1: Standard Bar (0=Empty, 127=Full)
@@ -194,8 +334,11 @@ class RealNocturnDevice(DeviceInterface):
         self._write_raw(81, 1)
 
     def set_led(self, source_id: str, value: int):
-        # Just update the cache, worker will handle the hardware sync
-        self._led_states[source_id] = value
+        # Just update the cache and wake the worker, it handles the hardware sync
+        with self._led_lock:
+            self._led_states[source_id] = value
+            self._led_dirty.add(source_id)
+        self._led_event.set()
 
     def _get_led_address(self, source_id: str) -> Optional[int]:
         if source_id == "speed_dial": return 80
@@ -0,0 +1,58 @@
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+
+class FakeEndpoint:
+    def __init__(self, address: int, max_packet_size: int = 8):
+        self.bEndpointAddress = address
+        self.wMaxPacketSize = max_packet_size
+
+class FakeUsbDevice:
+    """
+    Stands in for a pyusb device so RealNocturnDevice's threads can run
+    without hardware (benchmarks, idle/wakeup measurements). Reads block
+    like libusb: they return as soon as a report is injected or raise a
+    timeout error once `timeout` ms have passed. `max_write` makes longer
+    out-transfers fail, like firmware that only takes one value per packet.
+    """
+    EP_IN = 0x81
+    EP_OUT = 0x02
+
+    def __init__(self, max_write: Optional[int] = None):
+        self.max_write = max_write
+        self._reports: "queue.Queue[bytes]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.writes: List[Tuple[float, Tuple[int, ...]]] = []
+        self.reads = 0
+        self.timeouts = 0
+
+    def inject(self, cc: int, value: int):
+        """Queues an input report as the Nocturn would send it."""
+        self._reports.put(bytes((0xB0, cc, value)))
+
+    def read(self, endpoint: int, size: int, timeout: int = 0):
+        import usb.core
+        self.reads += 1
+        try:
+            return self._reports.get(timeout=timeout / 1000.0 if timeout else None)
+        except queue.Empty:
+            self.timeouts += 1
+            raise usb.core.USBTimeoutError("Operation timed out", -7, 110)
+
+    def write(self, endpoint: int, data, timeout: int = 0) -> int:
+        if self.max_write is not None and len(data) > self.max_write:
+            import usb.core
+            raise usb.core.USBError("Pipe error", -9, 32)
+        with self._lock:
+            self.writes.append((time.perf_counter(), tuple(data)))
+        return len(data)
+
+def attach_fake_usb(device, max_write: Optional[int] = None) -> FakeUsbDevice:
+    """Starts a RealNocturnDevice's I/O threads on a FakeUsbDevice."""
+    fake = FakeUsbDevice(max_write)
+    device.dev = fake
+    device._ep_in = FakeEndpoint(FakeUsbDevice.EP_IN)
+    device._ep_out = FakeEndpoint(FakeUsbDevice.EP_OUT)
+    device._start_io()
+    return fake
@@ -1,34 +1,56 @@
-import time
 import threading
 from typing import Callable, Optional
 from AppKit import NSWorkspace
 from ApplicationServices import AXUIElementCreateApplication, AXUIElementCopyAttributeValue, kAXFocusedWindowAttribute, kAXTitleAttribute
+from ..utils.backoff import IdleBackoff
+from ..utils.metrics import REGISTRY
+from ..utils.tracing import TRACER
 
 class FocusMonitor(threading.Thread):
     """
     Background thread that monitors the frontmost window title on macOS.
     Useful for detecting which plugin/VST is currently focused in a DAW.
+    Polls every `interval` seconds while things change, backing off to
+    `max_interval` when focus has been stable for a while; poke() (e.g. on
+    controller input) restores the fast rate immediately. Focus can change
+    with the mouse while the controller is idle, so `max_interval` is also
+    the worst-case switch delay and stays at the original 0.5 s rate.
     """
-    def __init__(self, callback: Callable[[str, str], None], interval: float = 0.5):
-        super().__init__(daemon=True)
+    def __init__(self, callback: Callable[[str, str], None], interval: float = 0.25,
+                 max_interval: float = 0.5, idle_grace: float = 5.0):
+        super().__init__(name="FocusMonitor", daemon=True)
         self.callback = callback
         self.interval = interval
         self._running = False
         self._last_app = None
         self._last_title = None
+        self._backoff = IdleBackoff(interval, max_interval, idle_grace)
+        self._wake = threading.Event()
+        self._m_wakeups = REGISTRY.counter("focus_wakeups", "Focus monitor polls")
 
     def stop(self):
         self._running = False
+        self._wake.set()
+
+    def poke(self):
+        """Signals user activity: poll now if backed off, then stay at the fast rate."""
+        backed_off = self._backoff.backed_off
+        self._backoff.activity()
+        if backed_off:
+            self._wake.set()
 
     def run(self):
         self._running = True
         print("[FocusMonitor] Thread started.")
         while self._running:
+            self._m_wakeups.inc()
             try:
-                self._check_focus()
+                with TRACER.span("focus.check", "focus"):
+                    self._check_focus()
             except Exception as e:
                 print(f"[FocusMonitor] Error in loop: {e}")
-            time.sleep(self.interval)
+            self._wake.wait(self._backoff.next_wait())
+            self._wake.clear()
 
     def _check_focus(self):
         workspace = NSWorkspace.sharedWorkspace()
@@ -45,6 +67,7 @@ class FocusMonitor(threading.Thread):
         if app_name != self._last_app or title != self._last_title:
             self._last_app = app_name
             self._last_title = title
+            self._backoff.activity()
             print(f"[FocusMonitor] Changed: {app_name} -> {title}")
             try:
                 self.callback(app_name, title or "")
@@ -0,0 +1,279 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from ..engine.tracks import MAX_VALUE
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+class _Subscription:
+    """Per-connection value stream. Updates coalesce per control until the
+    sender thread picks them up, so a slow client never backs up the engine."""
+    def __init__(self, send: Callable[[Dict[str, Any]], bool], controls: Optional[List[str]]):
+        self.send = send
+        self.controls = set(controls) if controls else None
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self.active = True
+        threading.Thread(target=self._run, name="ControlSubscription", daemon=True).start()
+
+    def push(self, control_id: str, value: int):
+        if self.controls is not None and control_id not in self.controls:
+            return
+        with self._lock:
+            self._pending[control_id] = value
+        self._event.set()
+
+    def close(self):
+        self.active = False
+        self._event.set()
+
+    def _run(self):
+        while True:
+            self._event.wait()
+            if not self.active:
+                return
+            with self._lock:
+                self._event.clear()
+                pending, self._pending = self._pending, {}
+            if pending and not self.send({"jsonrpc": "2.0", "method": "values", "params": {"values": pending}}):
+                return
+
+class ControlServer(threading.Thread):
+    """
+    Local control API: newline-delimited JSON-RPC 2.0 over a Unix socket.
+
+      set_values     {"values": {control_id: value}, "output": true}
+      push_profile   {"name": str, "mappings": {<preset format>}, "save": false}
+      set_mode       {"mode": "EQ" | "DYNAMICS", "page": 0}
+      select_track   {"track": int}
+      get_state      {}
+      subscribe      {"controls": [control_id, ...]}  -> "values" notifications
+      unsubscribe    {}
+
+    A JSON-RPC batch (array of requests) is all or nothing: every item is
+    validated first, and only if all of them are valid do they run, inside one
+    engine batch, so their changes land together with a single feedback flush.
+    Otherwise the invalid items get their errors and the rest are not applied.
+    """
+    def __init__(self, engine, path: str):
+        super().__init__(name="ControlServer", daemon=True)
+        self.engine = engine
+        self.path = path
+        self._subscriptions: List[_Subscription] = []
+        self._sub_lock = threading.Lock()
+        self._methods = {
+            "set_values": self._set_values,
+            "push_profile": self._push_profile,
+            "set_mode": self._set_mode,
+            "select_track": self._select_track,
+            "get_state": self._get_state,
+        }
+        server_ref = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                server_ref._serve_connection(self.rfile, self.request)
+
+        if os.path.exists(path):
+            os.unlink(path) # Stale socket from a previous run
+        self._server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        self._server.daemon_threads = True
+        engine.add_feedback_listener(self._on_feedback)
+
+    def run(self):
+        print(f"[Control] Listening on {self.path}")
+        self._server.serve_forever()
+
+    def stop(self):
+        self.engine.remove_feedback_listener(self._on_feedback)
+        self._server.shutdown()
+        self._server.server_close()
+        with self._sub_lock:
+            for sub in self._subscriptions:
+                sub.close()
+            self._subscriptions = []
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _on_feedback(self, control_id: str, value: int):
+        for sub in self._subscriptions:
+            sub.push(control_id, value)
+
+    # --- Connection handling ---
+
+    def _serve_connection(self, rfile, sock: socket.socket):
+        write_lock = threading.Lock()
+
+        def send(message: Dict[str, Any]) -> bool:
+            data = (json.dumps(message, separators=(",", ":")) + "\n").encode()
+            try:
+                with write_lock:
+                    sock.sendall(data)
+                return True
+            except OSError:
+                return False
+
+        subscription: Optional[_Subscription] = None
+        try:
+            for line in rfile:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    send(self._error(None, PARSE_ERROR, f"Parse error: {e}"))
+                    continue
+
+                # Subscriptions are per connection, so they're handled here
+                if isinstance(request, dict) and request.get("method") in ("subscribe", "unsubscribe"):
+                    if subscription is not None:
+                        self._remove_subscription(subscription)
+                        subscription = None
+                    if request["method"] == "subscribe":
+                        params = request.get("params") or {}
+                        subscription = _Subscription(send, params.get("controls"))
+                        with self._sub_lock:
+                            self._subscriptions = self._subscriptions + [subscription]
+                    if "id" in request:
+                        send({"jsonrpc": "2.0", "id": request["id"], "result": True})
+                    continue
+
+                response = self.handle_request(request)
+                if response is not None:
+                    send(response)
+        finally:
+            if subscription is not None:
+                self._remove_subscription(subscription)
+
+    def _remove_subscription(self, subscription: _Subscription):
+        subscription.close()
+        with self._sub_lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    # --- Dispatch ---
+
+    def handle_request(self, request: Any) -> Any:
+        """Runs one request or a batch; returns the response (None for notifications only)."""
+        if isinstance(request, list):
+            if not request:
+                return self._error(None, INVALID_REQUEST, "Empty batch")
+            # Holding the engine lock keeps USB/MIDI threads from interleaving
+            with self.engine.locked():
+                checked = [self._check(item) for item in request]
+                if any(isinstance(c, dict) for c in checked):
+                    responses = [c if isinstance(c, dict) else self._not_applied(c) for c in checked]
+                else:
+                    with self.engine.batch():
+                        responses = [self._run(*c) for c in checked]
+            responses = [r for r in responses if r is not None]
+            return responses or None
+        checked = self._check(request)
+        return checked if isinstance(checked, dict) else self._run(*checked)
+
+    def _check(self, request: Any):
+        """Validates a request without touching the engine. Returns its error
+        response, or (request, apply) where apply() performs it."""
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return self._error(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        method = self._methods.get(request["method"])
+        try:
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Unknown method {request['method']!r}")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            return request, method(params)
+        except RpcError as e:
+            return self._error(request_id, e.code, e.message)
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            return self._error(request_id, INVALID_PARAMS, str(e))
+
+    def _run(self, request: Dict[str, Any], apply: Callable[[], Any]) -> Optional[Dict[str, Any]]:
+        request_id = request.get("id")
+        try:
+            result = apply()
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            return self._error(request_id, INVALID_PARAMS, str(e))
+        if "id" not in request:
+            return None # Notification
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def _not_applied(self, checked) -> Optional[Dict[str, Any]]:
+        request, _ = checked
+        if "id" not in request:
+            return None
+        return self._error(request["id"], INVALID_REQUEST, "Not applied: another request in the batch is invalid")
+
+    @staticmethod
+    def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    # --- Methods (validate params, return the call that applies them) ---
+
+    def _set_values(self, params: Dict[str, Any]):
+        values = params["values"]
+        if not isinstance(values, dict):
+            raise RpcError(INVALID_PARAMS, "values must be an object")
+        parsed = {}
+        for control_id, value in values.items():
+            value = int(value)
+            if not 0 <= value <= MAX_VALUE:
+                raise RpcError(INVALID_PARAMS, f"{control_id}: value {value} out of range 0..{MAX_VALUE}")
+            parsed[str(control_id)] = value
+        output = bool(params.get("output", True))
+
+        def apply():
+            self.engine.set_values(parsed, output=output)
+            return len(parsed)
+        return apply
+
+    def _push_profile(self, params: Dict[str, Any]):
+        name, preset = params["name"], params["mappings"]
+        if not isinstance(name, str) or not isinstance(preset, dict):
+            raise RpcError(INVALID_PARAMS, "name must be a string and mappings an object")
+        self.engine.persistence.decode_mappings(preset) # Raises on a malformed preset
+        save = bool(params.get("save", False))
+
+        def apply():
+            self.engine.push_profile(name, preset, save=save)
+            return self.engine.current_profile
+        return apply
+
+    def _set_mode(self, params: Dict[str, Any]):
+        mode, page = params["mode"], int(params.get("page", 0))
+        if page not in self.engine.functional_layouts.get(mode, {}):
+            raise RpcError(INVALID_PARAMS, f"Unknown mode/page {mode!r} {page + 1}")
+
+        def apply():
+            self.engine.set_mode(mode, page)
+            return True
+        return apply
+
+    def _select_track(self, params: Dict[str, Any]):
+        track = int(params["track"])
+        if track < 0:
+            raise RpcError(INVALID_PARAMS, f"Track {track} out of range")
+
+        def apply():
+            self.engine.select_track(track)
+            return self.engine.current_track
+        return apply
+
+    def _get_state(self, params: Dict[str, Any]):
+        return self.engine.snapshot_state
@@ -0,0 +1,184 @@
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+# Every visual control, in a fixed order shared by both processes
+CONTROL_IDS: Tuple[str, ...] = tuple(
+    [f"encoder_{i}" for i in range(1, 9)]
+    + ["speed_dial", "crossfader"]
+    + [f"button_{i}" for i in range(1, 17)]
+    + ["button_speed_dial"]
+)
+CONTROL_INDEX = {cid: i for i, cid in enumerate(CONTROL_IDS)}
+
+# Reader retries while a write is in progress: spin briefly, then back off, then give up
+READ_SPINS = 100
+READ_ATTEMPTS = 1000
+READ_BACKOFF_S = 0.0001
+
+LABEL_BYTES = 32
+MODE_BYTES = 16
+PLUGIN_BYTES = 64
+
+# Layout: header | values (int16 per control) | labels (fixed-width utf-8 per control)
+_HEADER = struct.Struct(f"<I{MODE_BYTES}sBB{PLUGIN_BYTES}s") # seq, mode, page, shift, plugin
+_VALUES = struct.Struct(f"<{len(CONTROL_IDS)}h")
+_LABELS_OFFSET = _HEADER.size + _VALUES.size
+BLOCK_SIZE = _LABELS_OFFSET + LABEL_BYTES * len(CONTROL_IDS)
+
+def _encode(text: str, size: int) -> bytes:
+    return text.encode("utf-8")[:size]
+
+def _decode(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("utf-8", errors="ignore")
+
+class SharedState:
+    """
+    Control values, labels and console status in one shared-memory block.
+    A single writer process publishes under a seqlock (odd sequence = write in
+    progress); readers copy the block and retry if the sequence moved, so
+    neither side ever blocks the other.
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.name = shm.name
+        self.owner = owner
+        self._write_lock = threading.Lock() # Serialises writer threads within the engine process
+
+    @classmethod
+    def create(cls) -> "SharedState":
+        shm = shared_memory.SharedMemory(create=True, size=BLOCK_SIZE)
+        shm.buf[:BLOCK_SIZE] = bytes(BLOCK_SIZE)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedState":
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    # --- Writer side (engine process) ---
+
+    def _begin(self) -> int:
+        seq = struct.unpack_from("<I", self.shm.buf, 0)[0] + 1
+        struct.pack_into("<I", self.shm.buf, 0, seq)
+        return seq
+
+    def _end(self, seq: int):
+        struct.pack_into("<I", self.shm.buf, 0, seq + 1)
+
+    def set_value(self, control_id: str, value: int):
+        idx = CONTROL_INDEX.get(control_id)
+        if idx is None:
+            return
+        with self._write_lock:
+            seq = self._begin()
+            struct.pack_into("<h", self.shm.buf, _HEADER.size + 2 * idx, value)
+            self._end(seq)
+
+    def set_label(self, control_id: str, label: str):
+        idx = CONTROL_INDEX.get(control_id)
+        if idx is None:
+            return
+        offset = _LABELS_OFFSET + LABEL_BYTES * idx
+        with self._write_lock:
+            seq = self._begin()
+            self.shm.buf[offset:offset + LABEL_BYTES] = _encode(label, LABEL_BYTES).ljust(LABEL_BYTES, b"\0")
+            self._end(seq)
+
+    def set_status(self, mode: str, page: str, shift: bool):
+        with self._write_lock:
+            seq = self._begin()
+            struct.pack_into(f"<{MODE_BYTES}sBB", self.shm.buf, 4, _encode(mode, MODE_BYTES), int(page), int(shift))
+            self._end(seq)
+
+    def set_plugin(self, name: str):
+        with self._write_lock:
+            seq = self._begin()
+            struct.pack_into(f"<{PLUGIN_BYTES}s", self.shm.buf, 4 + MODE_BYTES + 2, _encode(name, PLUGIN_BYTES))
+            self._end(seq)
+
+    # --- Reader side (UI process) ---
+
+    def read(self) -> Optional[Tuple[int, Tuple[str, str, bool], str, List[int], List[str]]]:
+        """Consistent copy: (seq, (mode, page, shift), plugin, values, labels).
+
+        None if no consistent copy could be taken (a writer that died mid-write
+        leaves the sequence odd); the caller retries on its next frame.
+        """
+        buf = self.shm.buf
+        for attempt in range(READ_ATTEMPTS):
+            seq = struct.unpack_from("<I", buf, 0)[0]
+            if not seq & 1:
+                block = bytes(buf[:BLOCK_SIZE])
+                if struct.unpack_from("<I", buf, 0)[0] == seq:
+                    break
+            time.sleep(0 if attempt < READ_SPINS else READ_BACKOFF_S)
+        else:
+            return None
+        _, mode, page, shift, plugin = _HEADER.unpack_from(block, 0)
+        values = list(_VALUES.unpack_from(block, _HEADER.size))
+        labels = [_decode(block[_LABELS_OFFSET + LABEL_BYTES * i:_LABELS_OFFSET + LABEL_BYTES * (i + 1)])
+                  for i in range(len(CONTROL_IDS))]
+        return seq, (_decode(mode), str(page), bool(shift)), _decode(plugin), values, labels
+
+class SharedStateView:
+    """
+    UI-side adapter with the same take_changes()/record_frame() interface as
+    UIFrameBuffer, plus status/plugin polling.
+    """
+    def __init__(self, state: SharedState):
+        self.state = state
+        self._seq = -1
+        self._values: List[Optional[int]] = [None] * len(CONTROL_IDS)
+        self._labels: List[Optional[str]] = [None] * len(CONTROL_IDS)
+        self._status: Optional[Tuple[str, str, bool]] = None
+        self._plugin: Optional[str] = None
+        self._pending_status: Optional[Tuple[str, str, bool]] = None
+        self._pending_plugin: Optional[str] = None
+        
+        # Stats (mirrors UIFrameBuffer)
+        self.frames = 0
+        self.last_frame_ms = 0.0
+        self.max_frame_ms = 0.0
+
+    def take_changes(self) -> Tuple[List[Tuple[str, int]], List[Tuple[str, str]]]:
+        snapshot = self.state.read()
+        if snapshot is None:
+            return [], []
+        seq, status, plugin, values, labels = snapshot
+        if seq == self._seq:
+            return [], []
+        self._seq = seq
+        changed_values, changed_labels = [], []
+        for i, cid in enumerate(CONTROL_IDS):
+            if values[i] != self._values[i]:
+                self._values[i] = values[i]
+                changed_values.append((cid, values[i]))
+            if labels[i] and labels[i] != self._labels[i]:
+                self._labels[i] = labels[i]
+                changed_labels.append((cid, labels[i]))
+        if status[0] and status != self._status:
+            self._status = self._pending_status = status
+        if plugin and plugin != self._plugin:
+            self._plugin = self._pending_plugin = plugin
+        return changed_values, changed_labels
+
+    def take_status(self) -> Optional[Tuple[str, str, bool]]:
+        status, self._pending_status = self._pending_status, None
+        return status
+
+    def take_plugin(self) -> Optional[str]:
+        plugin, self._pending_plugin = self._pending_plugin, None
+        return plugin
+
+    def record_frame(self, duration_ms: float):
+        self.frames += 1
+        self.last_frame_ms = duration_ms
+        if duration_ms > self.max_frame_ms:
+            self.max_frame_ms = duration_ms
@@ -1,44 +1,303 @@
 import sys
-import os
-from PySide6.QtWidgets import QApplication
-from .ui.windows.main_window import MainWindow
+import time
+import argparse
+import threading
+from typing import Callable, Dict, Optional
 from .engine.mapper import MappingEngine
-from .daw.midi import RTMidiOutput, MockMidiOutput, RTMidiInput
-from .hardware.device import MockNocturnDevice, RealNocturnDevice
-from .hardware.monitor import FocusMonitor
-from .model.mapping import Mapping, MappingTarget, TargetType
+from .engine.switcher import ProfileSwitcher
+from .daw.midi import MockMidiOutput
+from .hardware.device import DeviceInterface, MockNocturnDevice, RealNocturnDevice
+from .model.mapping import Mapping, MappingTarget, TargetType, intern_mapping
+from .startup import StartupOrchestrator
+from .utils.persistence import PersistenceManager
 
-from PySide6.QtCore import QTimer
-import random
+# PySide6, rtmidi, pyusb and AppKit are imported lazily so that headless mode
+# never pays for Qt and non-macOS hosts can run without the focus monitor.
 
-def main():
-    # 3. Setup UI
-    app = QApplication(sys.argv)
-    window = MainWindow()
+_STARTED_AT = time.perf_counter()
 
-    # 1. Initialize Components
+def _create_midi_output():
     try:
+        from .daw.midi import RTMidiOutput
         midi_out = RTMidiOutput()
         midi_out.open()
     except Exception as e:
         print(f"MIDI Error: {e}. Falling back to Mock.")
         midi_out = MockMidiOutput()
+    return midi_out
+
+def _create_osc_output(port: Optional[int]):
+    if port is None:
+        return None
+    from .daw.osc import OscOutput
+    return OscOutput(port=port)
+
+def _open_midi_input(engine: MappingEngine):
+    # MIDI Input for Learn/Feedback; each drained batch is one engine batch
+    try:
+        from .daw.midi import RTMidiInput
+        midi_in = RTMidiInput()
+        midi_in.add_batch_listener(engine)
+        midi_in.open(engine.handle_midi_input)
+        return midi_in
+    except Exception as e:
+        print(f"MIDI Input Error: {e}. Feedback and learn disabled.")
+        return None
 
-    # Pass UI update method via bridge for thread-safety
-    from .ui.windows.main_window import UIController
-    ui_controller = UIController()
-    ui_controller.update_signal.connect(window.update_control)
-    ui_controller.label_signal.connect(window.set_control_label)
-    ui_controller.plugin_signal.connect(window.set_plugin_name)
-    ui_controller.status_signal.connect(window.update_console_status)
-    
-    # MIDI Input for Learn/Feedback
-    midi_in = RTMidiInput()
+def _connect_device(realtime=None) -> DeviceInterface:
     device = RealNocturnDevice()
+    device.realtime = realtime
     if not device.connect():
         print("[System] Real hardware not found. Falling back to Mock.")
         device = MockNocturnDevice()
         device.connect()
+    return device
+
+def _load_session(enabled: bool = True):
+    """Reads the warm-start session file (before the device connects)."""
+    if not enabled:
+        return None, None
+    from .utils.session import SessionStore
+    store = SessionStore(PersistenceManager().app_dir / "session.json")
+    return store, store.load()
+
+def _realtime_config(cpus: Optional[str]):
+    """--realtime [CPUS] -> RealtimeConfig (None when not requested)."""
+    if cpus is None:
+        return None
+    from .utils.realtime import RealtimeConfig, parse_cpu_list
+    return RealtimeConfig(parse_cpu_list(cpus))
+
+def _submit_startup_work(startup: StartupOrchestrator, use_session: bool, persistence: PersistenceManager,
+                         realtime=None):
+    """Starts the slow, independent parts of startup on worker threads."""
+    startup.submit("session", _load_session, use_session)
+    startup.submit("midi_out", _create_midi_output)
+    startup.submit("device", _connect_device, realtime)
+    startup.submit("presets", persistence.preload_presets)
+
+def _print_progress(name: str, pending):
+    print(f"[Startup] {name} ready" + (f", connecting: {', '.join(pending)}" if pending else ""))
+
+def _start_session(engine: MappingEngine, store, session):
+    """Applies a loaded session to the engine and keeps the file up to date."""
+    if store is None:
+        return None
+    from .utils.session import SessionAutosaver
+    if session:
+        engine.restore_session(session)
+    autosaver = SessionAutosaver(store, engine.session_state)
+    autosaver.start()
+    return autosaver
+
+def _start_control_server(engine: MappingEngine, path: Optional[str]):
+    if path is None:
+        return None
+    from .ipc.control_socket import ControlServer
+    if not path:
+        path = str(PersistenceManager().app_dir / "control.sock")
+    try:
+        server = ControlServer(engine, path)
+    except OSError as e:
+        print(f"[Control] Could not listen on {path}: {e}")
+        return None
+    server.start()
+    return server
+
+def _start_gc_control(managed: bool, device: DeviceInterface):
+    """Times every GC pause; in managed mode also freezes startup objects and
+    moves full collections to idle periods."""
+    from .utils.gc_control import GcController
+    controller = GcController(managed)
+    device.add_event_listener(controller.activity)
+    device.add_idle_listener(controller.on_idle)
+    controller.install()
+    return controller
+
+def _start_focus_monitor(callback: Callable[[str, str], None], device=None):
+    try:
+        from .hardware.monitor import FocusMonitor
+    except ImportError as e:
+        print(f"[System] Focus monitor unavailable ({e}). Profiles stay on Global.")
+        return None
+    monitor = FocusMonitor(callback)
+    if device is not None:
+        # Touching the controller wakes a backed-off monitor
+        device.add_event_listener(lambda event: monitor.poke())
+    monitor.start()
+    return monitor
+
+def profile_from_focus(app_name: str, window_title: str) -> str:
+    """Determines the best profile name for a focused window."""
+    profile = window_title if window_title else app_name
+
+    # Clean up DAW-specific patterns (e.g. "Audio 01: Ins. 1 - SSLChannel Mono")
+    if " - " in profile:
+        profile = profile.split(" - ")[-1]
+
+    # Strip common Cubase/DAW prefixes
+    for junk in [": Ins. ", "Part: "]:
+        if junk in profile:
+            profile = profile.split(junk)[-1]
+
+    profile = profile.strip()
+    if not profile: profile = app_name
+
+    # Map to common VST names for clean profiles
+    for common_vst in ["Serum", "VocalSynth", "Sylenth", "FabFilter", "SSLChannel", "Massive"]:
+        if common_vst.lower() in profile.lower():
+            profile = common_vst
+            break
+    return profile
+
+# Names shown for the navigation buttons instead of their control ids
+GLOBAL_LABELS = {
+    "button_9": "Shift",
+    "button_11": "Page Dn",
+    "button_12": "Page Up",
+    "button_13": "EQ Mode",
+    "button_14": "Dyn Mode",
+}
+
+def default_global_mappings() -> Dict[str, Mapping]:
+    """Comprehensive Mappings (All controls); labels are in GLOBAL_LABELS"""
+    all_mappings = {}
+
+    # Encoders 1-8 -> CC 10-17
+    for i in range(8):
+        all_mappings[f"encoder_{i+1}"] = intern_mapping(Mapping(MappingTarget(TargetType.MIDI_CC, identifier=10+i)))
+
+    all_mappings["speed_dial"] = intern_mapping(Mapping(MappingTarget(TargetType.MIDI_CC, identifier=18)))
+    all_mappings["crossfader"] = intern_mapping(Mapping(MappingTarget(TargetType.MIDI_CC, identifier=19)))
+
+    # Buttons 1-16 -> Notes 40-55 (incl. the navigation buttons the engine intercepts)
+    for i in range(16):
+        all_mappings[f"button_{i+1}"] = intern_mapping(Mapping(MappingTarget(TargetType.MIDI_NOTE, identifier=40+i)))
+
+    all_mappings["button_speed_dial"] = intern_mapping(Mapping(MappingTarget(TargetType.MIDI_NOTE, identifier=56)))
+    return all_mappings
+
+def _initialize_engine(engine: MappingEngine, store, session):
+    """Navigation LEDs, functional and global mappings, then the saved session,
+    all in one engine batch: the LEDs and UI only ever see the restored state.
+    Runs before the profile switcher and focus monitor start, so a fresh focus
+    switch wins over the session's profile. Returns the session autosaver."""
+    with engine.batch():
+        engine._sync_navigation_leds()
+        engine._refresh_functional_mappings()
+        engine.load_mappings(default_global_mappings(), labels=GLOBAL_LABELS)
+        return _start_session(engine, store, session)
+
+def _start_metrics_server(port: Optional[int]):
+    if port is None:
+        return None
+    from .utils.metrics import MetricsServer
+    try:
+        server = MetricsServer(port=port)
+    except OSError as e:
+        print(f"[Metrics] Could not bind port {port}: {e}")
+        return None
+    server.start()
+    return server
+
+def _report_startup(mode: str):
+    import resource
+    elapsed_ms = (time.perf_counter() - _STARTED_AT) * 1000.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    qt_loaded = "PySide6" in sys.modules
+    print(f"[Startup] mode={mode} ready_ms={elapsed_ms:.1f} max_rss_mb={rss_mb:.1f} qt_loaded={qt_loaded}")
+
+def run_headless(args) -> int:
+    """Device -> engine -> MIDI pipeline without any Qt import."""
+    startup = StartupOrchestrator()
+    persistence = PersistenceManager()
+    _submit_startup_work(startup, not args.no_session, persistence, _realtime_config(args.realtime))
+    startup.wait_all(_print_progress)
+    session_store, session = startup.result("session")
+    midi_out = startup.result("midi_out")
+    device = startup.result("device")
+
+    engine = MappingEngine(midi_out, feedback_callback=device.set_led,
+                           osc_out=_create_osc_output(args.osc_port))
+    engine.persistence = persistence
+    engine.relative_output = args.relative_output
+    autosaver = _initialize_engine(engine, session_store, session)
+    device.add_event_listener(engine.handle_event)
+    device.add_idle_listener(engine.on_idle)
+    device.add_batch_listener(engine)
+
+    switcher = ProfileSwitcher(engine)
+    switcher.start()
+    startup.submit("midi_in", _open_midi_input, engine)
+    with startup.phase("services"):
+        monitor = _start_focus_monitor(
+            lambda app_name, window_title: switcher.request(profile_from_focus(app_name, window_title)), device)
+        metrics_server = _start_metrics_server(args.metrics_port)
+        control_server = _start_control_server(engine, args.control_socket)
+    startup.finish()
+    midi_in = startup.result("midi_in")
+    gc_control = _start_gc_control(args.managed_gc, device)
+
+    print("[System] Running headless. Press Ctrl+C to quit.")
+    if args.measure_startup:
+        _report_startup("headless")
+        return 0
+
+    stop = threading.Event()
+    try:
+        stop.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if monitor:
+            monitor.stop()
+        switcher.stop()
+        if midi_in:
+            midi_in.close()
+        if autosaver:
+            autosaver.stop()
+        if metrics_server:
+            metrics_server.stop()
+        if control_server:
+            control_server.stop()
+        device.disconnect()
+        gc_control.uninstall()
+    return 0
+
+def run_gui(args) -> int:
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QTimer
+    from .ui.windows.main_window import MainWindow, UIController
+
+    # 1. USB discovery, MIDI ports and presets load on workers while the window is built
+    startup = StartupOrchestrator()
+    persistence = PersistenceManager()
+    _submit_startup_work(startup, not args.no_session, persistence, _realtime_config(args.realtime))
+
+    with startup.phase("window"):
+        app = QApplication(sys.argv)
+        window = MainWindow()
+
+        # Pass UI update method via bridge for thread-safety
+        ui_controller = UIController()
+        window.attach_frame_buffer(ui_controller.frames, ui_controller.frames_pending)
+        ui_controller.plugin_signal.connect(window.set_plugin_name)
+        ui_controller.status_signal.connect(window.update_console_status)
+        window.status.showMessage("Connecting...")
+        window.show()
+
+    def on_ready(name, pending):
+        if pending:
+            window.status.showMessage(f"Connecting... ({', '.join(pending)})")
+
+    # The window keeps painting while the workers finish
+    startup.wait_all(on_ready, idle=app.processEvents)
+    session_store, session = startup.result("session")
+    midi_out = startup.result("midi_out")
+    device = startup.result("device")
+    if isinstance(device, MockNocturnDevice):
         window.status.showMessage("Connected (MOCK DEVICE)")
     else:
         window.status.showMessage("Connected (REAL HARDWARE)")
@@ -46,53 +305,38 @@ def main():
     def handle_feedback(control_id, value):
         ui_controller.trigger_update(control_id, value)
         device.set_led(control_id, value)
-        
-        # New: Functional label feedback
-        label = engine.get_label_for_control(control_id)
-        if label:
-            ui_controller.trigger_label(control_id, label)
-    
+
     # Bridge for Console Status
-    
-    engine = MappingEngine(midi_out, 
+    # Labels come from the engine's label table, only when they actually change
+    engine = MappingEngine(midi_out,
                            feedback_callback=handle_feedback,
-                           status_callback=ui_controller.status_signal.emit)
-    engine._sync_navigation_leds()
-    engine._refresh_functional_mappings()
+                           status_callback=ui_controller.status_signal.emit,
+                           label_callback=ui_controller.trigger_label,
+                           osc_out=_create_osc_output(args.osc_port))
+    engine.persistence = persistence
+    engine.relative_output = args.relative_output
+    autosaver = _initialize_engine(engine, session_store, session)
     device.add_event_listener(engine.handle_event)
+    device.add_idle_listener(engine.on_idle)
+    device.add_batch_listener(engine)
+    if autosaver:
+        app.aboutToQuit.connect(autosaver.stop)
+    if engine.current_profile != "Global":
+        ui_controller.trigger_plugin(engine.current_profile)
 
-    def on_focus_changed(app_name, window_title):
-        # Determine the best profile name
-        profile = window_title if window_title else app_name
-        
-        # Clean up DAW-specific patterns (e.g. "Audio 01: Ins. 1 - SSLChannel Mono")
-        if " - " in profile:
-            profile = profile.split(" - ")[-1]
-            
-        # Strip common Cubase/DAW prefixes
-        for junk in [": Ins. ", "Part: "]:
-            if junk in profile:
-                profile = profile.split(junk)[-1]
-        
-        profile = profile.strip()
-        if not profile: profile = app_name
-
-        # Map to common VST names for clean profiles
-        for common_vst in ["Serum", "VocalSynth", "Sylenth", "FabFilter", "SSLChannel", "Massive"]:
-            if common_vst.lower() in profile.lower():
-                profile = common_vst
-                break
-        
-        engine.switch_profile(profile)
+    def on_profile_switched(profile, latency_ms):
         # Always update UI with the detected name, even if no custom profile found
         # (Engine will use 'Global' if profile doesn't exist)
         display_name = engine.current_profile if engine.current_profile != "Global" else f"Global ({profile})"
         ui_controller.trigger_plugin(display_name)
 
-    ui_controller.update_signal.connect(window.update_control)
-    ui_controller.label_signal.connect(window.set_control_label)
-    ui_controller.plugin_signal.connect(window.set_plugin_name)
-    
+    switcher = ProfileSwitcher(engine, on_switched=on_profile_switched)
+    switcher.start()
+
+    def on_focus_changed(app_name, window_title):
+        # Latest focus wins: the switcher drops any switch this one supersedes
+        switcher.request(profile_from_focus(app_name, window_title))
+
     def on_learn_toggled(checked):
         engine.learn_mode = checked
         print(f"[System] MIDI Learn: {'ON' if checked else 'OFF'}")
@@ -102,41 +346,253 @@ def main():
 
     # Hook up the UI learn button to the engine
     window.learn_btn.clicked.connect(on_learn_toggled)
+    window.save_shortcut.activated.connect(engine.save_current_profile)
 
-    midi_in.open(engine.handle_midi_input)
-    
-    monitor = FocusMonitor(on_focus_changed)
-    monitor.start()
-    
-    # 3. Comprehensive Mappings (All controls)
-    all_mappings = {}
-    
-    # Encoders 1-8 -> CC 10-17
-    for i in range(8):
-        id = f"encoder_{i+1}"
-        all_mappings[id] = Mapping(id, MappingTarget(TargetType.MIDI_CC, identifier=10+i))
-    
-    all_mappings["speed_dial"] = Mapping("speed_dial", MappingTarget(TargetType.MIDI_CC, identifier=18))
-    all_mappings["crossfader"] = Mapping("crossfader", MappingTarget(TargetType.MIDI_CC, identifier=19))
-    
-    # Buttons 1-16 -> Notes 40-55
-    for i in range(16):
-        id = f"button_{i+1}"
-        all_mappings[id] = Mapping(id, MappingTarget(TargetType.MIDI_NOTE, identifier=40+i))
-        
-    all_mappings["button_speed_dial"] = Mapping("button_speed_dial", MappingTarget(TargetType.MIDI_NOTE, identifier=56))
+    startup.submit("midi_in", _open_midi_input, engine)
+    with startup.phase("services"):
+        monitor = _start_focus_monitor(on_focus_changed, device)
+        metrics_server = _start_metrics_server(args.metrics_port)
+        control_server = _start_control_server(engine, args.control_socket)
+    startup.finish()
+    midi_in = startup.result("midi_in")
+    gc_control = _start_gc_control(args.managed_gc, device)
+    # Same teardown as headless: services first, the device last
+    if monitor:
+        app.aboutToQuit.connect(monitor.stop)
+    app.aboutToQuit.connect(switcher.stop)
+    if midi_in:
+        app.aboutToQuit.connect(midi_in.close)
+    if metrics_server:
+        app.aboutToQuit.connect(metrics_server.stop)
+    if control_server:
+        app.aboutToQuit.connect(control_server.stop)
+    app.aboutToQuit.connect(device.disconnect)
+    app.aboutToQuit.connect(gc_control.uninstall)
+
+    if args.metrics_panel:
+        from .ui.windows.metrics_panel import MetricsPanel
+        window.metrics_panel = MetricsPanel()
+        window.metrics_panel.show()
+    if args.measure_startup:
+        QTimer.singleShot(0, lambda: (_report_startup("gui"), app.quit()))
+    return app.exec()
+
+def run_engine_process(shm_name: str, commands, metrics_port: Optional[int] = None,
+                       relative_output: bool = False, use_session: bool = True,
+                       control_socket: Optional[str] = None, osc_port: Optional[int] = None,
+                       managed_gc: bool = False, realtime: Optional[str] = None,
+                       trace: Optional[str] = None):
+    """Engine side of --split-process: owns USB, the engine and MIDI I/O.
+
+    Publishes values, labels and status into the shared block and executes
+    commands ("learn", on) / ("save_profile",) / ("metrics", id) / ("quit",)
+    sent by the UI; "metrics" is answered with ("metrics", id, snapshot).
+    """
+    from .ipc.shared_state import SharedState
+    from .utils.metrics import REGISTRY
+    from .utils.tracing import TRACER
+    if trace:
+        TRACER.enable()
+    state = SharedState.attach(shm_name)
+    startup = StartupOrchestrator()
+    persistence = PersistenceManager()
+    _submit_startup_work(startup, use_session, persistence, _realtime_config(realtime))
+    startup.wait_all(_print_progress)
+    session_store, session = startup.result("session")
+    midi_out = startup.result("midi_out")
+    device = startup.result("device")
+
+    def handle_feedback(control_id, value):
+        state.set_value(control_id, value)
+        device.set_led(control_id, value)
+
+    engine = MappingEngine(midi_out,
+                           feedback_callback=handle_feedback,
+                           status_callback=state.set_status,
+                           label_callback=state.set_label,
+                           osc_out=_create_osc_output(osc_port))
+    engine.persistence = persistence
+    engine.relative_output = relative_output
+    autosaver = _initialize_engine(engine, session_store, session)
+    device.add_event_listener(engine.handle_event)
+    device.add_idle_listener(engine.on_idle)
+    device.add_batch_listener(engine)
 
-    # Add specific navigation button mappings for the engine to intercept
-    all_mappings["button_9"] = Mapping("Shift", MappingTarget(TargetType.MIDI_NOTE, identifier=48))
-    all_mappings["button_11"] = Mapping("Page Dn", MappingTarget(TargetType.MIDI_NOTE, identifier=50))
-    all_mappings["button_12"] = Mapping("Page Up", MappingTarget(TargetType.MIDI_NOTE, identifier=51))
-    all_mappings["button_13"] = Mapping("EQ Mode", MappingTarget(TargetType.MIDI_NOTE, identifier=52))
-    all_mappings["button_14"] = Mapping("Dyn Mode", MappingTarget(TargetType.MIDI_NOTE, identifier=53))
+    def on_profile_switched(profile, latency_ms):
+        state.set_plugin(engine.current_profile if engine.current_profile != "Global" else f"Global ({profile})")
 
-    engine.load_mappings(all_mappings)
+    switcher = ProfileSwitcher(engine, on_switched=on_profile_switched)
+    switcher.start()
+    startup.submit("midi_in", _open_midi_input, engine)
+    with startup.phase("services"):
+        monitor = _start_focus_monitor(
+            lambda app_name, window_title: switcher.request(profile_from_focus(app_name, window_title)), device)
+        metrics_server = _start_metrics_server(metrics_port)
+        control_server = _start_control_server(engine, control_socket)
+    startup.finish()
+    midi_in = startup.result("midi_in")
+    gc_control = _start_gc_control(managed_gc, device)
+    on_profile_switched(engine.current_profile, 0.0)
 
+    try:
+        while True:
+            try:
+                command = commands.recv()
+            except EOFError:
+                break # UI process went away
+            if command[0] == "quit":
+                break
+            if command[0] == "learn":
+                engine.learn_mode = command[1]
+                print(f"[System] MIDI Learn: {'ON' if command[1] else 'OFF'}")
+            elif command[0] == "save_profile":
+                engine.save_current_profile()
+            elif command[0] == "metrics":
+                commands.send(("metrics", command[1], REGISTRY.snapshot()))
+    finally:
+        if monitor:
+            monitor.stop()
+        switcher.stop()
+        if midi_in:
+            midi_in.close()
+        if autosaver:
+            autosaver.stop()
+        if metrics_server:
+            metrics_server.stop()
+        if control_server:
+            control_server.stop()
+        device.disconnect()
+        gc_control.uninstall()
+        state.close()
+        if trace:
+            # The child exits without running atexit; spans go next to the UI's trace
+            TRACER.export(_engine_trace_path(trace))
+
+def _engine_trace_path(path: str) -> str:
+    """trace.json -> trace.engine.json"""
+    from pathlib import Path
+    trace = Path(path)
+    return str(trace.with_name(f"{trace.stem}.engine{trace.suffix or '.json'}"))
+
+class _EngineMetrics:
+    """Registry stand-in for the split UI's metrics panel: snapshots are
+    requested from the engine process over the command pipe. Requests carry
+    an id, so a reply that arrives after its timeout is discarded."""
+    def __init__(self, conn, timeout: float = 1.0):
+        self.conn = conn
+        self.timeout = timeout
+        self._request_id = 0
+
+    def snapshot(self) -> dict:
+        self._request_id += 1
+        self.conn.send(("metrics", self._request_id))
+        deadline = time.monotonic() + self.timeout
+        while self.conn.poll(max(0.0, deadline - time.monotonic())):
+            _, request_id, snapshot = self.conn.recv()
+            if request_id == self._request_id:
+                return snapshot
+        return {}
+
+def run_split(args) -> int:
+    """UI side of --split-process: Qt only, fed from shared memory.
+
+    A repaint or slow slot here can never delay USB reads or MIDI output.
+    """
+    import multiprocessing
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QTimer
+    from .ui.windows.main_window import MainWindow, FRAME_INTERVAL_MS
+    from .ipc.shared_state import SharedState, SharedStateView
+
+    state = SharedState.create()
+    ui_end, engine_end = multiprocessing.Pipe()
+    engine_proc = multiprocessing.Process(target=run_engine_process, name="nocturn-engine",
+                                          args=(state.name, engine_end, args.metrics_port, args.relative_output,
+                                                not args.no_session, args.control_socket, args.osc_port,
+                                                args.managed_gc, args.realtime, args.trace),
+                                          daemon=True)
+    engine_proc.start()
+
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    view = SharedStateView(state)
+    window.attach_frame_buffer(view)
+    window.status.showMessage("Connected (ENGINE PROCESS)")
+
+    def poll_status():
+        status = view.take_status()
+        if status:
+            window.update_console_status(*status)
+        plugin = view.take_plugin()
+        if plugin:
+            window.set_plugin_name(plugin)
+
+    status_timer = QTimer()
+    status_timer.setInterval(FRAME_INTERVAL_MS)
+    status_timer.timeout.connect(poll_status)
+    status_timer.start()
+
+    def on_learn_toggled(checked):
+        ui_end.send(("learn", checked))
+        if not checked:
+            # Save the profile when exiting learn mode, as in GUI mode
+            ui_end.send(("save_profile",))
+
+    window.learn_btn.clicked.connect(on_learn_toggled)
+    window.save_shortcut.activated.connect(lambda: ui_end.send(("save_profile",)))
+    if args.metrics_panel:
+        from .ui.windows.metrics_panel import MetricsPanel
+        window.metrics_panel = MetricsPanel(_EngineMetrics(ui_end))
+        window.metrics_panel.show()
     window.show()
-    sys.exit(app.exec())
+    if args.measure_startup:
+        QTimer.singleShot(0, lambda: (_report_startup("split-ui"), app.quit()))
+    try:
+        return app.exec()
+    finally:
+        ui_end.send(("quit",))
+        engine_proc.join(timeout=2.0)
+        state.close()
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(prog="nocturn-studio")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run the controller pipeline without the GUI (no Qt import)")
+    parser.add_argument("--measure-startup", action="store_true",
+                        help="Print startup time and peak RSS once ready, then exit")
+    parser.add_argument("--metrics-port", type=int, default=None, metavar="PORT",
+                        help="Serve runtime metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Record pipeline spans and write a Chrome/Perfetto trace to FILE on exit")
+    parser.add_argument("--metrics-panel", action="store_true",
+                        help="Show a live metrics window (GUI and split-process modes)")
+    parser.add_argument("--split-process", action="store_true",
+                        help="Run USB, engine and MIDI in a separate process from the Qt UI")
+    parser.add_argument("--relative-output", action="store_true",
+                        help="Send encoder deltas for mappings in a relative mode (DAW must bind them as relative)")
+    parser.add_argument("--control-socket", nargs="?", const="", default=None, metavar="PATH",
+                        help="Serve the JSON-RPC control API on a Unix socket (default: control.sock in the app folder)")
+    parser.add_argument("--osc-port", type=int, default=None, metavar="PORT",
+                        help="Send OSC-target mappings to 127.0.0.1:PORT over UDP")
+    parser.add_argument("--no-session", action="store_true",
+                        help="Start from defaults and don't read or write the warm-start session file")
+    parser.add_argument("--managed-gc", action="store_true",
+                        help="Freeze startup objects and run full garbage collections only while the controller is idle")
+    parser.add_argument("--realtime", nargs="?", const="", default=None, metavar="CPUS",
+                        help="Linux: run the USB I/O threads with real-time priority, optionally pinned to CPUS (e.g. 2,3)")
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        import atexit
+        from .utils.tracing import TRACER
+        TRACER.enable()
+        atexit.register(TRACER.export, args.trace)
+
+    if args.headless:
+        sys.exit(run_headless(args))
+    if args.split_process:
+        sys.exit(run_split(args))
+    sys.exit(run_gui(args))
 
 if __name__ == "__main__":
     main()
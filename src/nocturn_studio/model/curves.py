@@ -0,0 +1,124 @@
+import math
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+# Largest table we build: 14-bit resolution
+MAX_TABLE_SIZE = 16384
+
+CURVE_KINDS = ("linear", "log", "exp", "s_curve", "breakpoints")
+# Bend strength range; near 0 the bent shapes degenerate to a straight line
+MAX_AMOUNT = 50.0
+MIN_AMOUNT = 1e-6
+DEFAULT_AMOUNT = 4.0
+
+@dataclass(frozen=True)
+class ResponseCurve:
+    """
+    Shape of a mapping's response between min_val and max_val.
+      log / exp  - `amount` (0..MAX_AMOUNT) sets the bend (larger = stronger)
+      s_curve    - slow at both ends, `amount` sets the steepness in the middle
+      breakpoints- piecewise linear through `points` ((x, y) in 0..1); y may
+                   fall, e.g. for an inverted response
+    """
+    kind: str = "linear"
+    amount: float = DEFAULT_AMOUNT
+    points: Tuple[Tuple[float, float], ...] = ()
+
+    def __post_init__(self):
+        if self.kind not in CURVE_KINDS:
+            raise ValueError(f"Unknown curve {self.kind!r}")
+        if not 0.0 <= self.amount <= MAX_AMOUNT:
+            raise ValueError(f"Curve amount {self.amount} outside 0..{MAX_AMOUNT}")
+
+    def shape(self, x: float) -> float:
+        """Normalized response, x and result in 0..1. Only used to build tables."""
+        k = self.amount
+        if self.kind in ("log", "exp", "s_curve") and k < MIN_AMOUNT:
+            return x # No bend
+        if self.kind == "log":
+            return math.log1p(k * x) / math.log1p(k)
+        if self.kind == "exp":
+            return math.expm1(k * x) / math.expm1(k)
+        if self.kind == "s_curve":
+            return 0.5 * (1.0 + math.tanh(k * (x - 0.5)) / math.tanh(k / 2.0))
+        if self.kind == "breakpoints":
+            return _interpolate(self.points, x)
+        return x
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.kind == "breakpoints":
+            return {"kind": self.kind, "points": [list(p) for p in self.points]}
+        return {"kind": self.kind, "amount": self.amount}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResponseCurve":
+        """Lenient: an out-of-range amount is clamped so a hand-edited preset still loads."""
+        points = tuple(sorted((float(x), float(y)) for x, y in data.get("points", ())))
+        amount = float(data.get("amount", DEFAULT_AMOUNT))
+        amount = DEFAULT_AMOUNT if math.isnan(amount) else max(0.0, min(MAX_AMOUNT, amount))
+        return cls(data["kind"], amount, points)
+
+def _interpolate(points: Tuple[Tuple[float, float], ...], x: float) -> float:
+    pts = list(points)
+    if not pts or pts[0][0] > 0.0:
+        pts.insert(0, (0.0, 0.0))
+    if pts[-1][0] < 1.0:
+        pts.append((1.0, 1.0))
+    i = bisect_left([p[0] for p in pts], x)
+    if i == 0:
+        return pts[0][1]
+    (x0, y0), (x1, y1) = pts[i - 1], pts[min(i, len(pts) - 1)]
+    return y0 if x1 == x0 else y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+
+class CurveTable:
+    """
+    A curve compiled for one value range: `forward[position - min_val]` is the
+    value to send, `inverse[sent - min_val]` maps a DAW echo back to a knob
+    position. Both are plain arrays, so the event path is one indexed read.
+    """
+    __slots__ = ("min_val", "forward", "inverse")
+
+    def __init__(self, curve: ResponseCurve, min_val: int, max_val: int):
+        self.min_val = min_val
+        span = max_val - min_val
+        size = span + 1
+        forward = array("i", (min_val + round(max(0.0, min(1.0, curve.shape(i / span if span else 0.0)))
+                                                 * span) for i in range(size)))
+        self.forward = forward
+        # First position producing each output value; breakpoints may fall, so no bisect over `forward`
+        inverse = [-1] * size
+        for position, value in enumerate(forward):
+            if inverse[value - min_val] < 0:
+                inverse[value - min_val] = position
+        # Values the curve never produces map to the position of the nearest one it does
+        produced = [y for y in range(size) if inverse[y] >= 0]
+        for y in range(size):
+            if inverse[y] < 0:
+                i = bisect_left(produced, y)
+                below = produced[i - 1] if i > 0 else None
+                above = produced[i] if i < len(produced) else None
+                nearest = above if below is None or (above is not None and above - y <= y - below) else below
+                inverse[y] = inverse[nearest]
+        self.inverse = array("i", inverse)
+
+# Tables are shared by every mapping with the same curve and range
+_TABLES: Dict[Tuple[ResponseCurve, int, int], CurveTable] = {}
+compiled_tables = 0
+
+def compile_curve(curve: ResponseCurve, min_val: int, max_val: int) -> Optional[CurveTable]:
+    """Returns the (cached) lookup table for a curve over min_val..max_val; None for linear."""
+    global compiled_tables
+    if curve.kind == "linear" or max_val <= min_val:
+        return None
+    if max_val - min_val + 1 > MAX_TABLE_SIZE:
+        print(f"[Curves] Range {min_val}..{max_val} exceeds {MAX_TABLE_SIZE} steps; curve ignored.")
+        return None
+    key = (curve, min_val, max_val)
+    table = _TABLES.get(key)
+    if table is None:
+        table = CurveTable(curve, min_val, max_val)
+        _TABLES[key] = table
+        compiled_tables += 1
+    return table
@@ -1,6 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum, auto
-from typing import Optional
+from typing import Dict, Optional
+from .curves import ResponseCurve
 
 class MappingMode(Enum):
     ABSOLUTE = auto()
@@ -10,23 +11,70 @@ class MappingMode(Enum):
     SWITCH_TOGGLE = auto()
     SWITCH_MOMENTARY = auto()
 
+RELATIVE_MODES = frozenset({
+    MappingMode.RELATIVE_TWOS_COMP,
+    MappingMode.RELATIVE_BINARY_OFFSET,
+    MappingMode.RELATIVE_SIGNED_BIT,
+})
+
+# Largest step a single relative message can carry
+MAX_RELATIVE_STEP = 63
+
+def encode_relative(mode: MappingMode, delta: int) -> int:
+    """Encodes a delta (-63..63) as a 7-bit relative CC value."""
+    if mode == MappingMode.RELATIVE_TWOS_COMP:
+        return delta & 0x7F # 1..63 = inc, 127..65 = dec
+    if mode == MappingMode.RELATIVE_BINARY_OFFSET:
+        return 64 + delta # 65 = +1, 63 = -1
+    if mode == MappingMode.RELATIVE_SIGNED_BIT:
+        return delta if delta >= 0 else 64 | -delta # Bit 6 = negative
+    raise ValueError(f"{mode} is not a relative mode")
+
+def decode_relative(mode: MappingMode, value: int) -> int:
+    """Inverse of encode_relative."""
+    if mode == MappingMode.RELATIVE_TWOS_COMP:
+        return value - 128 if value >= 64 else value
+    if mode == MappingMode.RELATIVE_BINARY_OFFSET:
+        return value - 64
+    if mode == MappingMode.RELATIVE_SIGNED_BIT:
+        return -(value & 0x3F) if value & 0x40 else value
+    raise ValueError(f"{mode} is not a relative mode")
+
 class TargetType(Enum):
     MIDI_CC = auto()
     MIDI_NOTE = auto()
     MIDI_PITCHBEND = auto()
     KEYBOARD_SHORTCUT = auto() # Future proofing
+    OSC = auto() # Float 0..1 to `address`; min_val..max_val sets the resolution
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MappingTarget:
     type: TargetType
     channel: int = 0
     identifier: int = 0 # CC Number or Note Number
-    
-@dataclass
+    address: str = "" # OSC address pattern (OSC targets only)
+
+@dataclass(frozen=True, slots=True)
 class Mapping:
-    source_id: str
+    """What a control drives. Immutable and shared: the control it sits on
+    and its display label live in the profile (dict key / label table)."""
     target: MappingTarget
     mode: MappingMode = MappingMode.ABSOLUTE
     min_val: int = 0
     max_val: int = 127
     enabled: bool = True
+    curve: Optional[ResponseCurve] = None # None = linear
+
+# Hash-consing tables: equal targets/mappings resolve to one instance
+_TARGETS: Dict[MappingTarget, MappingTarget] = {}
+_MAPPINGS: Dict[Mapping, Mapping] = {}
+
+def intern_mapping(mapping: Mapping) -> Mapping:
+    """Returns the shared instance equal to `mapping` (with a shared target)."""
+    shared = _MAPPINGS.get(mapping)
+    if shared is None:
+        target = _TARGETS.setdefault(mapping.target, mapping.target)
+        if target is not mapping.target:
+            mapping = replace(mapping, target=target)
+        shared = _MAPPINGS.setdefault(mapping, mapping)
+    return shared
@@ -0,0 +1,92 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+class StartupOrchestrator:
+    """
+    Runs independent startup phases (USB discovery, MIDI ports, preset
+    loading) on worker threads while the main thread builds the window, and
+    records how long each phase took.
+
+        startup = StartupOrchestrator()
+        startup.submit("device", _connect_device)
+        with startup.phase("window"):
+            window = MainWindow()
+        startup.wait_all(lambda name, pending: print(name, "ready"))
+        device = startup.result("device")
+        startup.finish()
+    """
+    def __init__(self, max_workers: int = 4):
+        self._started = time.perf_counter()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self._futures: Dict[str, Future] = {}
+        self._reported: Set[str] = set()
+        self._lock = threading.Lock()
+        # name -> (start offset ms, duration ms)
+        self.timings: Dict[str, Tuple[float, float]] = {}
+
+    def submit(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Starts `fn` on a worker; errors are re-raised by the future's result()."""
+        def timed():
+            with self.phase(name):
+                return fn(*args, **kwargs)
+        future = self._executor.submit(timed)
+        self._futures[name] = future
+        return future
+
+    @contextmanager
+    def phase(self, name: str):
+        """Times work done on the calling thread (e.g. building the window)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.timings[name] = ((start - self._started) * 1000.0, (end - start) * 1000.0)
+
+    def result(self, name: str) -> Any:
+        return self._futures[name].result()
+
+    def pending(self) -> List[str]:
+        return [name for name, future in self._futures.items() if not future.done()]
+
+    def wait_all(self, on_ready: Optional[Callable[[str, List[str]], None]] = None,
+                 idle: Optional[Callable[[], None]] = None, interval: float = 0.02):
+        """
+        Blocks until every submitted phase finished. Runs on the calling thread:
+          on_ready(name, still_pending) - as each phase completes (may touch the UI)
+          idle()                        - every `interval` s while waiting (e.g. processEvents)
+        """
+        while True:
+            waiting = {future: name for name, future in self._futures.items() if name not in self._reported}
+            if not waiting:
+                return
+            done, _ = wait(waiting, timeout=interval if idle else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._reported.add(waiting[future])
+                if on_ready:
+                    on_ready(waiting[future], self.pending())
+            if idle:
+                idle()
+
+    def finish(self) -> str:
+        """Waits for stragglers, stops the workers and prints the timing breakdown."""
+        self.wait_all()
+        self._executor.shutdown(wait=False)
+        report = self.report()
+        print(report)
+        return report
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000.0
+
+    def report(self) -> str:
+        """One line per startup, slowest phase first: "name=duration@start"."""
+        with self._lock:
+            phases = sorted(self.timings.items(), key=lambda item: -item[1][1])
+        parts = " ".join(f"{name}={duration:.1f}ms@{start:.0f}" for name, (start, duration) in phases)
+        return f"[Startup] total={self.elapsed_ms:.1f}ms {parts}"
@@ -0,0 +1,71 @@
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+class UIFrameBuffer:
+    """
+    Latest-value table shared between background threads and the GUI thread.
+    Writers only record the newest value/label per control; the GUI thread
+    drains whatever changed once per frame, so a fast spin costs one widget
+    update per frame instead of one queued slot call per report.
+    `on_pending` is called (on the writer's thread) when the first change
+    after a drain is queued, so the GUI only runs its frame timer while
+    there is something to apply.
+    """
+    def __init__(self, on_pending: Optional[Callable[[], None]] = None):
+        self.on_pending = on_pending
+        self._lock = threading.Lock()
+        self._values: Dict[str, int] = {}
+        self._labels: Dict[str, str] = {}
+        self._dirty_values: Set[str] = set()
+        self._dirty_labels: Set[str] = set()
+        
+        # Stats
+        self.updates_written = 0
+        self.updates_dropped = 0 # Overwritten before a frame applied them
+        self.frames = 0
+        self.last_frame_ms = 0.0
+        self.max_frame_ms = 0.0
+
+    def set_value(self, control_id: str, value: int):
+        with self._lock:
+            wake = self._is_clean()
+            self.updates_written += 1
+            if control_id in self._dirty_values:
+                self.updates_dropped += 1
+            self._values[control_id] = value
+            self._dirty_values.add(control_id)
+        if wake and self.on_pending:
+            self.on_pending()
+
+    def set_label(self, control_id: str, label: str):
+        with self._lock:
+            if self._labels.get(control_id) == label:
+                return
+            wake = self._is_clean()
+            self.updates_written += 1
+            if control_id in self._dirty_labels:
+                self.updates_dropped += 1
+            self._labels[control_id] = label
+            self._dirty_labels.add(control_id)
+        if wake and self.on_pending:
+            self.on_pending()
+
+    def _is_clean(self) -> bool:
+        return not self._dirty_values and not self._dirty_labels
+
+    def take_changes(self) -> Tuple[List[Tuple[str, int]], List[Tuple[str, str]]]:
+        """Returns (values, labels) changed since the previous call."""
+        with self._lock:
+            if self._is_clean():
+                return [], []
+            values = [(cid, self._values[cid]) for cid in self._dirty_values]
+            labels = [(cid, self._labels[cid]) for cid in self._dirty_labels]
+            self._dirty_values.clear()
+            self._dirty_labels.clear()
+            return values, labels
+
+    def record_frame(self, duration_ms: float):
+        self.frames += 1
+        self.last_frame_ms = duration_ms
+        if duration_ms > self.max_frame_ms:
+            self.max_frame_ms = duration_ms
@@ -1,22 +1,42 @@
 import sys
+import time
+from typing import Dict, Optional
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QGridLayout, QPushButton, QLabel, QFrame, QStatusBar)
-from PySide6.QtCore import Qt, QSize, QObject, Signal, Slot
-from PySide6.QtGui import QColor, QPalette
+                             QGridLayout, QPushButton, QLabel, QStatusBar)
+from PySide6.QtCore import Qt, QRect, QObject, QTimer, Signal, Slot
+from PySide6.QtGui import QColor, QFont, QKeySequence, QPainter, QPalette, QPen, QPixmap, QShortcut
+from ..frame_buffer import UIFrameBuffer
+from ...utils.tracing import TRACER
+
+FRAME_INTERVAL_MS = 16 # ~60 Hz
+
+# Console status label styles, built once and only applied when a state flips
+_STATUS_BASE = "font-weight: bold; font-family: 'Courier New', monospace; padding: 5px; "
+STATUS_STYLE_OFF = _STATUS_BASE + "border: 1px solid #333; color: #444;"
+STATUS_STYLE_ON = _STATUS_BASE + "border: 1px solid #0f0; color: #0f0;"
+STATUS_STYLE_DYNAMICS = _STATUS_BASE + "border: 1px solid #0af; color: #0af;"
 
 class UIController(QObject):
-    """Bridge for thread-safe UI updates from hardware thread"""
-    update_signal = Signal(str, int)
-    label_signal = Signal(str, str) # control_id, label
+    """Bridge for thread-safe UI updates from hardware thread.
+    
+    Control values and labels go through a frame-coalesced table; only the
+    rare plugin/status changes are delivered as queued signals.
+    """
     status_signal = Signal(str, str, bool) # mode, page, shift
     plugin_signal = Signal(str)
     learn_signal = Signal(bool)
+    frames_pending = Signal() # First change queued since the last frame
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frames = UIFrameBuffer(on_pending=self.frames_pending.emit)
 
     def trigger_update(self, control_id: str, value: int):
-        self.update_signal.emit(control_id, value)
+        with TRACER.span("ui.queue_update", "ui"):
+            self.frames.set_value(control_id, value)
 
     def trigger_label(self, control_id: str, label: str):
-        self.label_signal.emit(control_id, label)
+        self.frames.set_label(control_id, label)
         
     def trigger_plugin(self, name: str):
         self.plugin_signal.emit(name)
@@ -42,49 +62,114 @@ class NocturnButton(QPushButton):
         """)
 
 class NocturnEncoder(QWidget):
+    """
+    QPainter-drawn encoder with a value ring.
+    The static parts (knob body and dim ring track) are rendered once into a
+    pixmap shared by all encoders of the same colour; value changes repaint
+    only the ring and value text rectangles.
+    """
+    RING_SIZE = 50
+    RING_WIDTH = 4
+    ARC_START = 225 * 16 # 7 o'clock, in 1/16th degrees
+    ARC_SPAN = -270 * 16 # Clockwise to 5 o'clock
+    LABEL_FLAGS = Qt.AlignHCenter | Qt.AlignTop | Qt.TextWordWrap
+    
+    _background_cache: Dict[tuple, QPixmap] = {}
+
     def __init__(self, name, parent=None, color="#555"):
         super().__init__(parent)
         self.setFixedSize(90, 130)
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(5, 5, 5, 5)
-        layout.setSpacing(2)
         
         self.base_color = color
+        self._color = QColor(color)
+        self._label = name
+        self._value = 0
+        self._value_text = "0"
         
-        # Knob visual placeholder
-        self.knob = QFrame()
-        self.knob.setFixedSize(50, 50)
-        self.knob.setStyleSheet(f"""
-            QFrame {{
-                background-color: #1a1a1a;
-                border: 3px solid {color};
-                border-radius: 25px;
-            }}
-        """)
-        
-        self.label = QLabel(name)
-        self.label.setAlignment(Qt.AlignCenter)
-        self.label.setWordWrap(True)
-        self.label.setStyleSheet("color: #fff; font-size: 11px; font-weight: bold; margin-top: 2px;")
+        left = (self.width() - self.RING_SIZE) // 2
+        self._ring_rect = QRect(left, 5, self.RING_SIZE, self.RING_SIZE)
+        self._label_rect = QRect(0, 60, self.width(), 42)
+        self._value_rect = QRect(0, 104, self.width(), 20)
         
-        self.value_label = QLabel("0")
-        self.value_label.setAlignment(Qt.AlignCenter)
-        self.value_label.setStyleSheet("color: #0c0; font-family: 'Courier New', monospace; font-size: 10px; font-weight: bold;")
+        self._label_font = QFont()
+        self._label_font.setPixelSize(11)
+        self._label_font.setBold(True)
+        self._value_font = QFont("Courier New")
+        self._value_font.setStyleHint(QFont.Monospace)
+        self._value_font.setPixelSize(10)
+        self._value_font.setBold(True)
+        self._arc_pen = QPen(self._color, self.RING_WIDTH, Qt.SolidLine, Qt.RoundCap)
+
+    @property
+    def label_text(self) -> str:
+        return self._label
 
-        layout.addWidget(self.knob, 0, Qt.AlignCenter)
-        layout.addWidget(self.label)
-        layout.addWidget(self.value_label)
+    @property
+    def value(self) -> int:
+        return self._value
 
     def set_label(self, text: str):
-        self.label.setText(text)
+        if text != self._label:
+            self._label = text
+            self.update(self._label_rect)
 
     def set_value(self, val: int):
-        self.value_label.setText(str(val))
-        # Visual feedback: modulate the base color brightness
-        opacity = 50 + int((val / 127) * 205)
-        # For simplicity, we'll just keep the base color but maybe grow the border?
-        # Or change the value label color
-        pass
+        if val == self._value:
+            return
+        self._value = val
+        self._value_text = str(val)
+        self.update(self._ring_rect)
+        self.update(self._value_rect)
+
+    def _background(self) -> QPixmap:
+        dpr = self.devicePixelRatioF()
+        key = (self.base_color, dpr)
+        pixmap = self._background_cache.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(int(self.RING_SIZE * dpr), int(self.RING_SIZE * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            p = QPainter(pixmap)
+            p.setRenderHint(QPainter.Antialiasing)
+            inset = self.RING_WIDTH // 2 + 1
+            track = QRect(inset, inset, self.RING_SIZE - 2 * inset, self.RING_SIZE - 2 * inset)
+            p.setPen(Qt.NoPen)
+            p.setBrush(QColor("#1a1a1a"))
+            p.drawEllipse(track)
+            dim = QColor(self._color)
+            dim.setAlpha(60)
+            p.setPen(QPen(dim, self.RING_WIDTH, Qt.SolidLine, Qt.RoundCap))
+            p.drawArc(track, self.ARC_START, self.ARC_SPAN)
+            p.end()
+            self._background_cache[key] = pixmap
+        return pixmap
+
+    def paintEvent(self, event):
+        p = QPainter(self)
+        # Use the region, not its bounding rect, so a ring + value repaint
+        # doesn't drag the label in between along with it
+        dirty = event.region()
+        
+        if dirty.intersects(self._ring_rect):
+            p.setRenderHint(QPainter.Antialiasing)
+            p.drawPixmap(self._ring_rect.topLeft(), self._background())
+            if self._value > 0:
+                inset = self.RING_WIDTH // 2 + 1
+                arc_rect = self._ring_rect.adjusted(inset, inset, -inset, -inset)
+                span = int(self.ARC_SPAN * min(self._value, 127) / 127)
+                p.setPen(self._arc_pen)
+                p.drawArc(arc_rect, self.ARC_START, span)
+        
+        if dirty.intersects(self._label_rect):
+            p.setFont(self._label_font)
+            p.setPen(Qt.white)
+            p.drawText(self._label_rect, self.LABEL_FLAGS, self._label)
+        
+        if dirty.intersects(self._value_rect):
+            p.setFont(self._value_font)
+            p.setPen(QColor("#0c0"))
+            p.drawText(self._value_rect, Qt.AlignCenter, self._value_text)
+        p.end()
 
 from PySide6.QtWidgets import QSlider
 
@@ -133,6 +218,8 @@ class MainWindow(QMainWindow):
             }
         """)
         self.learn_btn.clicked.connect(self._on_learn_clicked)
+        # Ctrl/Cmd+S saves the current profile
+        self.save_shortcut = QShortcut(QKeySequence.Save, self)
         
         header_layout.addWidget(self.header, 0, Qt.AlignCenter)
         header_layout.addWidget(self.plugin_label, 0, Qt.AlignCenter)
@@ -146,10 +233,12 @@ class MainWindow(QMainWindow):
         self.shift_label = QLabel("SHIFT")
         
         for lbl in [self.mode_label, self.page_label, self.shift_label]:
-            lbl.setStyleSheet("font-weight: bold; color: #444; font-family: 'Courier New', monospace; padding: 5px; border: 1px solid #333;")
+            lbl.setStyleSheet(STATUS_STYLE_OFF)
             self.status_panel.addWidget(lbl)
         
-        self.mode_label.setStyleSheet(self.mode_label.styleSheet() + "color: #0f0; border-color: #0f0;")
+        self.mode_label.setStyleSheet(STATUS_STYLE_ON)
+        # Last applied status, so unchanged parts don't trigger a re-polish
+        self._status_state = ("EQ", "1", False)
         header_layout.addLayout(self.status_panel)
         
         self.main_layout.addLayout(header_layout)
@@ -222,6 +311,48 @@ class MainWindow(QMainWindow):
         self.status.setStyleSheet("color: #888; background-color: #111; border-top: 1px solid #333;")
         self.status.showMessage("Initializing...")
 
+        # Frame-coalesced updates (see attach_frame_buffer)
+        self._frames = None
+        self._frames_on_demand = False
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setTimerType(Qt.PreciseTimer)
+        self._frame_timer.setInterval(FRAME_INTERVAL_MS)
+        self._frame_timer.timeout.connect(self._apply_frame)
+
+    def attach_frame_buffer(self, frames: UIFrameBuffer, pending: Optional[Signal] = None):
+        """Applies changes from `frames` once per display frame.
+
+        With `pending` (emitted when the first change is queued) the frame
+        timer only runs until the buffer drains; without it, it polls.
+        """
+        self._frames = frames
+        self._frames_on_demand = pending is not None
+        if pending is not None:
+            pending.connect(self._wake_frames)
+        else:
+            self._frame_timer.start()
+
+    @Slot()
+    def _wake_frames(self):
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
+
+    @Slot()
+    def _apply_frame(self):
+        values, labels = self._frames.take_changes()
+        if self._frames_on_demand:
+            # Drained: the next queued change restarts the timer
+            self._frame_timer.stop()
+        if not values and not labels:
+            return
+        start = time.perf_counter()
+        with TRACER.span("ui.apply_frame", "ui"):
+            for control_id, label in labels:
+                self.set_control_label(control_id, label)
+            for control_id, value in values:
+                self.update_control(control_id, value)
+        self._frames.record_frame((time.perf_counter() - start) * 1000.0)
+
     @Slot(str, int)
     def update_control(self, control_id: str, value: int):
         if control_id in self.controls:
@@ -257,17 +388,16 @@ class MainWindow(QMainWindow):
         
     @Slot(str, str, bool)
     def update_console_status(self, mode: str, page: str, shift: bool):
-        self.mode_label.setText(f"MODE: {mode}")
-        self.page_label.setText(f"PAGE: {page}")
-        self.shift_label.setStyleSheet(
-            "font-weight: bold; font-family: 'Courier New', monospace; padding: 5px; border: 1px solid #0f0; color: #0f0;" if shift 
-            else "font-weight: bold; font-family: 'Courier New', monospace; padding: 5px; border: 1px solid #333; color: #444;"
-        )
-        # Highlight Mode
-        self.mode_label.setStyleSheet(
-            "font-weight: bold; font-family: 'Courier New', monospace; padding: 5px; border: 1px solid #0f0; color: #0f0;" if mode == "EQ"
-            else "font-weight: bold; font-family: 'Courier New', monospace; padding: 5px; border: 1px solid #0af; color: #0af;"
-        )
+        last_mode, last_page, last_shift = self._status_state
+        self._status_state = (mode, page, shift)
+        if mode != last_mode:
+            self.mode_label.setText(f"MODE: {mode}")
+            # Highlight Mode
+            self.mode_label.setStyleSheet(STATUS_STYLE_ON if mode == "EQ" else STATUS_STYLE_DYNAMICS)
+        if page != last_page:
+            self.page_label.setText(f"PAGE: {page}")
+        if shift != last_shift:
+            self.shift_label.setStyleSheet(STATUS_STYLE_ON if shift else STATUS_STYLE_OFF)
 
     def _on_learn_clicked(self, checked):
         # Notify whoever is listening (Main app/Engine)
@@ -0,0 +1,37 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PySide6.QtCore import Qt, QTimer
+from ...utils.metrics import MetricsRegistry, REGISTRY
+
+class MetricsPanel(QWidget):
+    """Small always-on-top window showing live metrics, refreshed once a second."""
+    def __init__(self, registry: MetricsRegistry = REGISTRY, parent=None):
+        super().__init__(parent, Qt.Tool)
+        self.setWindowTitle("Nocturn Studio - Metrics")
+        self.registry = registry
+        self._last = {}
+        
+        layout = QVBoxLayout(self)
+        self.text = QLabel()
+        self.text.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.text.setStyleSheet("color: #0c0; background-color: #111; font-family: 'Courier New', monospace; font-size: 11px; padding: 8px;")
+        layout.addWidget(self.text)
+        
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+        self.refresh()
+
+    def refresh(self):
+        snap = self.registry.snapshot()
+        lines = []
+        for name, value in snap.items():
+            if isinstance(value, dict):
+                lines.append(f"{name:28} n={value['count']} p50<={value['p50']} p99<={value['p99']} max={value['max']}")
+            else:
+                # Counters also show their rate since the last refresh
+                rate = value - self._last.get(name, value)
+                suffix = f"  (+{rate}/s)" if rate > 0 else ""
+                lines.append(f"{name:28} {value}{suffix}")
+        self._last = {k: v for k, v in snap.items() if not isinstance(v, dict)}
+        self.text.setText("\n".join(lines))
@@ -0,0 +1,31 @@
+import time
+
+class IdleBackoff:
+    """
+    Wait-time policy for polling loops: `min_s` while there is activity (and
+    for `grace_s` after it), then doubling up to `max_s`. Calling activity()
+    drops straight back to the fast rate.
+    """
+    __slots__ = ("min_s", "max_s", "grace_s", "factor", "current", "last_activity")
+
+    def __init__(self, min_s: float, max_s: float, grace_s: float = 1.0, factor: float = 2.0):
+        self.min_s = min_s
+        self.max_s = max_s
+        self.grace_s = grace_s
+        self.factor = factor
+        self.current = min_s
+        self.last_activity = time.monotonic()
+
+    def activity(self):
+        self.current = self.min_s
+        self.last_activity = time.monotonic()
+
+    @property
+    def backed_off(self) -> bool:
+        return self.current > self.min_s
+
+    def next_wait(self) -> float:
+        if time.monotonic() - self.last_activity < self.grace_s:
+            return self.min_s
+        self.current = min(self.max_s, self.current * self.factor)
+        return self.current
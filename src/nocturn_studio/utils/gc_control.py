@@ -0,0 +1,108 @@
+import gc
+import time
+from typing import Dict, Tuple
+from .metrics import REGISTRY
+from .tracing import TRACER
+
+# Young generations keep a cadence close to the default (each pass stays well
+# under a millisecond); gen 2 effectively only runs when we ask for it while idle.
+MANAGED_THRESHOLDS = (1000, 10, 1000)
+
+class GcController:
+    """
+    Keeps cyclic GC pauses off the input path.
+
+    Every collection is timed into the `gc_pause_ms` histogram (and the trace
+    when tracing), managed or not, so the two modes can be compared. In managed
+    mode the startup objects are frozen out of the collector, the thresholds
+    are raised and full (gen 2) collections are run from the device's idle
+    callback once input has been quiet for `idle_after_s`.
+
+    A full collection can't be interrupted, so its length is what bounds the
+    delay of an event that arrives while it runs. To keep it short, the
+    survivors of each idle collection are frozen as well; the next one only
+    walks objects that became long-lived since. Garbage cycles among frozen
+    objects are reclaimed by one whole-heap collection after `deep_idle_s`
+    without input. During input only young collections run (`gc_young_pause_ms`).
+    """
+    def __init__(self, managed: bool = False, idle_after_s: float = 1.0, gen2_after: int = 10,
+                 thresholds: Tuple[int, int, int] = MANAGED_THRESHOLDS, deep_idle_s: float = 30.0):
+        self.managed = managed
+        self.idle_after_s = idle_after_s
+        self.deep_idle_s = deep_idle_s
+        self.gen2_after = gen2_after # Young collections since the last full one (Python's default cadence)
+        self.thresholds = thresholds
+        self._saved_thresholds = gc.get_threshold()
+        self._last_activity = time.monotonic()
+        self._deep_pending = False # Objects were frozen since the last whole-heap collection
+        self._start_ns = 0
+        self._installed = False
+        self._m_pause = REGISTRY.histogram("gc_pause_ms", "Cyclic GC pause (ms)")
+        self._m_young_pause = REGISTRY.histogram("gc_young_pause_ms", "Young (gen 0/1) GC pause (ms)")
+        self._m_gen2_pause = REGISTRY.histogram("gc_gen2_pause_ms", "Full (gen 2) GC pause (ms)")
+        self._m_deep = REGISTRY.counter("gc_deep_collections", "Whole-heap collections (incl. frozen) while idle")
+        self._m_idle = REGISTRY.counter("gc_idle_collections", "Full collections run while idle")
+        self._m_frozen = REGISTRY.gauge("gc_frozen_objects", "Objects moved to the permanent generation")
+
+    def install(self):
+        """Call once startup is done, so the objects it created get frozen."""
+        if self._installed:
+            return
+        self._installed = True
+        if self.managed:
+            gc.collect()
+            self._freeze()
+            gc.set_threshold(*self.thresholds)
+            print(f"[GC] Managed: {gc.get_freeze_count()} objects frozen, thresholds {self.thresholds}")
+        gc.callbacks.append(self._on_gc)
+
+    def uninstall(self):
+        if not self._installed:
+            return
+        self._installed = False
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self.managed:
+            gc.set_threshold(*self._saved_thresholds)
+            gc.unfreeze()
+
+    def activity(self, *_):
+        """Input seen (device event listener)."""
+        self._last_activity = time.monotonic()
+
+    def on_idle(self):
+        """Device idle callback: runs a deferred full collection once input is quiet."""
+        if not self.managed:
+            return
+        quiet_s = time.monotonic() - self._last_activity
+        if self._deep_pending and quiet_s >= self.deep_idle_s:
+            gc.unfreeze()
+            gc.collect()
+            self._freeze()
+            self._deep_pending = False
+            self._m_deep.inc()
+            return
+        if gc.get_count()[2] < self.gen2_after or quiet_s < self.idle_after_s:
+            return
+        gc.collect(2)
+        self._freeze()
+        self._deep_pending = True
+        self._m_idle.inc()
+
+    def _freeze(self):
+        gc.freeze()
+        self._m_frozen.set(gc.get_freeze_count())
+
+    def _on_gc(self, phase: str, info: Dict[str, int]):
+        if phase == "start":
+            self._start_ns = time.perf_counter_ns()
+            return
+        end_ns = time.perf_counter_ns()
+        pause_ms = (end_ns - self._start_ns) / 1e6
+        self._m_pause.observe(pause_ms)
+        if info["generation"] == 2:
+            self._m_gen2_pause.observe(pause_ms)
+        else:
+            self._m_young_pause.observe(pause_ms)
+        if TRACER.enabled:
+            TRACER.record(f"gc.gen{info['generation']}", "gc", self._start_ns, end_ns)
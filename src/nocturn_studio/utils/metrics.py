@@ -0,0 +1,171 @@
+import bisect
+import json
+import threading
+from typing import Dict, List, Sequence
+
+# Default latency buckets in milliseconds
+DEFAULT_MS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0)
+
+class Counter:
+    """Monotonic counter. Increments are plain attribute writes (no lock), so
+    concurrent writers may rarely lose an increment; that's fine for monitoring."""
+    __slots__ = ("name", "help", "value")
+
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, n: int = 1):
+        self.value += n
+
+class Gauge:
+    __slots__ = ("name", "help", "value")
+
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect plus two additions."""
+    __slots__ = ("name", "help", "bounds", "counts", "sum", "count", "max")
+
+    def __init__(self, name: str, help: str = "", buckets: Sequence[float] = DEFAULT_MS_BUCKETS):
+        self.name = name
+        self.help = help
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1) # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing the q-th quantile (max for the +Inf bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+class MetricsRegistry:
+    """Get-or-create registry, so every instance of a component shares its metrics."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def _get(self, cls, name: str, *args):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = cls(name, *args)
+                    self._metrics[name] = metric
+        return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "", buckets: Sequence[float] = DEFAULT_MS_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, buckets)
+
+    def snapshot(self) -> Dict[str, object]:
+        snap = {}
+        for name, metric in sorted(self._metrics.items()):
+            if isinstance(metric, Histogram):
+                snap[name] = {
+                    "count": metric.count,
+                    "sum": round(metric.sum, 3),
+                    "max": round(metric.max, 3),
+                    "p50": metric.quantile(0.5),
+                    "p99": metric.quantile(0.99),
+                }
+            else:
+                snap[name] = metric.value
+        return snap
+
+    def render_text(self) -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            if isinstance(metric, Histogram):
+                lines.append(f"# TYPE {name} histogram")
+                cumulative = 0
+                for bound, c in zip(metric.bounds, metric.counts):
+                    cumulative += c
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{le="+Inf"}} {metric.count}')
+                lines.append(f"{name}_sum {metric.sum}")
+                lines.append(f"{name}_count {metric.count}")
+            else:
+                kind = "counter" if isinstance(metric, Counter) else "gauge"
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {metric.value}")
+        return "\n".join(lines) + "\n"
+
+# Process-wide default registry
+REGISTRY = MetricsRegistry()
+
+class MetricsServer(threading.Thread):
+    """
+    Serves a registry on localhost:
+      GET /metrics       -> Prometheus text
+      GET /metrics.json  -> JSON snapshot
+    """
+    def __init__(self, registry: MetricsRegistry = REGISTRY, port: int = 9465, host: str = "127.0.0.1"):
+        super().__init__(name="MetricsServer", daemon=True)
+        # http.server pulls in the email package; only pay for it when serving
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        self.registry = registry
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = registry_ref.render_text().encode()
+                    ctype = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(registry_ref.snapshot()).encode()
+                    ctype = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # Keep the console for the app's own logs
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.port = self._server.server_address[1]
+
+    def run(self):
+        print(f"[Metrics] Serving on http://127.0.0.1:{self.port}/metrics")
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
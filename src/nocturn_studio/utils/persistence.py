@@ -2,18 +2,28 @@ import json
 import os
 from pathlib import Path
 from typing import Dict, Any, Optional
-from ..model.mapping import Mapping, MappingTarget, TargetType, MappingMode
+from ..model.curves import ResponseCurve
+from ..model.mapping import Mapping, MappingTarget, TargetType, MappingMode, intern_mapping
 
 class PersistenceManager:
     def __init__(self, app_name: str = "NocturnStudio"):
         self.app_dir = Path.home() / "Library" / "Application Support" / app_name
         self.presets_dir = self.app_dir / "presets"
         self.presets_dir.mkdir(parents=True, exist_ok=True)
+        # Decoded presets read ahead of time by preload_presets()
+        self._preloaded: Dict[str, Dict[str, Mapping]] = {}
 
     def save_preset(self, name: str, mappings: Dict[str, Mapping]):
+        self._preloaded.pop(name, None)
         path = self.presets_dir / f"{name}.json"
-        
-        # Convert objects to dict
+        data = self.encode_mappings(mappings)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+        print(f"[Persistence] Preset saved: {path}")
+
+    @staticmethod
+    def encode_mappings(mappings: Dict[str, Mapping]) -> Dict[str, Any]:
+        """Mapping objects -> the JSON-ready preset format."""
         data = {}
         for control_id, m in mappings.items():
             data[control_id] = {
@@ -26,37 +36,67 @@ class PersistenceManager:
                 "min_val": m.min_val,
                 "max_val": m.max_val
             }
-            
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=4)
-        print(f"[Persistence] Preset saved: {path}")
+            if m.target.address:
+                data[control_id]["target"]["address"] = m.target.address
+            if m.curve is not None:
+                data[control_id]["curve"] = m.curve.to_dict()
+        return data
+
+    @staticmethod
+    def decode_mappings(data: Dict[str, Any]) -> Dict[str, Mapping]:
+        """Preset format -> (shared) Mapping objects. Raises on malformed data."""
+        mappings = {}
+        for control_id, m_data in data.items():
+            target_data = m_data["target"]
+            target = MappingTarget(
+                type=TargetType[target_data["type"]],
+                channel=target_data["channel"],
+                identifier=target_data["identifier"],
+                address=target_data.get("address", "")
+            )
+            mappings[control_id] = intern_mapping(Mapping(
+                target=target,
+                mode=MappingMode[m_data["mode"]],
+                min_val=m_data["min_val"],
+                max_val=m_data["max_val"],
+                curve=ResponseCurve.from_dict(m_data["curve"]) if m_data.get("curve") else None
+            ))
+        return mappings
+
+    def load_transforms(self, name: str) -> Optional[str]:
+        """Source of the profile's user transform script (<name>.transforms.py), if any."""
+        path = self.presets_dir / f"{name}.transforms.py"
+        if not path.exists():
+            return None
+        try:
+            return path.read_text()
+        except OSError as e:
+            print(f"[Persistence] Error loading transforms {name}: {e}")
+            return None
+
+    def preload_presets(self) -> int:
+        """Reads and decodes every saved preset (at startup, off the main thread)
+        so the first switch to each profile skips the disk. Returns the count."""
+        for path in self.presets_dir.glob("*.json"):
+            mappings = self._read_preset(path)
+            if mappings:
+                self._preloaded[path.stem] = mappings
+        return len(self._preloaded)
 
     def load_preset(self, name: str) -> Optional[Dict[str, Mapping]]:
+        preloaded = self._preloaded.get(name)
+        if preloaded is not None:
+            return dict(preloaded) # Callers may add mappings (learn)
         path = self.presets_dir / f"{name}.json"
         if not path.exists():
             return None
-            
+        return self._read_preset(path)
+
+    def _read_preset(self, path: Path) -> Optional[Dict[str, Mapping]]:
         try:
             with open(path, 'r') as f:
                 data = json.load(f)
-                
-            mappings = {}
-            for control_id, m_data in data.items():
-                target_data = m_data["target"]
-                target = MappingTarget(
-                    type=TargetType[target_data["type"]],
-                    channel=target_data["channel"],
-                    identifier=target_data["identifier"]
-                )
-                mapping = Mapping(
-                    source_id=control_id,
-                    target=target,
-                    mode=MappingMode[m_data["mode"]],
-                    min_val=m_data["min_val"],
-                    max_val=m_data["max_val"]
-                )
-                mappings[control_id] = mapping
-            return mappings
+            return self.decode_mappings(data)
         except Exception as e:
-            print(f"[Persistence] Error loading preset {name}: {e}")
+            print(f"[Persistence] Error loading preset {path.stem}: {e}")
             return None
@@ -0,0 +1,63 @@
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+
+DEFAULT_RT_PRIORITY = 10 # Low in the SCHED_FIFO range: above normal threads, below audio/IRQ threads
+FALLBACK_NICE = -10
+
+@dataclass(frozen=True)
+class RealtimeConfig:
+    """Opt-in scheduling for the device I/O threads (Linux only)."""
+    cpus: Optional[FrozenSet[int]] = None # None = any CPU
+    priority: int = DEFAULT_RT_PRIORITY
+
+def parse_cpu_list(text: str) -> Optional[FrozenSet[int]]:
+    """"2,3" / "0-1,4" -> CPU set; "" -> None (no pinning)."""
+    cpus = set()
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return frozenset(cpus) or None
+
+def apply_to_current_thread(config: RealtimeConfig) -> str:
+    """
+    Pins the calling thread and raises its priority as far as permitted:
+    SCHED_FIFO, else a negative nice value, else unchanged. Never raises;
+    returns a short description of what was applied.
+    """
+    name = threading.current_thread().name
+    if not sys.platform.startswith("linux"):
+        return "unsupported"
+    # On Linux the sched_* calls take a thread id in place of a pid
+    tid = threading.get_native_id()
+    applied = []
+
+    if config.cpus:
+        try:
+            cpus = config.cpus & os.sched_getaffinity(0)
+            if not cpus:
+                raise ValueError(f"none of CPUs {sorted(config.cpus)} are available")
+            os.sched_setaffinity(tid, cpus)
+            applied.append(f"CPUs {sorted(cpus)}")
+        except (OSError, ValueError) as e:
+            print(f"[Realtime] {name}: could not pin ({e}); running on any CPU")
+
+    try:
+        os.sched_setscheduler(tid, os.SCHED_FIFO, os.sched_param(config.priority))
+        applied.insert(0, f"SCHED_FIFO {config.priority}")
+    except (OSError, AttributeError) as e:
+        # No CAP_SYS_NICE / RLIMIT_RTPRIO: try a higher nice priority instead
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, FALLBACK_NICE)
+            applied.insert(0, f"nice {FALLBACK_NICE}")
+        except OSError:
+            print(f"[Realtime] {name}: real-time priority not permitted ({e}); running at normal priority")
+
+    result = ", ".join(applied) or "normal"
+    print(f"[Realtime] {name}: {result}")
+    return result
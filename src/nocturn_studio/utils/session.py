@@ -0,0 +1,71 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+SESSION_VERSION = 1
+
+class SessionStore:
+    """
+    Compact snapshot of the running session (profile, mode/page, values and
+    recently used profiles) so the next launch starts warm. Writes are atomic
+    and skipped when nothing changed since the last one.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._last_text: Optional[str] = None
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not self.path.exists():
+            return None
+        try:
+            text = self.path.read_text()
+            data = json.loads(text)
+        except (OSError, ValueError) as e:
+            print(f"[Session] Ignoring unreadable session file: {e}")
+            return None
+        if data.get("version") != SESSION_VERSION:
+            print(f"[Session] Ignoring session file version {data.get('version')}")
+            return None
+        self._last_text = text
+        return data
+
+    def save(self, data: Dict[str, Any]) -> bool:
+        """Returns True if the file was (re)written."""
+        data = dict(data, version=SESSION_VERSION)
+        text = json.dumps(data, separators=(",", ":"), sort_keys=True)
+        if text == self._last_text:
+            return False
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            tmp.write_text(text)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[Session] Could not write {self.path}: {e}")
+            return False
+        self._last_text = text
+        return True
+
+class SessionAutosaver(threading.Thread):
+    """Saves `provider()` every `interval` seconds and once more on stop()."""
+    def __init__(self, store: SessionStore, provider: Callable[[], Dict[str, Any]], interval: float = 30.0):
+        super().__init__(name="SessionAutosaver", daemon=True)
+        self.store = store
+        self.provider = provider
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self._save()
+
+    def stop(self):
+        self._stop_event.set()
+        self._save()
+
+    def _save(self):
+        try:
+            self.store.save(self.provider())
+        except Exception as e:
+            print(f"[Session] Autosave failed: {e}")
@@ -0,0 +1,120 @@
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.cat, self.start, time.perf_counter_ns())
+        return False
+
+class Tracer:
+    """
+    Opt-in span recorder writing into a preallocated ring buffer.
+    Disabled tracing costs one attribute check per span. Spans carry the OS
+    thread id, so an exported Chrome/Perfetto trace shows which thread each
+    pipeline stage ran on and where threads contended.
+    """
+    def __init__(self, capacity: int = 1 << 16):
+        self.enabled = False
+        self.capacity = capacity
+        self._allocated = False
+        self._recorded = 0
+        self._epoch = time.perf_counter_ns()
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self._names = [None] * capacity
+        self._cats = [None] * capacity
+        self._starts = [0] * capacity
+        self._ends = [0] * capacity
+        self._tids = [0] * capacity
+        # next() on itertools.count is atomic under the GIL
+        self._cursor = itertools.count()
+        self._recorded = 0
+        self._allocated = True
+
+    def enable(self, capacity: Optional[int] = None):
+        # Buffers are only allocated once tracing is actually turned on
+        if not self._allocated or (capacity and capacity != self.capacity):
+            self._allocate(capacity or self.capacity)
+        self._epoch = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name: str, cat: str = "app"):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat)
+
+    def record(self, name: str, cat: str, start_ns: int, end_ns: int):
+        idx = next(self._cursor)
+        slot = idx % self.capacity
+        self._names[slot] = name
+        self._cats[slot] = cat
+        self._starts[slot] = start_ns
+        self._ends[slot] = end_ns
+        self._tids[slot] = threading.get_native_id()
+        if idx >= self._recorded:
+            self._recorded = idx + 1
+
+    def instant(self, name: str, cat: str = "app"):
+        if self.enabled:
+            now = time.perf_counter_ns()
+            self.record(name, cat, now, now)
+
+    def export(self, path: str) -> int:
+        """Writes the buffered spans as a Chrome trace JSON file. Returns the span count."""
+        count = min(self._recorded, self.capacity)
+        first = self._recorded - count
+        pid = os.getpid()
+        events = []
+        for idx in range(first, self._recorded):
+            slot = idx % self.capacity
+            events.append({
+                "name": self._names[slot],
+                "cat": self._cats[slot],
+                "ph": "X",
+                "ts": (self._starts[slot] - self._epoch) / 1000.0,
+                "dur": (self._ends[slot] - self._starts[slot]) / 1000.0,
+                "pid": pid,
+                "tid": self._tids[slot],
+            })
+        # Name the threads that are still alive
+        for thread in threading.enumerate():
+            if thread.native_id is not None:
+                events.append({"name": "thread_name", "ph": "M", "pid": pid,
+                               "tid": thread.native_id, "args": {"name": thread.name}})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"[Trace] {count} spans written to {path}")
+        return count
+
+# Process-wide tracer
+TRACER = Tracer()
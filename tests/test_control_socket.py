@@ -0,0 +1,79 @@
+import json
+import os
+import socket
+import tempfile
+import unittest
+from nocturn_studio.daw.midi import MockMidiOutput
+from nocturn_studio.engine.mapper import MappingEngine
+from nocturn_studio.ipc.control_socket import ControlServer
+from nocturn_studio.main import default_global_mappings
+
+class TestControlSocket(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.feedback = []
+        self.midi = MockMidiOutput()
+        self.engine = MappingEngine(self.midi, feedback_callback=lambda cid, val: self.feedback.append((cid, val)))
+        self.engine.load_mappings(default_global_mappings())
+        self.server = ControlServer(self.engine, os.path.join(self.tmp.name, "control.sock"))
+        self.server.start()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.server.path)
+        self.sock.settimeout(2.0)
+        self.reader = self.sock.makefile("r")
+
+    def tearDown(self):
+        self.reader.close()
+        self.sock.close()
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def call(self, payload):
+        self.sock.sendall((json.dumps(payload) + "\n").encode())
+        while True:
+            message = json.loads(self.reader.readline())
+            if isinstance(message, list) or "id" in message:
+                return message # Skip value notifications
+
+    def test_batch_applies_atomically_with_one_flush(self):
+        self.feedback.clear()
+        response = self.call([
+            {"jsonrpc": "2.0", "id": 1, "method": "set_values", "params": {"values": {"encoder_1": 10, "encoder_2": 20}}},
+            {"jsonrpc": "2.0", "id": 2, "method": "set_values", "params": {"values": {"encoder_1": 30}}},
+        ])
+        self.assertEqual([r["result"] for r in response], [2, 1])
+        self.assertEqual(sorted(self.feedback), [("encoder_1", 30), ("encoder_2", 20)])
+        self.assertEqual([m.data2 for m in self.midi.sent_messages], [10, 20, 30])
+
+    def test_invalid_item_rejects_whole_batch(self):
+        self.feedback.clear()
+        response = self.call([
+            {"jsonrpc": "2.0", "id": 1, "method": "set_values", "params": {"values": {"encoder_1": 10}}},
+            {"jsonrpc": "2.0", "id": 2, "method": "set_mode", "params": {"mode": "NOPE"}},
+            {"jsonrpc": "2.0", "id": 3, "method": "nope"},
+        ])
+        self.assertEqual([(r["id"], r["error"]["code"]) for r in response], [(1, -32600), (2, -32602), (3, -32601)])
+        self.assertEqual((self.feedback, self.midi.sent_messages), ([], []))
+        self.assertEqual(self.engine.values["encoder_1"], 0)
+
+    def test_subscribe_streams_values(self):
+        self.assertTrue(self.call({"jsonrpc": "2.0", "id": 1, "method": "subscribe",
+                                   "params": {"controls": ["encoder_3"]}})["result"])
+        self.call({"jsonrpc": "2.0", "id": 2, "method": "set_mode", "params": {"mode": "DYNAMICS"}})
+        self.engine.set_values({"encoder_3": 99, "encoder_4": 1}, output=False)
+        notification = json.loads(self.reader.readline())
+        while notification["params"]["values"].get("encoder_3") != 99:
+            notification = json.loads(self.reader.readline())
+        self.assertNotIn("encoder_4", notification["params"]["values"])
+        state = self.call({"jsonrpc": "2.0", "id": 3, "method": "get_state"})["result"]
+        self.assertEqual((state["mode"], state["values"]["encoder_3"]), ("DYNAMICS", 99))
+
+    def test_out_of_range_value_is_an_error(self):
+        for value in (70000, -1, 1e300):
+            response = self.call({"jsonrpc": "2.0", "id": 1, "method": "set_values",
+                                  "params": {"values": {"encoder_1": value}}})
+            self.assertEqual(response["error"]["code"], -32602)
+        # The connection and engine keep working
+        response = self.call({"jsonrpc": "2.0", "id": 2, "method": "set_values", "params": {"values": {"encoder_1": 5}}})
+        self.assertEqual(response["result"], 1)
+        self.assertEqual(self.engine.values["encoder_1"], 5)
@@ -0,0 +1,43 @@
+import unittest
+from nocturn_studio.daw.emulator import DawEmulator
+from nocturn_studio.engine.mapper import MappingEngine
+from nocturn_studio.hardware.device import MockNocturnDevice
+from nocturn_studio.model.mapping import Mapping, MappingTarget, TargetType
+
+class TestDawEmulator(unittest.TestCase):
+    def setUp(self):
+        self.daw = DawEmulator(echo_latency_ms=1.0, jitter_ms=0.5, seed=1)
+        self.feedback = []
+        self.engine = MappingEngine(self.daw, feedback_callback=lambda cid, val: self.feedback.append((cid, val)))
+        self.daw.input.open(self.engine.handle_midi_input)
+        self.engine.load_mappings({
+            "encoder_1": Mapping(MappingTarget(TargetType.MIDI_CC, identifier=10)),
+            "crossfader": Mapping(MappingTarget(TargetType.MIDI_CC, identifier=19)),
+        })
+        self.device = MockNocturnDevice()
+        self.device.add_event_listener(self.engine.handle_event)
+        self.device.connect()
+
+    def tearDown(self):
+        self.daw.close()
+
+    def test_echo_round_trip(self):
+        self.device.simulate_turn("encoder_1", 7)
+        self.assertTrue(self.daw.wait_idle())
+        self.assertEqual(self.daw.parameters[(0, 10)], 7)
+        self.assertEqual(self.daw.echoed, 1)
+        self.assertEqual(self.feedback.count(("encoder_1", 7)), 2) # Local + echoed
+
+    def test_automation_and_bulk_dump(self):
+        self.daw.play_ramp(10, 0, 100, duration_ms=20, rate_hz=1000)
+        self.assertTrue(self.daw.wait_idle())
+        self.assertEqual(self.engine.values["encoder_1"], 100)
+        
+        self.daw.parameters[(0, 19)] = 33
+        self.feedback.clear()
+        self.daw.bulk_dump()
+        self.assertTrue(self.daw.wait_idle())
+        self.assertIn(("crossfader", 33), self.feedback)
+
+if __name__ == '__main__':
+    unittest.main()
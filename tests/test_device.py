@@ -0,0 +1,85 @@
+import time
+import unittest
+from nocturn_studio.hardware.device import RealNocturnDevice
+from nocturn_studio.hardware.fake_usb import attach_fake_usb
+from nocturn_studio.utils.backoff import IdleBackoff
+from nocturn_studio.utils.realtime import RealtimeConfig, parse_cpu_list
+
+class TestIdleBehaviour(unittest.TestCase):
+    def setUp(self):
+        self.device = RealNocturnDevice()
+        self.events = []
+        self.device.add_event_listener(self.events.append)
+        self.fake = attach_fake_usb(self.device)
+
+    def tearDown(self):
+        self.device.disconnect()
+
+    def test_led_writer_only_wakes_on_changes(self):
+        wakeups = self.device._m_write_wakeups.value
+        time.sleep(0.1)
+        self.assertEqual(self.device._m_write_wakeups.value, wakeups)
+        writes = len(self.fake.writes)
+        self.device.set_led("encoder_1", 42)
+        time.sleep(0.1)
+        self.assertEqual(self.fake.writes[writes:][0][1], (64, 42))
+
+    def test_led_values_are_packed_per_transfer(self):
+        for i in range(1, 9):
+            self.device.set_led(f"encoder_{i}", i)
+        time.sleep(0.1)
+        self.assertEqual([data for _, data in self.fake.writes[-2:]],
+                         [(64, 1, 65, 2, 66, 3, 67, 4), (68, 5, 69, 6, 70, 7, 71, 8)])
+
+    def test_rejected_packed_writes_fall_back_to_single_pairs(self):
+        self.fake.max_write = 3
+        for i in range(1, 4):
+            self.device.set_led(f"encoder_{i}", i)
+        time.sleep(0.1)
+        self.assertFalse(self.device._packed_writes)
+        self.assertEqual([data for _, data in self.fake.writes[-3:]], [(64, 1), (65, 2), (66, 3)])
+
+    def test_failed_led_write_is_retried(self):
+        self.device._packed_writes = False
+        self.fake.max_write = 1
+        transfers = self.device._m_led_transfers.value
+        self.device.set_led("encoder_1", 42)
+        time.sleep(0.1)
+        self.assertEqual(self.device._m_led_transfers.value, transfers)
+        self.fake.max_write = None
+        time.sleep(0.1)
+        self.assertEqual(self.fake.writes[-1][1], (64, 42))
+        self.assertEqual(self.device._m_led_transfers.value, transfers + 1)
+
+    def test_input_wakes_backed_off_reader(self):
+        self.device._read_backoff.current = self.device.READ_TIMEOUT_MAX_S
+        self.device._read_backoff.last_activity -= 10.0
+        self.fake.inject(64, 1)
+        time.sleep(0.05)
+        self.assertEqual([(e.source_id, e.value) for e in self.events], [("encoder_1", 2)])
+        self.assertFalse(self.device._read_backoff.backed_off)
+
+    def test_backoff_grows_after_grace(self):
+        backoff = IdleBackoff(0.01, 0.08, grace_s=0.0)
+        self.assertEqual([backoff.next_wait() for _ in range(4)], [0.02, 0.04, 0.08, 0.08])
+        backoff.activity()
+        self.assertFalse(backoff.backed_off)
+
+class TestRealtime(unittest.TestCase):
+    def test_parse_cpu_list(self):
+        self.assertEqual(parse_cpu_list("0-2,5"), {0, 1, 2, 5})
+        self.assertIsNone(parse_cpu_list(""))
+
+    def test_io_threads_start_with_or_without_permission(self):
+        # Whatever the sandbox allows, the device must come up and read input
+        device = RealNocturnDevice()
+        device.realtime = RealtimeConfig(frozenset({0}))
+        events = []
+        device.add_event_listener(events.append)
+        fake = attach_fake_usb(device)
+        try:
+            fake.inject(64, 1)
+            time.sleep(0.05)
+            self.assertEqual(len(events), 1)
+        finally:
+            device.disconnect()
@@ -1,8 +1,19 @@
+import tempfile
+import threading
+import time
 import unittest
+from pathlib import Path
 from nocturn_studio.hardware.device import MockNocturnDevice
+from nocturn_studio.model.events import ControlEvent, ControlEventType
 from nocturn_studio.model.mapping import Mapping, MappingTarget, TargetType, MappingMode
+from nocturn_studio.model.curves import ResponseCurve, compile_curve
+from nocturn_studio.utils.persistence import PersistenceManager
 from nocturn_studio.engine.mapper import MappingEngine
-from nocturn_studio.daw.midi import MockMidiOutput
+from nocturn_studio.model.functional import ChannelFunction
+from nocturn_studio.engine.switcher import ProfileSwitcher
+from nocturn_studio.engine.conditioning import AbsoluteInputFilter, ConditioningConfig
+from nocturn_studio.daw.midi import MockMidiOutput, MidiMessage
+from nocturn_studio.utils.session import SessionStore
 
 class TestMappingEngine(unittest.TestCase):
     def setUp(self):
@@ -17,7 +28,6 @@ class TestMappingEngine(unittest.TestCase):
     def test_encoder_integration(self):
         # 1. Setup a mapping for "encoder_1" -> CC 10 on Channel 1
         mapping = Mapping(
-            source_id="encoder_1",
             target=MappingTarget(TargetType.MIDI_CC, channel=0, identifier=10),
             min_val=0,
             max_val=127
@@ -42,5 +52,345 @@ class TestMappingEngine(unittest.TestCase):
         msg = self.midi.sent_messages[1]
         self.assertEqual(msg.data2, 15)    # 5 + 10 = 15
 
+    def test_relative_mode_sends_coalesced_deltas(self):
+        mapping = Mapping(MappingTarget(TargetType.MIDI_CC, identifier=10),
+                          mode=MappingMode.RELATIVE_TWOS_COMP)
+        self.engine.load_mappings({"encoder_1": mapping})
+        self.engine.relative_output = True
+        
+        # Deltas go out as-is, even past the local shadow's limits
+        self.device.simulate_turn("encoder_1", 3)
+        self.device.simulate_turn("encoder_1", -5)
+        self.assertEqual([m.data2 for m in self.midi.sent_messages], [3, 0x7F & -5])
+        
+        # A burst read as one batch becomes a single message
+        self.midi.sent_messages.clear()
+        with self.engine.batch():
+            for _ in range(10):
+                self.device.simulate_turn("encoder_1", 2)
+        self.assertEqual([m.data2 for m in self.midi.sent_messages], [20])
+        self.assertEqual(self.engine.values["encoder_1"], 20)
+
+    def test_response_curve_uses_lookup_table(self):
+        curve = ResponseCurve("log", 9.0)
+        mapping = Mapping(MappingTarget(TargetType.MIDI_CC, identifier=10), curve=curve)
+        # Curves survive a preset round trip
+        mappings = PersistenceManager.decode_mappings(PersistenceManager.encode_mappings({"encoder_1": mapping}))
+        self.assertEqual(mappings["encoder_1"].curve, curve)
+        self.engine.load_mappings(mappings)
+        table = self.engine._curve_tables["encoder_1"]
+        self.assertEqual(len(table.forward), 128)
+        
+        self.device.simulate_turn("encoder_1", 13)
+        sent = self.midi.sent_messages[0].data2
+        self.assertEqual(sent, table.forward[13])
+        self.assertGreater(sent, 13) # log curve rises fast at the bottom
+        
+        # The DAW's echo of the curved value maps back to the knob position
+        self.engine.handle_midi_input(MidiMessage(0xB0, 10, sent))
+        self.assertEqual(self.engine.values["encoder_1"], 13)
+
+    def test_midi_cc_curve_stays_seven_bit(self):
+        mapping = Mapping(MappingTarget(TargetType.MIDI_CC, identifier=10), max_val=16383,
+                          curve=ResponseCurve("exp", 4.0))
+        self.engine.load_mappings({"encoder_1": mapping})
+        self.assertEqual(len(self.engine._curve_tables["encoder_1"].forward), 128)
+        self.engine.set_values({"encoder_1": 16383})
+        self.engine.set_values({"encoder_1": 127})
+        self.assertEqual([m.data2 for m in self.midi.sent_messages], [127, 127])
+        # 7-bit echoes index the 7-bit inverse table
+        self.engine.handle_midi_input(MidiMessage(0xB0, 10, 127))
+        self.assertEqual(self.engine.values["encoder_1"], 127)
+
+    def test_degenerate_and_falling_curves(self):
+        # No bend is a straight line; out-of-range preset amounts are clamped
+        for data in ({"kind": "log", "amount": 0}, {"kind": "exp", "amount": -3}, {"kind": "s_curve", "amount": 0}):
+            table = compile_curve(ResponseCurve.from_dict(data), 0, 127)
+            self.assertEqual(list(table.forward), list(range(128)))
+        with self.assertRaises(ValueError):
+            ResponseCurve("log", -1.0)
+        
+        # Inverted response: echoes still map back to the knob position
+        table = compile_curve(ResponseCurve.from_dict({"kind": "breakpoints", "points": [[0, 1], [1, 0]]}), 0, 127)
+        self.assertEqual((table.forward[0], table.forward[127]), (127, 0))
+        for position in (0, 13, 64, 127):
+            self.assertEqual(table.inverse[table.forward[position]], position)
+
+    def test_labels_only_emitted_on_change(self):
+        labels = []
+        self.engine.label_callback = lambda cid, label: labels.append((cid, label))
+        self.engine._refresh_functional_mappings()
+        self.assertIn(("encoder_2", "EQ Low Freq"), labels)
+        
+        # Value updates carry no label cost
+        labels.clear()
+        self.device.simulate_turn("encoder_2", 3)
+        self.assertEqual(labels, [])
+        
+        # Shift swaps only the controls that have a shift function
+        self.device._emit(ControlEvent("button_16", ControlEventType.BUTTON_PRESS, 127))
+        self.assertIn(("encoder_2", "EQ Low Q"), labels)
+        self.assertNotIn("encoder_1", [cid for cid, _ in labels])
+
+    def test_identical_mappings_are_shared(self):
+        preset = {f"button_{i}": {"target": {"type": "MIDI_CC", "channel": 0, "identifier": 10},
+                                  "mode": "ABSOLUTE", "min_val": 0, "max_val": 127} for i in (1, 2)}
+        first = PersistenceManager.decode_mappings(preset)
+        second = PersistenceManager.decode_mappings(preset)
+        self.assertIs(first["button_1"], second["button_2"])
+        with self.assertRaises(AttributeError):
+            first["button_1"].max_val = 1
+        
+        # Labels live beside the shared mappings
+        self.engine.load_mappings(first, "Synth", labels={"button_1": "Arp"})
+        self.assertEqual(self.engine.get_label_for_control("button_1"), "Arp")
+        self.assertEqual(self.engine.get_label_for_control("button_2"), "button_2")
+
+    def test_global_labels_survive_refreshes(self):
+        from nocturn_studio.main import GLOBAL_LABELS, default_global_mappings
+        self.engine.load_mappings(default_global_mappings(), labels=GLOBAL_LABELS)
+        self.assertEqual(self.engine.get_label_for_control("button_11"), "Page Dn")
+        
+        self.device._emit(ControlEvent("button_16", ControlEventType.BUTTON_PRESS, 127)) # Shift
+        self.assertEqual(self.engine.get_label_for_control("button_11"), "Page Dn")
+        self.engine.load_mappings({"button_11": Mapping(MappingTarget(TargetType.MIDI_NOTE, identifier=1))}, "Synth")
+        self.assertEqual(self.engine.get_label_for_control("button_11"), "button_11")
+        self.engine.load_mappings(self.engine.global_mappings, "Global", self.engine.global_labels)
+        self.assertEqual(self.engine.get_label_for_control("button_11"), "Page Dn")
+
+    def test_crossfader_jitter_is_suppressed(self):
+        self.engine.input_conditioning["crossfader"] = ConditioningConfig(settle_ms=20)
+        self.engine.load_mappings({"crossfader": Mapping(MappingTarget(TargetType.MIDI_CC, identifier=19))})
+        move = lambda v: self.device._emit(ControlEvent("crossfader", ControlEventType.CROSSFADER_MOVE, v))
+        
+        # Deliberate move: every step passes
+        for v in (60, 62, 63, 64):
+            move(v)
+        self.assertEqual([m.data2 for m in self.midi.sent_messages], [60, 62, 63, 64])
+        
+        # Resting jitter: nothing goes out
+        time.sleep(0.03)
+        for v in (63, 64, 63, 64, 65, 64) * 5:
+            move(v)
+        self.assertEqual(len(self.midi.sent_messages), 4)
+        self.assertGreaterEqual(self.engine._input_filters["crossfader"].suppressed, 30)
+        
+        # End stops are always reached
+        move(127)
+        self.assertEqual(self.midi.sent_messages[-1].data2, 127)
+
+    def test_rate_limited_conditioning_flushes_held_value(self):
+        input_filter = AbsoluteInputFilter(ConditioningConfig(min_interval_ms=10))
+        self.assertEqual(input_filter.process(10, now=0.0), 10)
+        self.assertIsNone(input_filter.process(20, now=0.001))
+        self.assertIsNone(input_filter.flush(now=0.005))
+        self.assertEqual(input_filter.flush(now=0.011), 20)
+
+class TestProfileState(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.feedback = {}
+        self.engine = MappingEngine(MockMidiOutput(), feedback_callback=self.feedback.__setitem__)
+        self.engine.persistence.presets_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_switching_back_restores_values(self):
+        self.engine.switch_profile("Plugin A")
+        self.engine.handle_event(ControlEvent("encoder_1", ControlEventType.ENCODER_TURN, 42))
+        
+        self.engine.switch_profile("Plugin B")
+        self.assertEqual(self.feedback["encoder_1"], 0) # B starts from defaults
+        
+        self.engine.switch_profile("Plugin A")
+        self.assertEqual(self.engine.values["encoder_1"], 42)
+        self.assertEqual(self.feedback["encoder_1"], 42)
+
+    def test_least_recently_used_profiles_are_evicted(self):
+        self.engine.profile_states.capacity = 2
+        for name in ("A", "B", "C", "A"):
+            self.engine.switch_profile(name)
+        self.assertEqual(self.engine.profile_states.recent(), ["B", "C"])
+        self.assertEqual(self.engine.profile_states.evictions, 2)
+
+    def test_session_warm_start(self):
+        self.engine.load_mappings({"encoder_1": Mapping(MappingTarget(TargetType.MIDI_CC, identifier=10))})
+        self.engine.handle_event(ControlEvent("encoder_1", ControlEventType.ENCODER_TURN, 7))
+        self.engine.switch_profile("Plugin A")
+        self.engine.handle_event(ControlEvent("encoder_1", ControlEventType.ENCODER_TURN, 42))
+        self.engine.current_mode = "DYNAMICS"
+        
+        store = SessionStore(Path(self.tmp.name) / "session.json")
+        self.assertTrue(store.save(self.engine.session_state()))
+        self.assertFalse(store.save(self.engine.session_state())) # Unchanged -> no write
+        
+        # The next launch restores from the session alone, without the preset
+        (Path(self.tmp.name) / "Plugin A.json").unlink()
+        feedback = {}
+        engine = MappingEngine(MockMidiOutput(), feedback_callback=feedback.__setitem__)
+        engine.persistence.presets_dir = Path(self.tmp.name)
+        engine.restore_session(SessionStore(store.path).load())
+        self.assertEqual(engine.current_profile, "Plugin A")
+        self.assertEqual(engine.current_mode, "DYNAMICS")
+        self.assertEqual(feedback["encoder_1"], 42)
+        self.assertEqual(engine.mappings["encoder_1"].target.identifier, 10)
+        
+        engine.switch_profile("Global")
+        self.assertEqual(engine.values["encoder_1"], 7)
+
+    def test_session_restored_before_first_feedback(self):
+        from nocturn_studio.main import _initialize_engine
+        session = {"profile": "Global", "mode": "DYNAMICS", "track": 10 ** 12,
+                   "recent": [{"name": "Global", "values": {"encoder_1": 42}}]}
+        feedback = []
+        engine = MappingEngine(MockMidiOutput(), feedback_callback=lambda cid, val: feedback.append((cid, val)))
+        engine.persistence.presets_dir = Path(self.tmp.name)
+        store = SessionStore(Path(self.tmp.name) / "session.json")
+        autosaver = _initialize_engine(engine, store, session)
+        autosaver.stop()
+        # One feedback per control, already showing the restored state
+        self.assertEqual(len(feedback), len({cid for cid, _ in feedback}))
+        self.assertIn(("encoder_1", 42), feedback)
+        self.assertIn(("button_14", 127), feedback) # Dynamics mode LED
+        self.assertEqual(engine.current_track, 0) # Out-of-range track ignored
+        self.assertEqual(engine.tracks.tracks, 1)
+
+class TestTrackBank(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.feedback = []
+        self.engine = MappingEngine(MockMidiOutput(), feedback_callback=lambda cid, val: self.feedback.append((cid, val)))
+        self.engine.persistence.presets_dir = Path(self.tmp.name)
+        self.engine._refresh_functional_mappings()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_each_track_keeps_its_channel_strip(self):
+        turn = lambda delta: self.engine.handle_event(ControlEvent("encoder_1", ControlEventType.ENCODER_TURN, delta))
+        turn(10) # Track 1: EQ Low Gain 74
+        self.engine.select_track(149)
+        self.assertEqual(self.engine.values["encoder_1"], 64)
+        turn(-20)
+        
+        self.feedback.clear()
+        self.engine.select_track(0)
+        self.assertEqual(self.engine.values["encoder_1"], 74)
+        # One feedback per function-bound control, no duplicates
+        self.assertEqual(len(self.feedback), len({cid for cid, _ in self.feedback}))
+        self.assertEqual(self.engine.tracks.get(149, ChannelFunction.EQ_LOW_GAIN), 44)
+        self.assertEqual(self.engine.tracks.nbytes, 150 * len(ChannelFunction) * 2)
+
+    def test_profile_switches_keep_track_values(self):
+        preset = {"EQ_LOW_GAIN": {"target": {"type": "MIDI_CC", "channel": 0, "identifier": 20},
+                                  "mode": "RELATIVE_TWOS_COMP", "min_val": 0, "max_val": 127}}
+        self.engine.persistence.save_preset("SSL", PersistenceManager.decode_mappings(preset))
+        self.engine.switch_profile("SSL")
+        self.engine.handle_event(ControlEvent("encoder_1", ControlEventType.ENCODER_TURN, 10))
+        self.engine.switch_profile("Synth")
+        self.engine.select_track(1)
+        self.engine.switch_profile("SSL")
+        self.engine.select_track(0)
+        self.assertEqual(self.engine.tracks.get(0, ChannelFunction.EQ_LOW_GAIN), 74)
+        self.assertEqual(self.engine.values["encoder_1"], 74)
+
+class TestTransforms(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.midi = MockMidiOutput()
+        self.engine = MappingEngine(self.midi)
+        self.engine.persistence.presets_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stages_compiled_at_load_and_budgeted(self):
+        (Path(self.tmp.name) / "Synth.transforms.py").write_text(
+            "import time\n"
+            "def transform_double(value, ctx):\n"
+            "    return value * 2\n"
+            "def transform_slow(value, ctx):\n"
+            "    time.sleep(0.002)\n"
+            "    return value\n"
+        )
+        self.engine.transform_budget_us = 500
+        self.engine.switch_profile("Synth")
+        stages = self.engine.transforms.stages
+        self.assertEqual([s.name for s in stages], ["transform_double", "transform_slow"])
+        
+        for _ in range(6):
+            self.engine.handle_event(ControlEvent("encoder_1", ControlEventType.ENCODER_TURN, 1))
+        self.assertEqual(self.midi.sent_messages[0].data2, 2)
+        self.assertTrue(stages[1].disabled)
+        self.assertEqual(stages[1].overruns, 5) # Not called again once disabled
+        self.assertFalse(stages[0].disabled)
+
+    def test_faulty_stage_is_disabled(self):
+        (Path(self.tmp.name) / "Synth.transforms.py").write_text(
+            "def transform_bad(value, ctx):\n"
+            "    return 'x'\n"
+            "def transform_reroute(value, ctx):\n"
+            "    ctx.mapping = None\n"
+            "    return value + 1\n"
+        )
+        self.engine.switch_profile("Synth")
+        stages = self.engine.transforms.stages
+        for _ in range(2):
+            self.engine.handle_event(ControlEvent("encoder_1", ControlEventType.ENCODER_TURN, 1))
+        self.assertTrue(all(stage.disabled for stage in stages))
+        # The message still goes out, untransformed
+        self.assertEqual([m.data2 for m in self.midi.sent_messages], [1, 2])
+
+class TestProfileSwitcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = MappingEngine(MockMidiOutput())
+        self.engine.persistence.presets_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_latest_request_wins(self):
+        committed = []
+        entered, release = threading.Event(), threading.Event()
+        prepare, commit = self.engine.prepare_profile, self.engine.commit_profile
+        def slow_prepare(name):
+            if name == "Plugin 0":
+                entered.set()
+                release.wait(2.0)
+            return prepare(name)
+        def record_commit(prepared, is_current=None):
+            committed.append(prepared.name)
+            commit(prepared, is_current)
+        self.engine.prepare_profile = slow_prepare
+        self.engine.commit_profile = record_commit
+        
+        done = threading.Event()
+        switcher = ProfileSwitcher(self.engine, on_switched=lambda name, ms: name == "Plugin 9" and done.set())
+        switcher.start()
+        switcher.request("Plugin 0")
+        self.assertTrue(entered.wait(2.0))
+        # Newer requests arrive while Plugin 0 is still being prepared
+        for i in range(1, 10):
+            switcher.request(f"Plugin {i}")
+        release.set()
+        
+        self.assertTrue(done.wait(2.0))
+        switcher.stop()
+        self.assertEqual(self.engine.current_profile, "Plugin 9")
+        self.assertEqual(committed, ["Plugin 9"])
+        self.assertEqual(switcher.switches, 1)
+        self.assertEqual(switcher.superseded, 1)
+        # Only the committed smart default is written to disk
+        self.assertEqual([p.stem for p in Path(self.tmp.name).glob("*.json")], ["Plugin 9"])
+
+    def test_stop_before_start(self):
+        switcher = ProfileSwitcher(self.engine)
+        switcher.stop()
+        switcher.start()
+        switcher.join(1.0)
+        self.assertFalse(switcher.is_alive())
+
 if __name__ == '__main__':
     unittest.main()
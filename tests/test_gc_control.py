@@ -0,0 +1,48 @@
+import gc
+import unittest
+import weakref
+from nocturn_studio.utils.gc_control import GcController
+
+class Node:
+    pass
+
+class TestGcController(unittest.TestCase):
+    def setUp(self):
+        self.controller = GcController(managed=True, idle_after_s=60.0, gen2_after=0)
+        self.controller.install()
+
+    def tearDown(self):
+        self.controller.uninstall()
+
+    def test_pauses_are_recorded(self):
+        pauses = self.controller._m_pause.count
+        gc.collect(0)
+        self.assertEqual(self.controller._m_pause.count, pauses + 1)
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+    def test_full_collection_waits_for_idle(self):
+        idle = self.controller._m_idle.value
+        self.controller.activity()
+        self.controller.on_idle() # Input was just seen
+        self.assertEqual(self.controller._m_idle.value, idle)
+        
+        self.controller.idle_after_s = 0.0
+        gen2 = self.controller._m_gen2_pause.count
+        self.controller.on_idle()
+        self.assertEqual(self.controller._m_idle.value, idle + 1)
+        self.assertEqual(self.controller._m_gen2_pause.count, gen2 + 1)
+        
+        # Survivors are frozen; a long quiet spell reclaims cycles among them once
+        node = Node()
+        node.cycle = node
+        ref = weakref.ref(node)
+        self.controller.on_idle()
+        del node
+        deep = self.controller._m_deep.value
+        self.controller.deep_idle_s = 0.0
+        self.controller.on_idle()
+        self.assertEqual(self.controller._m_deep.value, deep + 1)
+        self.assertIsNone(ref())
+
+if __name__ == "__main__":
+    unittest.main()
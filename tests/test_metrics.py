@@ -0,0 +1,31 @@
+import json
+import unittest
+import urllib.request
+from nocturn_studio.utils.metrics import MetricsRegistry, MetricsServer
+
+class TestMetrics(unittest.TestCase):
+    def test_registry_and_endpoint(self):
+        registry = MetricsRegistry()
+        registry.counter("events").inc(3)
+        self.assertIs(registry.counter("events"), registry.counter("events"))
+        registry.gauge("depth").set(2)
+        hist = registry.histogram("latency_ms", buckets=(1.0, 5.0))
+        for v in (0.5, 0.7, 3.0, 20.0):
+            hist.observe(v)
+        self.assertEqual(hist.counts, [2, 1, 1])
+        self.assertEqual(hist.quantile(0.5), 1.0)
+        
+        server = MetricsServer(registry, port=0)
+        server.start()
+        try:
+            base = f"http://127.0.0.1:{server.port}"
+            snap = json.loads(urllib.request.urlopen(base + "/metrics.json").read())
+            self.assertEqual(snap["events"], 3)
+            self.assertEqual(snap["latency_ms"]["count"], 4)
+            text = urllib.request.urlopen(base + "/metrics").read().decode()
+            self.assertIn('latency_ms_bucket{le="+Inf"} 4', text)
+        finally:
+            server.stop()
+
+if __name__ == '__main__':
+    unittest.main()
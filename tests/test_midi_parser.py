@@ -0,0 +1,53 @@
+import unittest
+from nocturn_studio.daw.midi import MidiInputDrain, MidiMessage, MockMidiOutput
+from nocturn_studio.daw.midi_parser import MidiParser
+from nocturn_studio.engine.mapper import MappingEngine
+from nocturn_studio.model.mapping import Mapping, MappingTarget, TargetType
+
+class TestMidiParser(unittest.TestCase):
+    def test_running_status_and_short_messages(self):
+        parser = MidiParser()
+        messages = parser.feed([0xB0, 10, 1, 11, 2, 0xC1, 5, 6, 0xD0, 90])
+        self.assertEqual(messages, [MidiMessage(0xB0, 10, 1), MidiMessage(0xB0, 11, 2),
+                                    MidiMessage(0xC1, 5), MidiMessage(0xC1, 6), MidiMessage(0xD0, 90)])
+        # Running status carries over to the next packet
+        self.assertEqual(parser.feed([12, 3]), [MidiMessage(0xD0, 12), MidiMessage(0xD0, 3)])
+
+    def test_sysex_with_interleaved_realtime(self):
+        parser = MidiParser()
+        messages = parser.feed([0xF0, 0x00, 0x20, 0xF8, 0x29, 0xF7, 0xB0, 10, 64])
+        self.assertEqual(messages, [MidiMessage(0xF8), MidiMessage(0xF0, sysex=bytes([0x00, 0x20, 0x29])),
+                                    MidiMessage(0xB0, 10, 64)])
+        # Stray data and an unterminated SysEx are skipped
+        parser = MidiParser()
+        self.assertEqual(parser.feed([5, 0xF0, 1, 2, 0x90, 40, 127]), [MidiMessage(0x90, 40, 127)])
+        self.assertEqual(parser.errors, 2)
+
+class TestMidiInputDrain(unittest.TestCase):
+    def test_batch_is_coalesced_per_cc(self):
+        feedback = []
+        engine = MappingEngine(MockMidiOutput(), feedback_callback=lambda cid, val: feedback.append((cid, val)))
+        engine.load_mappings({
+            "encoder_1": Mapping(MappingTarget(TargetType.MIDI_CC, identifier=10)),
+            "encoder_2": Mapping(MappingTarget(TargetType.MIDI_CC, identifier=11)),
+        })
+        handled = []
+        drain = MidiInputDrain(lambda msg: (handled.append(msg), engine.handle_midi_input(msg)))
+        drain.add_batch_listener(engine)
+        for value in range(50):
+            drain.push([0xB0, 10, value])
+        drain.push([0xF8]) # Clock doesn't split the run
+        drain.push([0xB0, 11, 7])
+        drain.push([0xC0, 10]) # Program change: passed on, not mistaken for CC 10
+        drain.push([0xB0, 10, 98])
+        drain.push([0xB0, 10, 99])
+        
+        self.assertEqual(drain.drain(), 5)
+        # CCs are never moved across the program change
+        self.assertEqual(handled, [MidiMessage(0xB0, 10, 49), MidiMessage(0xF8), MidiMessage(0xB0, 11, 7),
+                                   MidiMessage(0xC0, 10), MidiMessage(0xB0, 10, 99)])
+        self.assertEqual(engine.values["encoder_1"], 99)
+        self.assertEqual(feedback, [("encoder_1", 99), ("encoder_2", 7)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from nocturn_studio.daw.midi import MockMidiOutput
+from nocturn_studio.daw.osc import OscOutput, OscReceiver, decode_packet, encode_bundle, encode_message
+from nocturn_studio.engine.mapper import MappingEngine
+from nocturn_studio.model.events import ControlEvent, ControlEventType
+from nocturn_studio.model.mapping import Mapping, MappingTarget, TargetType
+
+class TestOscOutput(unittest.TestCase):
+    def setUp(self):
+        self.receiver = OscReceiver()
+        self.receiver.start()
+        self.osc = OscOutput(port=self.receiver.port)
+        self.feedback = {}
+        self.engine = MappingEngine(MockMidiOutput(), feedback_callback=self.feedback.__setitem__, osc_out=self.osc)
+        self.engine.load_mappings({
+            f"encoder_{i}": Mapping(MappingTarget(TargetType.OSC, address=f"/track/1/param/{i}"),
+                                    max_val=1023)
+            for i in range(1, 9)
+        })
+
+    def tearDown(self):
+        self.osc.close()
+        self.receiver.stop()
+
+    def test_codec_round_trip(self):
+        packet = encode_bundle([encode_message("/a", 0.5, 3, "x"), encode_message("/b/c", 1.0)])
+        self.assertEqual(decode_packet(packet), [("/a", (0.5, 3, "x")), ("/b/c", (1.0,))])
+
+    def test_high_resolution_float_values(self):
+        self.engine.handle_event(ControlEvent("encoder_1", ControlEventType.ENCODER_TURN, 3))
+        self.assertTrue(self.receiver.wait_for(1))
+        address, (value,) = self.receiver.packets[0][0]
+        self.assertEqual(address, "/track/1/param/1")
+        self.assertAlmostEqual(value, 3 / 1023, places=6)
+        self.assertEqual(self.feedback["encoder_1"], 0) # LED/UI scale stays 0..127
+
+    def test_batch_is_one_bundle(self):
+        self.engine.set_values({f"encoder_{i}": i * 100 for i in range(1, 9)})
+        self.assertTrue(self.receiver.wait_for(1))
+        self.assertFalse(self.receiver.wait_for(2, timeout=0.1))
+        self.assertEqual(len(self.receiver.packets[0]), 8)
+        self.assertEqual(self.osc.packets_sent, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import multiprocessing
+import unittest
+from nocturn_studio.ipc.shared_state import SharedState, SharedStateView
+from nocturn_studio.main import _EngineMetrics
+
+class TestSharedState(unittest.TestCase):
+    def setUp(self):
+        self.state = SharedState.create()
+        self.writer = SharedState.attach(self.state.name)
+
+    def tearDown(self):
+        self.writer.close()
+        self.state.close()
+
+    def test_view_reports_only_changes(self):
+        view = SharedStateView(self.state)
+        self.writer.set_value("encoder_3", 99)
+        self.writer.set_label("encoder_3", "EQ LoMid Gain")
+        self.writer.set_status("DYNAMICS", "1", True)
+        self.writer.set_value("unknown_control", 5) # Ignored
+        
+        values, labels = view.take_changes()
+        self.assertIn(("encoder_3", 99), values)
+        self.assertEqual(labels, [("encoder_3", "EQ LoMid Gain")])
+        self.assertEqual(view.take_status(), ("DYNAMICS", "1", True))
+        self.assertIsNone(view.take_status())
+        
+        # Unchanged block: nothing to apply
+        self.assertEqual(view.take_changes(), ([], []))
+        self.writer.set_value("encoder_3", 100)
+        self.assertEqual(view.take_changes(), ([("encoder_3", 100)], []))
+
+    def test_read_gives_up_on_abandoned_write(self):
+        view = SharedStateView(self.state)
+        self.writer._begin() # Writer died mid-write: sequence stays odd
+        self.assertIsNone(self.state.read())
+        self.assertEqual(view.take_changes(), ([], []))
+
+    def test_late_metrics_reply_is_discarded(self):
+        ui_end, engine_end = multiprocessing.Pipe()
+        metrics = _EngineMetrics(ui_end, timeout=0.05)
+        self.assertEqual(metrics.snapshot(), {}) # Engine busy: request 1 times out
+        engine_end.send(("metrics", 1, {"stale": 1}))
+        engine_end.send(("metrics", 2, {"fresh": 1}))
+        self.assertEqual(metrics.snapshot(), {"fresh": 1})
+
+if __name__ == '__main__':
+    unittest.main()
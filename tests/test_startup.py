@@ -0,0 +1,30 @@
+import time
+import unittest
+from nocturn_studio.startup import StartupOrchestrator
+
+class TestStartupOrchestrator(unittest.TestCase):
+    def test_phases_overlap_and_are_timed(self):
+        startup = StartupOrchestrator()
+        startup.submit("device", time.sleep, 0.2)
+        startup.submit("midi_out", lambda: time.sleep(0.2) or "port")
+        with startup.phase("window"):
+            time.sleep(0.2)
+        ready = []
+        startup.wait_all(lambda name, pending: ready.append(name))
+        report = startup.finish()
+        
+        self.assertEqual(sorted(ready), ["device", "midi_out"])
+        self.assertEqual(startup.result("midi_out"), "port")
+        self.assertLess(startup.elapsed_ms, 350) # Not 600 ms serially
+        self.assertEqual(set(startup.timings), {"device", "midi_out", "window"})
+        self.assertIn("window=", report)
+
+    def test_worker_errors_surface_on_result(self):
+        startup = StartupOrchestrator()
+        startup.submit("device", lambda: 1 / 0)
+        startup.finish()
+        with self.assertRaises(ZeroDivisionError):
+            startup.result("device")
+
+if __name__ == "__main__":
+    unittest.main()
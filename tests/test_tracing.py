@@ -0,0 +1,29 @@
+import json
+import os
+import tempfile
+import unittest
+from nocturn_studio.utils.tracing import Tracer
+
+class TestTracer(unittest.TestCase):
+    def test_ring_buffer_export(self):
+        tracer = Tracer(capacity=4)
+        with tracer.span("ignored"):
+            pass # Disabled: nothing recorded
+        
+        tracer.enable()
+        for i in range(6):
+            with tracer.span(f"span_{i}", "test"):
+                pass
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            self.assertEqual(tracer.export(path), 4)
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+        
+        spans = [e["name"] for e in events if e["ph"] == "X"]
+        self.assertEqual(spans, ["span_2", "span_3", "span_4", "span_5"]) # Oldest overwritten
+        self.assertTrue(any(e["ph"] == "M" for e in events))
+
+if __name__ == '__main__':
+    unittest.main()
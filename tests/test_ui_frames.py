@@ -0,0 +1,34 @@
+import unittest
+from nocturn_studio.ui.frame_buffer import UIFrameBuffer
+
+class TestUIFrameBuffer(unittest.TestCase):
+    def test_coalesces_updates_between_frames(self):
+        frames = UIFrameBuffer()
+        for val in range(10):
+            frames.set_value("encoder_1", val)
+        frames.set_label("encoder_1", "EQ Low Gain")
+        frames.set_label("encoder_1", "EQ Low Gain") # Unchanged, ignored
+        
+        values, labels = frames.take_changes()
+        self.assertEqual(values, [("encoder_1", 9)])
+        self.assertEqual(labels, [("encoder_1", "EQ Low Gain")])
+        self.assertEqual(frames.updates_dropped, 9)
+        
+        # Nothing changed since the last frame
+        self.assertEqual(frames.take_changes(), ([], []))
+
+    def test_wakes_only_on_first_pending_change(self):
+        wakeups = []
+        frames = UIFrameBuffer(on_pending=lambda: wakeups.append(1))
+        for val in range(5):
+            frames.set_value("encoder_1", val)
+        frames.set_label("encoder_2", "EQ Low Freq")
+        self.assertEqual(len(wakeups), 1)
+        
+        frames.take_changes()
+        frames.take_changes() # Idle: no wakeup
+        frames.set_value("encoder_1", 7)
+        self.assertEqual(len(wakeups), 2)
+
+if __name__ == '__main__':
+    unittest.main()